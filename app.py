@@ -1,8 +1,15 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, abort, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, session, abort, send_file, jsonify, Response, stream_with_context
+from flask import before_render_template, template_rendered
 from utils.data_helper import DataHelper
 from utils.pdf_generator import InvoicePDFGenerator
+from utils.sales_import import import_sales_csv
+from utils.invoice_jobs import InvoiceJobQueue
+from utils.exports import EXPORT_FORMATS, iter_export
+from utils.metrics import MetricsRegistry
+from utils import instrumentation
 from datetime import datetime
-from functools import wraps
+from functools import partial, wraps
+import json
 import os
 from config import config
 
@@ -14,6 +21,102 @@ app.config.from_object(config[config_name])
 
 data_helper = DataHelper()
 pdf_generator = InvoicePDFGenerator()
+invoice_jobs = InvoiceJobQueue(data_helper, pdf_generator, app.config['INVOICE_CACHE_DIR'],
+                               max_workers=app.config['INVOICE_WORKERS'],
+                               batch_workers=app.config['INVOICE_BATCH_WORKERS'],
+                               max_age_days=app.config['INVOICE_CACHE_MAX_AGE_DAYS'])
+
+@app.teardown_appcontext
+def release_db_connection(exception=None):
+    # Kembalikan koneksi request ini ke pool
+    data_helper.release_connection()
+
+# ---------------------------
+# Metrics (Prometheus, digabung dari semua worker gunicorn)
+# ---------------------------
+metrics = MetricsRegistry(app.config['METRICS_DIR'], flush_interval=app.config['METRICS_FLUSH_INTERVAL'])
+
+def observe_query(call_site, seconds, rowcount):
+    metrics.observe('db_query_duration_seconds', {'method': call_site}, seconds)
+
+def observe_timing(name, seconds):
+    if name == 'pdf':
+        metrics.observe('pdf_render_duration_seconds', None, seconds)
+
+def collect_data_helper_metrics():
+    pool = data_helper.get_pool_stats()
+    if pool:
+        yield 'db_pool_connections', {'state': 'in_use'}, pool['in_use']
+        yield 'db_pool_connections', {'state': 'idle'}, pool['idle']
+        yield 'db_pool_waiting', None, pool['waiting']
+        yield 'db_pool_checkouts_total', None, pool['checkouts']
+        yield 'db_pool_timeouts_total', None, pool['timeouts']
+    cache = data_helper.get_cache_stats()
+    yield 'reference_cache_entries', None, cache['entries']
+    yield 'reference_cache_hits_total', None, cache['hits']
+    yield 'reference_cache_misses_total', None, cache['misses']
+
+instrumentation.add_query_hook(observe_query)
+instrumentation.add_timing_hook(observe_timing)
+metrics.add_collector(collect_data_helper_metrics)
+
+# ---------------------------
+# Request instrumentation (query, template & PDF timing)
+# ---------------------------
+@app.before_request
+def start_request_stats():
+    instrumentation.start_request()
+    metrics.inc('http_requests_in_progress')
+
+@app.after_request
+def add_server_timing(response):
+    stats = instrumentation.current()
+    if stats is not None:
+        stats.status = response.status_code
+        response.headers['Server-Timing'] = stats.server_timing()
+        if stats.streaming:
+            # Body di-stream setelah view selesai; catat saat server menutup response
+            # (juga terpanggil bila client memutus sebelum stream dimulai)
+            response.call_on_close(partial(finish_request_stats, request.method, request.path, request.endpoint))
+    return response
+
+@app.teardown_request
+def close_request_stats(exception=None):
+    stats = instrumentation.current()
+    if stats is not None and stats.streaming:
+        return
+    finish_request_stats(request.method, request.path, request.endpoint, exception)
+
+def finish_request_stats(method, path, endpoint, exception=None):
+    stats = instrumentation.finish_request()
+    if stats is None:
+        return
+    
+    status = stats.status or 500
+    labels = {'route': endpoint or 'unmatched', 'method': method}
+    metrics.dec('http_requests_in_progress')
+    metrics.observe('http_request_duration_seconds', labels, stats.elapsed)
+    metrics.inc('http_requests_total', {**labels, 'status': status})
+    if exception is not None or status >= 500:
+        metrics.inc('http_request_errors_total', labels)
+    
+    if app.config['REQUEST_LOG']:
+        summary = stats.summary(method=method, path=path, endpoint=endpoint)
+        if exception is not None:
+            summary['error'] = str(exception)
+        print(json.dumps(summary, separators=(',', ':')), flush=True)
+
+@before_render_template.connect_via(app)
+def start_template_timing(sender, template, context, **extra):
+    stats = instrumentation.current()
+    if stats is not None:
+        stats.mark('tpl')
+
+@template_rendered.connect_via(app)
+def stop_template_timing(sender, template, context, **extra):
+    stats = instrumentation.current()
+    if stats is not None:
+        stats.stop('tpl')
 
 # ---------------------------
 # Decorators
@@ -105,10 +208,6 @@ def selectattr_filter(sequence, attribute, operator, value):
         print(f"Error in selectattr filter: {e}")
         return sequence
 
-@app.context_processor
-def inject_data_helper():
-    return dict(data_helper=data_helper)
-
 # ---------------------------
 # Authentication Routes
 # ---------------------------
@@ -158,10 +257,10 @@ def index():
             outlets_list = [dict(outlet) for outlet in outlets] if outlets else []
             products_list = [dict(product) for product in products] if products else []
             
-            # Calculate slot usage for each outlet
+            # Calculate slot usage for each outlet (satu query untuk semua outlet)
+            slot_usage = data_helper.get_slot_usage_for_all_outlets()
             for outlet in outlets_list:
-                outlet_id = outlet['id']
-                slot_used = data_helper.get_outlet_slot_info(outlet_id)
+                slot_used = slot_usage.get(outlet['id'], {}).get('used', 0)
                 outlet['slot_terpakai'] = slot_used
                 outlet['slot_tersedia'] = outlet['slot_maksimal'] - slot_used
             
@@ -186,18 +285,15 @@ def karyawan_dashboard():
         # Get totals
         _, totals = data_helper.get_all_sales_report()
         
-        outlets = data_helper.get_all_outlets()
-        products = data_helper.get_all_products()
-        
-        total_outlet = len(outlets) if outlets else 0
-        total_produk = len(products) if products else 0
+        total_outlet = data_helper.count_outlets()
+        total_produk = data_helper.count_products()
         
         # Get recent distributions and sales
-        distributions = data_helper.get_all_distributions()
-        sales = data_helper.get_all_sales()
+        distributions = data_helper.get_recent_distributions(5)
+        sales = data_helper.get_recent_sales(5)
         
-        distribusi_terbaru = [dict(d) for d in distributions[:5]] if distributions else []
-        penjualan_terbaru = [dict(s) for s in sales[:5]] if sales else []
+        distribusi_terbaru = distributions or []
+        penjualan_terbaru = sales or []
         
         return render_template('karyawan/dashboard.html',
                              total_distribusi=totals['total_distribusi'],
@@ -385,18 +481,25 @@ def distribution_list():
         end_date = request.args.get('end_date')
         outlet_id = request.args.get('outlet_id', type=int)
         
-        distributions = data_helper.get_all_distributions(start_date, end_date, outlet_id)
+        page_token = request.args.get('page')
+        per_page = request.args.get('per_page', app.config['DEFAULT_PAGE_SIZE'], type=int)
+        
+        page = data_helper.get_all_distributions(start_date, end_date, outlet_id,
+                                                 page_size=per_page, page_token=page_token)
         outlets = data_helper.get_all_outlets()
         
-        distributions_list = [dict(d) for d in distributions] if distributions else []
-        outlets_list = [dict(o) for o in outlets] if outlets else []
+        distributions_list = page['items']
+        outlets_list = outlets or []
         
         return render_template('distribution/list.html', 
                              distributions=distributions_list,
                              outlets=outlets_list,
                              start_date=start_date or '',
                              end_date=end_date or '',
-                             selected_outlet=outlet_id)
+                             selected_outlet=outlet_id,
+                             per_page=per_page,
+                             next_token=page['next_token'],
+                             prev_token=page['prev_token'])
     except Exception as e:
         flash(f'Error loading distributions: {str(e)}', 'danger')
         return render_template('distribution/list.html', distributions=[], outlets=[])
@@ -429,6 +532,40 @@ def distribution_add():
         flash(f'Error: {e}', 'danger')
         return render_template('distribution/add.html', outlets=[], products=[])
 
+@app.route('/distribution/batch', methods=['GET', 'POST'])
+@login_required
+def distribution_batch():
+    lines = []
+    try:
+        outlets = data_helper.get_all_outlets()
+        products = data_helper.get_all_products()
+        
+        outlets_list = [dict(o) for o in outlets] if outlets else []
+        products_list = [dict(p) for p in products] if products else []
+        
+        if request.method == 'POST':
+            rows = zip(request.form.getlist('outlet_id'),
+                       request.form.getlist('product_id'),
+                       request.form.getlist('jumlah'))
+            for outlet_id, product_id, jumlah in rows:
+                if not (outlet_id and product_id and jumlah):
+                    continue
+                lines.append((int(outlet_id), int(product_id), int(jumlah)))
+            
+            success, message = data_helper.create_distribution_batch(lines)
+            
+            if success:
+                flash(message, 'success')
+                return redirect(url_for('distribution_list'))
+            else:
+                flash(message, 'danger')
+        
+        return render_template('distribution/batch.html', outlets=outlets_list,
+                               products=products_list, lines=lines)
+    except Exception as e:
+        flash(f'Error: {e}', 'danger')
+        return render_template('distribution/batch.html', outlets=[], products=[], lines=[])
+
 # ---------------------------
 # Sales Routes
 # ---------------------------
@@ -440,18 +577,25 @@ def sales_list():
         end_date = request.args.get('end_date')
         outlet_id = request.args.get('outlet_id', type=int)
         
-        sales = data_helper.get_all_sales(start_date, end_date, outlet_id)
+        page_token = request.args.get('page')
+        per_page = request.args.get('per_page', app.config['DEFAULT_PAGE_SIZE'], type=int)
+        
+        page = data_helper.get_all_sales(start_date, end_date, outlet_id,
+                                         page_size=per_page, page_token=page_token)
         outlets = data_helper.get_all_outlets()
         
-        sales_list = [dict(s) for s in sales] if sales else []
-        outlets_list = [dict(o) for o in outlets] if outlets else []
+        sales_list = page['items']
+        outlets_list = outlets or []
         
         return render_template('sales/list.html', 
                              sales=sales_list,
                              outlets=outlets_list,
                              start_date=start_date or '',
                              end_date=end_date or '',
-                             selected_outlet=outlet_id)
+                             selected_outlet=outlet_id,
+                             per_page=per_page,
+                             next_token=page['next_token'],
+                             prev_token=page['prev_token'])
     except Exception as e:
         flash(f'Error loading sales: {str(e)}', 'danger')
         return render_template('sales/list.html', sales=[], outlets=[])
@@ -461,7 +605,7 @@ def sales_list():
 def sales_add():
     try:
         outlets = data_helper.get_all_outlets()
-        products = data_helper.get_all_products()
+        products = data_helper.get_all_products(include_stock=False)
         
         outlets_list = [dict(o) for o in outlets] if outlets else []
         products_list = [dict(p) for p in products] if products else []
@@ -487,6 +631,30 @@ def sales_add():
         flash(f'Error: {e}', 'danger')
         return render_template('sales/add.html', outlets=[], products=[])
 
+@app.route('/sales/import', methods=['GET', 'POST'])
+@login_required
+def sales_import():
+    errors = []
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        skip_invalid = bool(request.form.get('skip_invalid'))
+        
+        if not upload or not upload.filename:
+            flash('Pilih file CSV terlebih dahulu', 'warning')
+        else:
+            try:
+                success, message, inserted, errors = import_sales_csv(data_helper, upload.stream, skip_invalid)
+                if success:
+                    flash(message, 'success')
+                    if not errors:
+                        return redirect(url_for('sales_list'))
+                else:
+                    flash(message, 'danger')
+            except Exception as e:
+                flash(f'Error: {e}', 'danger')
+    
+    return render_template('sales/import.html', errors=errors)
+
 # ---------------------------
 # Payment Routes
 # ---------------------------
@@ -498,25 +666,29 @@ def payment_list():
         end_date = request.args.get('end_date')
         outlet_id = request.args.get('outlet_id', type=int)
         
-        payments = data_helper.get_all_payments(start_date, end_date, outlet_id)
+        page_token = request.args.get('page')
+        per_page = request.args.get('per_page', app.config['DEFAULT_PAGE_SIZE'], type=int)
+        
+        page = data_helper.get_all_payments(start_date, end_date, outlet_id,
+                                            page_size=per_page, page_token=page_token)
         outlets = data_helper.get_all_outlets()
         
-        payments_list = [dict(p) for p in payments] if payments else []
-        outlets_list = [dict(o) for o in outlets] if outlets else []
+        payments_list = page['items']
+        outlets_list = outlets or []
         
-        # Calculate outlet balances
+        # Calculate outlet balances (satu query untuk semua outlet)
+        all_balances = data_helper.get_all_outlet_balances()
         outlet_balances = {}
         outlets_dict = {}
         for outlet in outlets_list:
             outlet_id_key = outlet['id']
-            outlet_balances[outlet_id_key] = data_helper.get_outlet_balance(outlet_id_key)
+            outlet_balances[outlet_id_key] = all_balances.get(outlet_id_key, 0)
             outlets_dict[outlet_id_key] = outlet['nama']
         
         # Add balance info to payments
         for payment in payments_list:
             payment['total_tagihan'] = outlet_balances.get(payment['outlet_id'], 0)
         
-        print("HASIL GET ALL OUTLETS:", outlets_list) 
         return render_template('payment/list.html', 
                              payments=payments_list,
                              outlet_balances=outlet_balances,
@@ -524,7 +696,10 @@ def payment_list():
                              outlets=outlets_list,
                              start_date=start_date or '',
                              end_date=end_date or '',
-                             selected_outlet=outlet_id)
+                             selected_outlet=outlet_id,
+                             per_page=per_page,
+                             next_token=page['next_token'],
+                             prev_token=page['prev_token'])
     except Exception as e:
         flash(f'Error loading payments: {str(e)}', 'danger')
         return render_template('payment/list.html', 
@@ -539,6 +714,7 @@ def payment_add():
     try:
         outlets = data_helper.get_all_outlets()
         outlets_list = [dict(o) for o in outlets] if outlets else []
+        outlet_balances = data_helper.get_all_outlet_balances()
         
         selected_outlet = request.args.get('outlet_id', type=int)
         
@@ -549,17 +725,17 @@ def payment_add():
             
             if amount <= 0:
                 flash('Jumlah pembayaran harus lebih dari 0', 'danger')
-                return render_template('payment/add.html', outlets=outlets_list, selected_outlet=selected_outlet)
+                return render_template('payment/add.html', outlets=outlets_list, outlet_balances=outlet_balances, selected_outlet=selected_outlet)
             
-            balance = data_helper.get_outlet_balance(outlet_id)
+            balance = outlet_balances.get(outlet_id, 0)
             
             if balance <= 0:
                 flash('Outlet tidak memiliki tagihan', 'danger')
-                return render_template('payment/add.html', outlets=outlets_list, selected_outlet=selected_outlet)
+                return render_template('payment/add.html', outlets=outlets_list, outlet_balances=outlet_balances, selected_outlet=selected_outlet)
             
             if amount > balance:
                 flash(f'Jumlah pembayaran melebihi tagihan. Tagihan outlet: Rp {balance:,.0f}', 'danger')
-                return render_template('payment/add.html', outlets=outlets_list, selected_outlet=selected_outlet)
+                return render_template('payment/add.html', outlets=outlets_list, outlet_balances=outlet_balances, selected_outlet=selected_outlet)
             
             success, message = data_helper.record_payment(outlet_id, amount, payment_date)
             
@@ -569,10 +745,10 @@ def payment_add():
             else:
                 flash(message, 'danger')
         
-        return render_template('payment/add.html', outlets=outlets_list, selected_outlet=selected_outlet)
+        return render_template('payment/add.html', outlets=outlets_list, outlet_balances=outlet_balances, selected_outlet=selected_outlet)
     except Exception as e:
         flash(f'Error: {str(e)}', 'danger')
-        return render_template('payment/add.html', outlets=[], selected_outlet=None)
+        return render_template('payment/add.html', outlets=[], outlet_balances={}, selected_outlet=None)
 
 # ---------------------------
 # Invoice PDF Export Routes
@@ -580,27 +756,83 @@ def payment_add():
 @app.route('/invoice/export/<int:outlet_id>')
 @admin_required
 def export_invoice_pdf(outlet_id):
-    """Export invoice PDF for specific outlet"""
+    """Export invoice PDF for specific outlet (rendered in background, served from cache)"""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        # Generate PDF
-        pdf_buffer, filename = pdf_generator.generate_outlet_invoice(
-            data_helper, outlet_id, start_date, end_date
-        )
+        job = invoice_jobs.submit(outlet_id, start_date, end_date)
+        if job['status'] == 'done':
+            return redirect(url_for('invoice_job_download', job_id=job['id']))
         
-        return send_file(
-            pdf_buffer,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/pdf'
-        )
+        return redirect(url_for('invoice_job_status', job_id=job['id']))
         
     except Exception as e:
         flash(f'Error generating invoice PDF: {str(e)}', 'danger')
         return redirect(url_for('payment_list'))
 
+@app.route('/invoice/export-all')
+@admin_required
+def export_all_invoices():
+    """Export invoices of every outlet with unpaid sales as one ZIP (rendered in background, served from cache)"""
+    try:
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        
+        job = invoice_jobs.submit_batch(start_date, end_date)
+        if job['status'] == 'done':
+            return redirect(url_for('invoice_job_download', job_id=job['id']))
+        
+        return redirect(url_for('invoice_job_status', job_id=job['id']))
+        
+    except Exception as e:
+        flash(f'Error generating invoices: {str(e)}', 'danger')
+        return redirect(url_for('payment_list'))
+
+@app.route('/invoice/jobs/<int:job_id>')
+@admin_required
+def invoice_job_status(job_id):
+    """Status of a background invoice job (HTML, or JSON with ?format=json)"""
+    job = data_helper.get_invoice_job(job_id)
+    if not job:
+        abort(404)
+    
+    job = dict(job)
+    if request.args.get('format') == 'json':
+        return jsonify({
+            'id': job['id'],
+            'outlet_id': job['outlet_id'],
+            'status': job['status'],
+            'error': job['error'],
+            'download_url': url_for('invoice_job_download', job_id=job_id) if job['status'] == 'done' else None,
+        })
+    
+    return render_template('invoice/job.html', job=job)
+
+@app.route('/invoice/jobs/<int:job_id>/download')
+@admin_required
+def invoice_job_download(job_id):
+    job = data_helper.get_invoice_job(job_id)
+    if not job or job['status'] != 'done':
+        abort(404)
+    
+    if not os.path.exists(job['file_path']):
+        # File cache terhapus, render ulang
+        start_date = job['start_date'] and job['start_date'].isoformat()
+        end_date = job['end_date'] and job['end_date'].isoformat()
+        if job['outlet_id'] is None:
+            job = invoice_jobs.submit_batch(start_date, end_date)
+        else:
+            job = invoice_jobs.submit(job['outlet_id'], start_date, end_date)
+        return redirect(url_for('invoice_job_status', job_id=job['id']))
+    
+    return send_file(
+        job['file_path'],
+        as_attachment=True,
+        download_name=job['filename'],
+        mimetype='application/zip' if job['outlet_id'] is None else 'application/pdf'
+    )
+
 @app.route('/invoice/preview/<int:outlet_id>')
 @admin_required
 def preview_invoice(outlet_id):
@@ -634,7 +866,7 @@ def preview_invoice(outlet_id):
                                  start_date=start_date,
                                  end_date=end_date)
         
-        sales_list = [dict(sale) for sale in sales_data]
+        sales_list = sales_data
         
         # Calculate totals - only from unpaid sales
         total_qty = sum(int(sale.get('jumlah_terjual', 0)) for sale in sales_list)
@@ -668,15 +900,18 @@ def report():
         outlet_id = request.args.get('outlet_id', type=int)
         
         outlets = data_helper.get_all_outlets()
-        outlets_list = [dict(o) for o in outlets] if outlets else []
+        outlets_list = outlets or []
         
-        detailed_report, summary = data_helper.get_detailed_outlet_report(outlet_id, start_date, end_date)
         _, overall_totals = data_helper.get_all_sales_report(start_date, end_date)
         
-        # Calculate outlet slot info
+        # Calculate outlet slot info (satu query untuk semua outlet)
+        slot_usage = data_helper.get_slot_usage_for_all_outlets()
         outlet_slot_info = {}
         for outlet in outlets_list:
-            distributed, sold, slot_used = data_helper.get_outlet_slot_usage(outlet['id'])
+            usage = slot_usage.get(outlet['id'], {})
+            distributed = usage.get('distributed', 0)
+            sold = usage.get('sold', 0)
+            slot_used = usage.get('used', 0)
             outlet_slot_info[outlet['id']] = {
                 'distributed': distributed,
                 'sold': sold,
@@ -685,11 +920,7 @@ def report():
                 'usage_percentage': (slot_used / outlet['slot_maksimal'] * 100) if outlet['slot_maksimal'] > 0 else 0
             }
         
-        detailed_report_list = [dict(r) for r in detailed_report] if detailed_report else []
-        
         return render_template('report/index.html',
-                             detailed_report=detailed_report_list,
-                             summary=summary,
                              outlets=outlets_list,
                              outlet_slot_info=outlet_slot_info,
                              overall_totals=overall_totals,
@@ -699,8 +930,6 @@ def report():
     except Exception as e:
         flash(f'Error generating report: {str(e)}', 'danger')
         return render_template('report/index.html',
-                             detailed_report=[],
-                             summary={},
                              outlets=[],
                              outlet_slot_info={},
                              overall_totals={
@@ -713,6 +942,55 @@ def report():
                              start_date='',
                              end_date='')
 
+# ---------------------------
+# Export Routes (CSV/XLSX, streamed)
+# ---------------------------
+def export_response(name, export):
+    """Stream an export from DataHelper.export_* as a CSV or XLSX download"""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        abort(400)
+    
+    headers, rows = export
+    stats = instrumentation.current()
+    if stats is not None:
+        stats.streaming = True
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    # stream_with_context menahan koneksi request sampai baris terakhir terkirim
+    return Response(
+        stream_with_context(iter_export(fmt, headers, rows, sheet_name=name)),
+        content_type=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@app.route('/sales/export')
+@login_required
+def sales_export():
+    return export_response('Penjualan', data_helper.export_sales(
+        request.args.get('start_date'), request.args.get('end_date'),
+        request.args.get('outlet_id', type=int)))
+
+@app.route('/distribution/export')
+@login_required
+def distribution_export():
+    return export_response('Distribusi', data_helper.export_distributions(
+        request.args.get('start_date'), request.args.get('end_date'),
+        request.args.get('outlet_id', type=int)))
+
+@app.route('/payment/export')
+@admin_required
+def payment_export():
+    return export_response('Pembayaran', data_helper.export_payments(
+        request.args.get('start_date'), request.args.get('end_date'),
+        request.args.get('outlet_id', type=int)))
+
+@app.route('/report/export')
+@admin_required
+def report_export():
+    return export_response('Laporan_Detail', data_helper.export_detailed_outlet_report(
+        request.args.get('outlet_id', type=int),
+        request.args.get('start_date'), request.args.get('end_date')))
+
 # ---------------------------
 # User Management Routes
 # ---------------------------
@@ -793,6 +1071,16 @@ def user_delete(id):
         flash(f'Error: {str(e)}', 'danger')
     return redirect(url_for('user_list'))
 
+# ---------------------------
+# Monitoring
+# ---------------------------
+@app.route('/metrics')
+def metrics_endpoint():
+    token = app.config['METRICS_TOKEN']
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        abort(401)
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 # ---------------------------
 # Run Application
 # ---------------------------
@@ -0,0 +1,65 @@
+"""Query count of the dashboards, report and payment pages as outlet count grows.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_dashboard_queries
+
+With get_slot_usage_for_all_outlets() and get_all_outlet_balances() the
+number of statements per page stays constant; the old per-outlet loops
+added one or two statements per outlet.
+"""
+import argparse
+
+from benchmarks.common import require_bench_database, reset_schema, admin_client, Timer
+
+require_bench_database()
+
+from app import app, data_helper  # noqa: E402
+from utils import instrumentation  # noqa: E402
+
+
+def seed(outlet_count, products_per_outlet=5):
+    reset_schema(data_helper)
+    data_helper.execute_query("""
+        INSERT INTO products (nama, harga, stok_pusat, persentase_komisi)
+        SELECT 'Bench Produk ' || g, 10000, 1000000, 10 FROM generate_series(1, %s) g
+    """, (products_per_outlet,))
+    data_helper.execute_query("""
+        INSERT INTO outlets (nama, lokasi, kontak, slot_maksimal)
+        SELECT 'Bench Outlet ' || g, 'Lokasi ' || g, '-', 500 FROM generate_series(1, %s) g
+    """, (outlet_count,))
+    data_helper.execute_query("""
+        INSERT INTO distributions (outlet_id, produk_id, jumlah)
+        SELECT o.id, p.id, 20 FROM outlets o CROSS JOIN products p
+    """)
+    data_helper.execute_query("""
+        INSERT INTO sales (outlet_id, produk_id, jumlah_terjual, tagihan, komisi, yang_harus_dibayar, remaining_amount)
+        SELECT o.id, p.id, 5, 50000, 5000, 45000, 45000 FROM outlets o CROSS JOIN products p
+    """)
+    data_helper.rebuild_outlet_stock()
+    data_helper.rebuild_daily_summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,500', help="Jumlah outlet yang diuji, dipisah koma")
+    args = parser.parse_args()
+
+    statements = []
+    instrumentation.add_query_hook(lambda call_site, seconds, rowcount: statements.append(call_site))
+    client = admin_client(app)
+
+    print(f"{'outlets':>8} {'route':<20} {'queries':>8} {'ms':>10}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        seed(size)
+        for route in ('/', '/karyawan/dashboard', '/report', '/payment', '/payment/add'):
+            client.get(route)  # warm-up
+            statements.clear()
+            with Timer() as t:
+                response = client.get(route)
+            assert response.status_code == 200, f"{route} -> {response.status_code}"
+            print(f"{size:>8} {route:<20} {len(statements):>8} {t.elapsed * 1000:>10.1f}")
+
+    data_helper.close_connection()
+
+
+if __name__ == '__main__':
+    main()
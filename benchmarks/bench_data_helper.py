@@ -0,0 +1,193 @@
+"""Per-method DataHelper timings, appended to a JSON history to compare revisions.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_data_helper --sales 200000
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_data_helper --reuse --only report
+
+Seeds the database with benchmarks.seed_data, or with --reuse measures
+whatever is already there (e.g. the full 5M-sale dataset). Every case runs
+once as warm-up and then --repeat times; min/median/p95 and the number of
+SQL statements per call are printed and appended to --history together
+with the git revision and dataset size. The median of each case is
+compared with the latest earlier run on a dataset of the same size.
+
+Write cases (record_sale_with_bill, create_distribution, record_payment)
+add a row per call, so --reuse runs slowly grow the dataset.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import require_bench_database, percentile
+
+require_bench_database()
+
+from benchmarks import seed_data  # noqa: E402
+from utils import instrumentation  # noqa: E402
+from utils.data_helper import DataHelper  # noqa: E402
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history', 'data_helper.json')
+
+
+def load_targets(helper):
+    """Busiest outlet, the outlet/product pair with most stock and the outlet with the largest balance"""
+    busiest = helper.execute_query("""
+        SELECT outlet_id FROM sales GROUP BY outlet_id ORDER BY COUNT(*) DESC LIMIT 1
+    """, fetch='one')
+    stock = helper.execute_query("""
+        SELECT outlet_id, produk_id FROM outlet_stock
+        ORDER BY total_distribusi - total_terjual DESC LIMIT 1
+    """, fetch='one')
+    payer = helper.execute_query("""
+        SELECT outlet_id FROM sales WHERE remaining_amount > 0
+        GROUP BY outlet_id ORDER BY SUM(remaining_amount) DESC LIMIT 1
+    """, fetch='one')
+    product = helper.execute_query("SELECT id FROM products ORDER BY stok_pusat DESC LIMIT 1", fetch='one')
+    last_date = helper.execute_query("SELECT MAX(tanggal)::date as last FROM sales", fetch='one')['last']
+    if not (busiest and stock and payer and product):
+        raise SystemExit("Database benchmark kosong; jalankan tanpa --reuse atau isi dengan benchmarks.seed_data")
+    return {
+        'outlet_id': busiest['outlet_id'],
+        'stock_outlet_id': stock['outlet_id'],
+        'stock_product_id': stock['produk_id'],
+        'payer_id': payer['outlet_id'],
+        'product_id': product['id'],
+        'month': ((last_date - timedelta(days=29)).isoformat(), last_date.isoformat()),
+    }
+
+
+def succeeded(result):
+    success, message = result
+    if not success:
+        raise RuntimeError(message)
+    return result
+
+
+def build_cases(helper, t):
+    month_start, month_end = t['month']
+    now = lambda: datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # noqa: E731
+    return [
+        ('get_outlet_balance', lambda: helper.get_outlet_balance(t['outlet_id'])),
+        ('get_all_outlet_balances', helper.get_all_outlet_balances),
+        ('get_outlet_product_stock', lambda: helper.get_outlet_product_stock(t['stock_outlet_id'], t['stock_product_id'])),
+        ('get_slot_usage_for_all_outlets', helper.get_slot_usage_for_all_outlets),
+        ('get_unpaid_sales(outlet)', lambda: helper.get_unpaid_sales(outlet_id=t['outlet_id'])),
+        ('get_all_sales(page)', lambda: helper.get_all_sales(page_size=50)),
+        ('get_all_payments(page)', lambda: helper.get_all_payments(page_size=50)),
+        ('get_all_sales_report(semua)', helper.get_all_sales_report),
+        ('get_all_sales_report(30 hari)', lambda: helper.get_all_sales_report(month_start, month_end)),
+        ('get_detailed_outlet_report(outlet, 30 hari)',
+         lambda: helper.get_detailed_outlet_report(t['outlet_id'], month_start, month_end)),
+        ('record_sale_with_bill',
+         lambda: succeeded(helper.record_sale_with_bill(t['stock_outlet_id'], t['stock_product_id'], 1, now()))),
+        ('create_distribution',
+         lambda: succeeded(helper.create_distribution(t['stock_outlet_id'], t['product_id'], 1))),
+        ('record_payment', lambda: succeeded(helper.record_payment(t['payer_id'], 1000, month_end))),
+    ]
+
+
+def measure(fn, repeat):
+    fn()  # warm-up (cache referensi, plan cache)
+    timings = []
+    statements = 0
+    for _ in range(repeat):
+        stats = instrumentation.start_request()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+        instrumentation.finish_request()
+        statements = len(stats.queries)
+    timings.sort()
+    return {
+        'min_ms': round(timings[0] * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'p95_ms': round(percentile(timings, 95) * 1000, 3),
+        'statements': statements,
+    }
+
+
+def git_revision():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}-dirty" if dirty else revision
+
+
+def same_dataset(a, b):
+    """Same outlets/products and sales within 1% (write cases add a few rows per run)"""
+    return (a['outlets'] == b['outlets'] and a['products'] == b['products']
+            and abs(a['sales'] - b['sales']) <= 0.01 * max(a['sales'], 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--outlets', type=int, default=200)
+    parser.add_argument('--products', type=int, default=100)
+    parser.add_argument('--sales', type=int, default=200000)
+    parser.add_argument('--reuse', action='store_true', help='pakai data yang sudah ada, tanpa seed ulang')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--only', help='hanya case yang namanya mengandung teks ini')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='file JSON riwayat hasil')
+    parser.add_argument('--no-save', action='store_true', help='jangan tambahkan hasil ke riwayat')
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    if not args.reuse:
+        seed_args = seed_data.build_parser().parse_args([
+            '--outlets', str(args.outlets), '--products', str(args.products), '--sales', str(args.sales)])
+        seed_data.seed(helper, seed_args)
+
+    counts = seed_data.dataset_counts(helper)
+    dataset = {name: counts[name] for name in ('outlets', 'products', 'sales', 'payments')}
+    cases = build_cases(helper, load_targets(helper))
+    if args.only:
+        cases = [case for case in cases if args.only in case[0]]
+
+    history = []
+    if os.path.exists(args.history):
+        with open(args.history) as f:
+            history = json.load(f)
+    previous = next((run for run in reversed(history) if same_dataset(run['dataset'], dataset)), None)
+
+    print(f"{dataset['outlets']} outlet, {dataset['products']} produk, {dataset['sales']:,} sales, "
+          f"{dataset['payments']:,} payments; {args.repeat}x per case")
+    if previous:
+        print(f"dibandingkan dengan {previous['revision']} ({previous['timestamp']})")
+    print(f"{'case':<48} {'min ms':>9} {'median ms':>10} {'p95 ms':>9} {'stmts':>6} {'vs prev':>8}")
+
+    results = {}
+    for name, fn in cases:
+        result = results[name] = measure(fn, args.repeat)
+        change = ''
+        before = previous and previous['results'].get(name)
+        if before and before['median_ms']:
+            change = f"{(result['median_ms'] / before['median_ms'] - 1) * 100:+.0f}%"
+        print(f"{name:<48} {result['min_ms']:>9.2f} {result['median_ms']:>10.2f} {result['p95_ms']:>9.2f} "
+              f"{result['statements']:>6} {change:>8}", flush=True)
+
+    helper.close_connection()
+
+    if not args.no_save:
+        history.append({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'dataset': dataset,
+            'repeat': args.repeat,
+            'results': results,
+        })
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, 'w') as f:
+            json.dump(history, f, indent=2)
+        print(f"Hasil ditambahkan ke {args.history}")
+
+
+if __name__ == '__main__':
+    main()
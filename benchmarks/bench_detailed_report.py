@@ -0,0 +1,144 @@
+"""get_detailed_outlet_report(): previous query + Python summary vs the single-pass query.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_detailed_report --sales 1000000
+
+The previous version re-aggregated the whole distributions and sales
+tables for every call and summed the result six times in Python; it is
+reproduced below as `legacy_detailed_report`.
+"""
+import argparse
+
+from benchmarks.common import require_bench_database, reset_schema, Timer
+
+require_bench_database()
+
+from utils.data_helper import DataHelper  # noqa: E402
+
+# total_distribusi berbeda dengan sengaja: versi lama menjumlah distribusi sepanjang masa per baris
+# sales (terhitung ganda), versi baru menjumlah distribusi dalam periode per outlet/produk
+SUMMARY_KEYS = ('total_terjual', 'total_tagihan', 'total_komisi', 'total_dibayar', 'total_belum_dibayar')
+
+
+def seed(helper, outlet_count, sales_count):
+    reset_schema(helper)
+    helper.execute_query("""
+        INSERT INTO outlets (nama, slot_maksimal)
+        SELECT 'Bench Outlet ' || g, 1000 FROM generate_series(1, %s) g
+    """, (outlet_count,))
+    helper.execute_query("""
+        INSERT INTO products (nama, harga, stok_pusat, persentase_komisi)
+        SELECT 'Bench Produk ' || g, 10000, 0, 10 FROM generate_series(1, 50) g
+    """)
+    helper.execute_query("""
+        INSERT INTO distributions (outlet_id, produk_id, jumlah, tanggal)
+        SELECT 1 + g %% %s, 1 + g %% 50, 10, TIMESTAMP '2022-01-01' + (g * INTERVAL '3 years') / %s
+        FROM generate_series(1, %s) g
+    """, (outlet_count, sales_count // 4, sales_count // 4))
+    helper.execute_query("""
+        INSERT INTO sales (outlet_id, produk_id, jumlah_terjual, tanggal, tagihan, komisi, yang_harus_dibayar, is_paid, remaining_amount)
+        SELECT 1 + g %% %s, 1 + g %% 50, 1,
+               TIMESTAMP '2022-01-01' + (g * INTERVAL '3 years') / %s,
+               10000, 1000, 9000, g %% 10 <> 0, CASE WHEN g %% 10 = 0 THEN 9000 ELSE 0 END
+        FROM generate_series(1, %s) g
+    """, (outlet_count, sales_count, sales_count))
+    helper.rebuild_outlet_stock()
+    helper.rebuild_daily_summary()
+    helper.execute_query("ANALYZE")
+
+
+def legacy_detailed_report(helper, outlet_id=None, start_date=None, end_date=None):
+    query = """
+        SELECT s.tanggal, s.outlet_id, o.nama as outlet_nama, s.produk_id, p.nama as produk_nama,
+               s.jumlah_terjual, p.harga, s.tagihan, s.komisi, s.yang_harus_dibayar, s.is_paid,
+               s.remaining_amount,
+               COALESCE(d.total_distribusi, 0) as distribusi,
+               COALESCE(d.total_distribusi, 0) - COALESCE(sold.total_sold, 0) as sisa
+        FROM sales s
+        LEFT JOIN outlets o ON s.outlet_id = o.id
+        LEFT JOIN products p ON s.produk_id = p.id
+        LEFT JOIN (
+            SELECT produk_id, outlet_id, SUM(jumlah) as total_distribusi
+            FROM distributions GROUP BY produk_id, outlet_id
+        ) d ON s.produk_id = d.produk_id AND s.outlet_id = d.outlet_id
+        LEFT JOIN (
+            SELECT produk_id, outlet_id, SUM(jumlah_terjual) as total_sold
+            FROM sales GROUP BY produk_id, outlet_id
+        ) sold ON s.produk_id = sold.produk_id AND s.outlet_id = sold.outlet_id
+        WHERE 1=1
+    """
+    params = []
+    if start_date and end_date:
+        # Previous version compared against midnight of end_date; widen it so both cover the same rows
+        query += " AND s.tanggal >= %s AND s.tanggal <= %s"
+        params.extend([start_date, f"{end_date} 23:59:59.999999"])
+    if outlet_id:
+        query += " AND s.outlet_id = %s"
+        params.append(outlet_id)
+    query += " ORDER BY s.tanggal DESC"
+
+    rows = helper.execute_query(query, params, fetch='all')
+    summary = {
+        'total_terjual': sum(float(row['jumlah_terjual']) for row in rows),
+        'total_tagihan': sum(float(row['tagihan']) for row in rows),
+        'total_komisi': sum(float(row['komisi']) for row in rows),
+        'total_dibayar': sum(float(row['yang_harus_dibayar']) for row in rows),
+        'total_distribusi': sum(float(row['distribusi']) for row in rows),
+        'total_belum_dibayar': sum(float(row['remaining_amount']) for row in rows),
+    }
+    return rows, summary
+
+
+def ledger_distribusi(helper, outlet_id=None, start_date=None, end_date=None):
+    query = "SELECT COALESCE(SUM(jumlah), 0) as total FROM distributions WHERE 1=1"
+    params = []
+    if start_date and end_date:
+        query += " AND tanggal >= %s::date AND tanggal < %s::date + INTERVAL '1 day'"
+        params.extend([start_date, end_date])
+    if outlet_id:
+        query += " AND outlet_id = %s"
+        params.append(outlet_id)
+    return float(helper.execute_query(query, params, fetch='one')['total'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--outlets', type=int, default=500)
+    parser.add_argument('--sales', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    seed(helper, args.outlets, args.sales)
+
+    scenarios = [
+        ('1 outlet, 1 bulan', (7, '2023-03-01', '2023-03-31')),
+        ('1 outlet, semua', (7, None, None)),
+        ('semua outlet, 1 minggu', (None, '2023-03-01', '2023-03-07')),
+    ]
+
+    print(f"{'scenario':<24} {'rows':>8} {'legacy ms':>10} {'new ms':>10}")
+    for name, filters in scenarios:
+        timings = {}
+        for label, fn in (('legacy', legacy_detailed_report), ('new', helper.get_detailed_outlet_report)):
+            best = None
+            for _ in range(args.repeat):
+                with Timer() as t:
+                    rows, summary = fn(helper, *filters) if fn is legacy_detailed_report else fn(*filters)
+                best = t.elapsed if best is None else min(best, t.elapsed)
+            timings[label] = (best, rows, summary)
+
+        _, legacy_rows, legacy_summary = timings['legacy']
+        _, new_rows, new_summary = timings['new']
+        assert len(legacy_rows) == len(new_rows), (len(legacy_rows), len(new_rows))
+        for key in SUMMARY_KEYS:
+            assert abs(legacy_summary[key] - new_summary[key]) < 0.01, (key, legacy_summary[key], new_summary[key])
+        expected = ledger_distribusi(helper, *filters)
+        assert abs(new_summary['total_distribusi'] - expected) < 0.01, (new_summary['total_distribusi'], expected)
+
+        print(f"{name:<24} {len(new_rows):>8} {timings['legacy'][0] * 1000:>10.1f} {timings['new'][0] * 1000:>10.1f}")
+
+    helper.close_connection()
+
+
+if __name__ == '__main__':
+    main()
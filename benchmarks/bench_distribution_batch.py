@@ -0,0 +1,78 @@
+"""Recording a delivery manifest: create_distribution() per line vs create_distribution_batch().
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_distribution_batch --outlets 15 --products 20
+
+One truck run drops every product at every outlet. The per-line path
+takes a stock check, three writes and a commit for each line; the batch
+path locks the manifest's products once and writes everything in one
+transaction.
+"""
+import argparse
+
+from benchmarks.common import require_bench_database, reset_schema, Timer
+
+require_bench_database()
+
+from utils.data_helper import DataHelper  # noqa: E402
+from utils import instrumentation  # noqa: E402
+
+
+def seed(helper, outlet_count, product_count):
+    reset_schema(helper)
+    helper.execute_query("""
+        INSERT INTO outlets (nama, slot_maksimal)
+        SELECT 'Bench Outlet ' || g, 10000 FROM generate_series(1, %s) g
+    """, (outlet_count,))
+    helper.execute_query("""
+        INSERT INTO products (nama, harga, stok_pusat, persentase_komisi)
+        SELECT 'Bench Produk ' || g, 10000, 1000000, 10 FROM generate_series(1, %s) g
+    """, (product_count,))
+    helper.invalidate_reference_data()
+
+
+def stock_snapshot(helper):
+    products = helper.execute_query("SELECT id, stok_pusat FROM products ORDER BY id", fetch='all')
+    outlet_stock = helper.execute_query("""
+        SELECT outlet_id, produk_id, total_distribusi FROM outlet_stock ORDER BY outlet_id, produk_id
+    """, fetch='all')
+    return [tuple(r.values()) for r in products], [tuple(r.values()) for r in outlet_stock]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--outlets', type=int, default=15)
+    parser.add_argument('--products', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=10, help="Jumlah manifest per path")
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    statements = []
+    instrumentation.add_query_hook(lambda call_site, seconds, rowcount: statements.append(call_site))
+
+    manifest = [(o, p, 5) for o in range(1, args.outlets + 1) for p in range(1, args.products + 1)]
+    lines_total = len(manifest) * args.runs
+
+    print(f"{'path':<10} {'lines':>8} {'queries':>8} {'ms':>10} {'lines/s':>10}")
+    snapshots = {}
+    for label in ('per-line', 'batch'):
+        seed(helper, args.outlets, args.products)
+        statements.clear()
+        with Timer() as t:
+            for _ in range(args.runs):
+                if label == 'per-line':
+                    for line in manifest:
+                        success, message = helper.create_distribution(*line)
+                        assert success, message
+                else:
+                    success, message = helper.create_distribution_batch(manifest)
+                    assert success, message
+        snapshots[label] = stock_snapshot(helper)
+        print(f"{label:<10} {lines_total:>8} {len(statements):>8} {t.elapsed * 1000:>10.1f} "
+              f"{lines_total / t.elapsed:>10.0f}")
+
+    assert snapshots['per-line'] == snapshots['batch'], "saldo stok berbeda antara kedua path"
+    helper.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Sales export: fetchall + list of dicts vs the streamed CSV/XLSX export.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_exports --sales 1000000
+
+`legacy_sales_csv` is what an export built on get_all_sales would do:
+fetch every row as a RealDictRow, copy each with dict(row) like the list
+routes, then write the CSV. The streamed export reads through a named
+cursor and yields the file in chunks. Time and peak Python memory are
+measured in separate runs so tracemalloc does not skew the timings.
+"""
+import argparse
+import csv
+import io
+import time
+import tracemalloc
+
+from benchmarks.common import require_bench_database
+
+require_bench_database()
+
+from benchmarks.bench_detailed_report import seed  # noqa: E402
+from utils.data_helper import DataHelper  # noqa: E402
+from utils.exports import iter_csv, iter_xlsx  # noqa: E402
+
+LEGACY_FIELDS = ('id', 'tanggal', 'outlet_nama', 'produk_nama', 'jumlah_terjual', 'harga', 'tagihan',
+                 'komisi', 'yang_harus_dibayar', 'remaining_amount', 'is_paid')
+
+
+def legacy_sales_csv(helper):
+    rows = [dict(s) for s in helper.get_all_sales()]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(LEGACY_FIELDS)
+    for row in rows:
+        writer.writerow([row[field] for field in LEGACY_FIELDS])
+    return len(buffer.getvalue().encode('utf-8'))
+
+
+def streamed_export(helper, writer):
+    headers, rows = helper.export_sales()
+    return sum(len(chunk) for chunk in writer(headers, rows))
+
+
+def measure(fn):
+    started = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--outlets', type=int, default=500)
+    parser.add_argument('--sales', type=int, default=1000000)
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    seed(helper, args.outlets, args.sales)
+
+    paths = [
+        ('legacy csv', lambda: legacy_sales_csv(helper)),
+        ('streamed csv', lambda: streamed_export(helper, iter_csv)),
+        ('streamed xlsx', lambda: streamed_export(helper, iter_xlsx)),
+    ]
+
+    print(f"{'path':<14} {'rows':>9} {'seconds':>8} {'peak MB':>8} {'file MB':>8}")
+    for name, fn in paths:
+        elapsed, peak, size = measure(fn)
+        print(f"{name:<14} {args.sales:>9} {elapsed:>8.2f} {peak / 1e6:>8.1f} {size / 1e6:>8.1f}")
+
+    helper.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Month-end invoice run: per-outlet export loop vs generate_all_invoices() with 1..N processes.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_invoice_batch --outlets 100 --sales-per-outlet 60
+
+The per-outlet loop is what exporting through /invoice/export/<outlet_id>
+one outlet at a time costs (outlet lookup + unpaid sales query + render).
+"""
+import argparse
+import io
+import os
+import zipfile
+
+from benchmarks.common import require_bench_database, reset_schema, Timer
+
+require_bench_database()
+
+from utils.data_helper import DataHelper  # noqa: E402
+from utils import instrumentation  # noqa: E402
+from utils.invoice_batch import generate_all_invoices  # noqa: E402
+from utils.pdf_generator import InvoicePDFGenerator  # noqa: E402
+
+
+def seed(helper, outlet_count, sales_per_outlet):
+    reset_schema(helper)
+    helper.execute_query("""
+        INSERT INTO outlets (nama, lokasi, kontak, slot_maksimal)
+        SELECT 'Bench Outlet ' || g, 'Salatiga', '0800', 1000 FROM generate_series(1, %s) g
+    """, (outlet_count,))
+    helper.execute_query("""
+        INSERT INTO products (nama, harga, stok_pusat, persentase_komisi)
+        SELECT 'Bench Produk ' || g, 10000, 0, 10 FROM generate_series(1, 20) g
+    """)
+    helper.execute_query("""
+        INSERT INTO sales (outlet_id, produk_id, jumlah_terjual, tanggal, tagihan, komisi, yang_harus_dibayar, is_paid, remaining_amount)
+        SELECT 1 + g %% %s, 1 + g %% 20, 1, TIMESTAMP '2026-09-01' + (g * INTERVAL '30 days') / %s,
+               10000, 1000, 9000, FALSE, 9000
+        FROM generate_series(1, %s) g
+    """, (outlet_count, outlet_count * sales_per_outlet, outlet_count * sales_per_outlet))
+    helper.invalidate_reference_data()
+
+
+def per_outlet_loop(helper, outlet_count):
+    generator = InvoicePDFGenerator()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for outlet_id in range(1, outlet_count + 1):
+            pdf_buffer, filename = generator.generate_outlet_invoice(helper, outlet_id)
+            archive.writestr(f"{outlet_id:04d}_{filename}", pdf_buffer.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--outlets', type=int, default=100)
+    parser.add_argument('--sales-per-outlet', type=int, default=60)
+    parser.add_argument('--workers', default=None,
+                        help="Daftar jumlah proses, mis. 1,2,4 (default: pangkat 2 sampai jumlah CPU)")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(',')]
+    else:
+        worker_counts = [w for w in (1, 2, 4, 8, 16, 32) if w < cpus] + [cpus]
+
+    helper = DataHelper()
+    statements = []
+    instrumentation.add_query_hook(lambda call_site, seconds, rowcount: statements.append(call_site))
+    seed(helper, args.outlets, args.sales_per_outlet)
+
+    print(f"{'path':<14} {'queries':>8} {'wall s':>8} {'speedup':>8}")
+    statements.clear()
+    with Timer() as t:
+        per_outlet_loop(helper, args.outlets)
+    baseline = t.elapsed
+    print(f"{'per-outlet':<14} {len(statements):>8} {baseline:>8.2f} {1:>8.2f}")
+
+    for workers in worker_counts:
+        statements.clear()
+        with Timer() as t:
+            result = generate_all_invoices(helper, io.BytesIO(), workers=workers)
+        assert len(result['invoices']) == args.outlets, len(result['invoices'])
+        print(f"{f'batch x{workers}':<14} {len(statements):>8} {t.elapsed:>8.2f} {baseline / t.elapsed:>8.2f}")
+
+    helper.close_connection()
+
+
+if __name__ == '__main__':
+    main()
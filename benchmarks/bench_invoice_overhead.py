@@ -0,0 +1,101 @@
+"""Per-invoice overhead for small invoices (no database needed).
+
+    python -m benchmarks.bench_invoice_overhead --lines 0,5,20 --invoices 200
+
+`LegacyInvoiceGenerator` below rebuilds the company header, contact block,
+title and footer as paragraphs and creates every TableStyle for each
+invoice, as generate_invoice did before the page templates and prebuilt
+styles; both render the same sales rows.
+"""
+import argparse
+import itertools
+import time
+from datetime import datetime
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+from benchmarks.bench_invoice_render import sales, OUTLET
+from utils.pdf_generator import InvoicePDFGenerator, InvoiceRowStream, DeferredFlowable
+
+
+class LegacyInvoiceGenerator(InvoicePDFGenerator):
+    def generate_invoice(self, outlet_data, sales_data, invoice_number=None, invoice_date=None):
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=20*mm, leftMargin=20*mm,
+                                topMargin=20*mm, bottomMargin=20*mm)
+        story = [
+            Paragraph(self.COMPANY_NAME, self.company_style),
+            Paragraph('<br/>'.join(self.CONTACT_LINES), self.contact_style),
+            Spacer(1, 10),
+            Paragraph(self.INVOICE_TITLE, self.invoice_title_style),
+        ]
+        details = Table([
+            ['No. Invoice:', f"INV-{datetime.now().strftime('%Y%m%d')}-{outlet_data['id']:04d}"],
+            ['Tanggal:', datetime.now().strftime('%d %B %Y')],
+            ['Outlet:', outlet_data['nama']],
+            ['Lokasi:', outlet_data.get('lokasi', '-')],
+            ['Kontak:', outlet_data.get('kontak', '-')],
+        ], colWidths=[40*mm, 120*mm])
+        details.setStyle(TableStyle(self.details_table_style.getCommands()))
+        story += [details, Spacer(1, 20)]
+
+        rows = iter(sales_data)
+        first_sale = next(rows, None)
+        if first_sale is None:
+            story.append(Paragraph("TIDAK ADA TAGIHAN YANG BELUM DIBAYAR", self.section_header_style))
+        else:
+            story.append(Paragraph("RINCIAN PENJUALAN BELUM DIBAYAR", self.section_header_style))
+            totals = {'qty': 0, 'amount': 0, 'commission': 0, 'bill': 0}
+            styles = (TableStyle(self.sales_page_style.getCommands()),
+                      TableStyle(self.sales_final_style.getCommands()))
+            story.append(InvoiceRowStream(
+                self.format_sales_rows(itertools.chain([first_sale], rows), totals),
+                self.SALES_TABLE_HEADER, self.SALES_TABLE_COL_WIDTHS, self.SALES_TABLE_ROW_HEIGHT, styles,
+                lambda: ['', '', 'TOTAL', str(totals['qty']), '',
+                         self.format_currency(totals['amount']),
+                         self.format_currency(totals['commission']),
+                         self.format_currency(totals['bill'])]))
+            story.append(Spacer(1, 20))
+
+            def summary():
+                header, table = self.summary_flowables(totals)
+                table.setStyle(TableStyle(self.summary_table_style.getCommands()))
+                return [header, table]
+            story.append(DeferredFlowable(summary))
+
+        story.append(Spacer(1, 30))
+        story.append(Paragraph(
+            '<para align="center"><font size="8" color="#666666">Terima kasih atas kerjasama Anda!<br/>'
+            f'Invoice ini dibuat secara otomatis pada {datetime.now().strftime("%d %B %Y %H:%M:%S")}<br/>'
+            'Untuk pertanyaan, silakan hubungi kontak di atas.</font></para>', self.normal_style))
+        doc.build(story)
+        buffer.seek(0)
+        return buffer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', default='0,5,20')
+    parser.add_argument('--invoices', type=int, default=200)
+    args = parser.parse_args()
+
+    generators = [('legacy', LegacyInvoiceGenerator()), ('prebuilt', InvoicePDFGenerator())]
+
+    print(f"{'path':<10} {'lines':>6} {'ms/invoice':>11}")
+    for lines in [int(n) for n in args.lines.split(',')]:
+        results = {}
+        for label, generator in generators:
+            generator.generate_invoice(OUTLET, sales(lines))  # warm-up (font & style caches)
+            started = time.perf_counter()
+            for _ in range(args.invoices):
+                generator.generate_invoice(OUTLET, sales(lines))
+            results[label] = (time.perf_counter() - started) / args.invoices
+            print(f"{label:<10} {lines:>6} {results[label] * 1000:>11.2f}")
+        print(f"{'':<10} {'':>6} {(1 - results['prebuilt'] / results['legacy']) * 100:>10.0f}% lebih cepat")
+
+
+if __name__ == '__main__':
+    main()
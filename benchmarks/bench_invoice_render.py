@@ -0,0 +1,133 @@
+"""Invoice PDF rendering time and peak memory for large invoices (no database needed).
+
+    python -m benchmarks.bench_invoice_render --lines 100,1000,5000,10000
+
+Compares InvoicePDFGenerator.generate_invoice, which lays the sales table
+out page by page from an iterator, with the previous approach of one
+Table holding every row (reproduced below as `legacy_sales_story`; it
+only builds the sales table and summary, so it is timed without the
+invoice header and footer).
+"""
+import argparse
+import datetime
+import time
+import tracemalloc
+from decimal import Decimal
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+from utils.pdf_generator import InvoicePDFGenerator
+
+OUTLET = {'id': 1, 'nama': 'Bench Outlet', 'lokasi': 'Salatiga', 'kontak': '0800'}
+
+
+def sales(count):
+    start = datetime.datetime(2026, 1, 1, 8, 0, 0)
+    for i in range(count):
+        yield {
+            'tanggal': start + datetime.timedelta(minutes=i),
+            'produk_nama': f'Bench Produk {i % 50}',
+            'jumlah_terjual': 1 + i % 5,
+            'harga': Decimal('10000'),
+            'tagihan': Decimal('10000') * (1 + i % 5),
+            'komisi': Decimal('1000') * (1 + i % 5),
+            'yang_harus_dibayar': Decimal('9000') * (1 + i % 5),
+        }
+
+
+def legacy_sales_story(generator, sales_data):
+    """Single Table with every row, dates re-parsed from strings"""
+    sales_data = list(sales_data)
+    table_data = [list(generator.SALES_TABLE_HEADER)]
+    totals = {'qty': 0, 'amount': 0, 'commission': 0, 'bill': 0}
+    for idx, sale in enumerate(sales_data, 1):
+        qty = int(sale.get('jumlah_terjual', 0))
+        totals['qty'] += qty
+        totals['amount'] += float(sale['tagihan'])
+        totals['commission'] += float(sale['komisi'])
+        totals['bill'] += float(sale['yang_harus_dibayar'])
+        table_data.append([
+            str(idx),
+            datetime.datetime.strptime(str(sale['tanggal']), '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%Y'),
+            sale.get('produk_nama', '-'),
+            str(qty),
+            generator.format_currency(sale['harga']),
+            generator.format_currency(sale['tagihan']),
+            generator.format_currency(sale['komisi']),
+            generator.format_currency(sale['yang_harus_dibayar']),
+        ])
+    table_data.append(['', '', 'TOTAL', str(totals['qty']), '',
+                       generator.format_currency(totals['amount']),
+                       generator.format_currency(totals['commission']),
+                       generator.format_currency(totals['bill'])])
+
+    table = Table(table_data, colWidths=generator.SALES_TABLE_COL_WIDTHS, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -2), 8),
+        ('ALIGN', (3, 1), (-1, -2), 'RIGHT'),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f0f0f0')),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ]))
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=20*mm, leftMargin=20*mm,
+                            topMargin=20*mm, bottomMargin=20*mm)
+    doc.build([table] + generator.summary_flowables(totals))
+    return buffer
+
+
+def measure(fn, lines, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(sales(lines))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Memori diukur terpisah, tracemalloc memperlambat eksekusi
+    tracemalloc.start()
+    size = len(fn(sales(lines)).getvalue())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', default='100,1000,5000,10000')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-legacy-above', type=int, default=10000,
+                        help="Lewati path lama untuk invoice lebih besar dari ini")
+    args = parser.parse_args()
+
+    generator = InvoicePDFGenerator()
+    paths = [
+        ('legacy', lambda rows: legacy_sales_story(generator, rows)),
+        ('streamed', lambda rows: generator.generate_invoice(OUTLET, rows)),
+    ]
+
+    print(f"{'path':<10} {'lines':>7} {'ms':>10} {'ms/line':>8} {'peak MB':>8} {'PDF KB':>8}")
+    for lines in [int(n) for n in args.lines.split(',')]:
+        for label, fn in paths:
+            if label == 'legacy' and lines > args.skip_legacy_above:
+                continue
+            elapsed, peak, size = measure(fn, lines, args.repeat)
+            print(f"{label:<10} {lines:>7} {elapsed * 1000:>10.1f} {elapsed * 1000 / lines:>8.3f} "
+                  f"{peak / 2**20:>8.1f} {size / 1024:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Paying off an outlet with many open sales through record_payment().
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_record_payment --sales 10000
+
+Compares the set-based FIFO allocation against the previous per-sale
+UPDATE loop (reproduced below as `legacy_record_payment`).
+"""
+import argparse
+import datetime
+
+from benchmarks.common import require_bench_database, reset_schema, Timer
+
+require_bench_database()
+
+from utils.data_helper import DataHelper  # noqa: E402
+from utils import instrumentation  # noqa: E402
+
+
+def seed(helper, sales_count):
+    reset_schema(helper)
+    helper.execute_query("INSERT INTO outlets (nama, slot_maksimal) VALUES ('Bench Outlet', 0)")
+    helper.execute_query("INSERT INTO products (nama, harga, persentase_komisi) VALUES ('Bench Produk', 10000, 10)")
+    helper.execute_query("""
+        INSERT INTO sales (outlet_id, produk_id, jumlah_terjual, tanggal, tagihan, komisi, yang_harus_dibayar, is_paid, remaining_amount)
+        SELECT 1, 1, 1, TIMESTAMP '2020-01-01' + g * INTERVAL '1 minute', 10000, 1000, 9000, FALSE, 9000
+        FROM generate_series(1, %s) g
+    """, (sales_count,))
+    return helper.get_outlet_balance(1)
+
+
+def legacy_record_payment(helper, outlet_id, amount):
+    """Per-sale allocation loop used before the set-based statement"""
+    conn = helper.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, remaining_amount FROM sales
+        WHERE outlet_id = %s AND remaining_amount > 0
+        ORDER BY tanggal ASC
+    """, (outlet_id,))
+    remaining_payment = float(amount)
+    for sale_id, sale_remaining in cursor.fetchall():
+        sale_remaining = float(sale_remaining)
+        if remaining_payment >= sale_remaining:
+            cursor.execute("UPDATE sales SET remaining_amount = 0, is_paid = TRUE WHERE id = %s", (sale_id,))
+            remaining_payment -= sale_remaining
+            if remaining_payment <= 0:
+                break
+        else:
+            cursor.execute("UPDATE sales SET remaining_amount = %s, is_paid = FALSE WHERE id = %s",
+                           (sale_remaining - remaining_payment, sale_id))
+            break
+    conn.commit()
+    cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sales', type=int, default=10000, help="Jumlah sales terbuka")
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    statements = []
+    instrumentation.add_query_hook(lambda call_site, seconds, rowcount: statements.append(call_site))
+    today = datetime.date.today().isoformat()
+
+    print(f"{'path':<12} {'sales':>8} {'queries':>8} {'ms':>10}")
+
+    balance = seed(helper, args.sales)
+    statements.clear()
+    with Timer() as t:
+        legacy_record_payment(helper, 1, balance)
+    print(f"{'legacy':<12} {args.sales:>8} {len(statements):>8} {t.elapsed * 1000:>10.1f}")
+
+    balance = seed(helper, args.sales)
+    statements.clear()
+    with Timer() as t:
+        success, message = helper.record_payment(1, balance, today)
+    assert success, message
+    print(f"{'set-based':<12} {args.sales:>8} {len(statements):>8} {t.elapsed * 1000:>10.1f}")
+    assert helper.get_outlet_balance(1) == 0, "masih ada sisa tagihan setelah pelunasan"
+
+    helper.close_connection()
+
+
+if __name__ == '__main__':
+    main()
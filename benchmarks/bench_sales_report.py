@@ -0,0 +1,85 @@
+"""get_all_sales_report(): SUM over raw distributions/sales vs the daily rollup.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.bench_sales_report --sales 1000000
+
+The previous version summed the whole distributions and sales tables on
+every dashboard and report view; it is reproduced below as
+`legacy_sales_report`, with the end date widened to the whole day so both
+cover the same rows.
+"""
+import argparse
+
+from benchmarks.common import require_bench_database, Timer
+
+require_bench_database()
+
+from benchmarks.bench_detailed_report import seed  # noqa: E402
+from utils.data_helper import DataHelper  # noqa: E402
+
+TOTAL_KEYS = ('total_distribusi', 'total_penjualan', 'total_komisi', 'total_omzet_bersih')
+
+
+def legacy_sales_report(helper, start_date=None, end_date=None):
+    dist_query = "SELECT COALESCE(SUM(jumlah), 0) as total_distribusi FROM distributions"
+    sales_query = """
+        SELECT COALESCE(SUM(jumlah_terjual), 0) as total_penjualan,
+               COALESCE(SUM(komisi), 0) as total_komisi,
+               COALESCE(SUM(yang_harus_dibayar), 0) as total_omzet_bersih
+        FROM sales
+    """
+    params = []
+    if start_date and end_date:
+        dist_query += " WHERE tanggal >= %s AND tanggal < %s::date + INTERVAL '1 day'"
+        sales_query += " WHERE tanggal >= %s AND tanggal < %s::date + INTERVAL '1 day'"
+        params = [start_date, end_date]
+
+    dist_result = helper.execute_query(dist_query, params, fetch='one')
+    sales_result = helper.execute_query(sales_query, params, fetch='one')
+    return [], {
+        'total_distribusi': float(dist_result['total_distribusi']),
+        'total_penjualan': float(sales_result['total_penjualan']),
+        'total_komisi': float(sales_result['total_komisi']),
+        'total_omzet_bersih': float(sales_result['total_omzet_bersih']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--outlets', type=int, default=50)
+    parser.add_argument('--sales', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    seed(helper, args.outlets, args.sales)
+    rollup_rows = helper.execute_query("SELECT COUNT(*) as n FROM daily_outlet_product_summary", fetch='one')['n']
+    print(f"{args.sales} sales, {rollup_rows} baris rollup")
+
+    scenarios = [
+        ('dashboard (semua)', (None, None)),
+        ('1 bulan', ('2023-03-01', '2023-03-31')),
+        ('1 tahun', ('2023-01-01', '2023-12-31')),
+    ]
+
+    print(f"{'scenario':<20} {'legacy ms':>10} {'rollup ms':>10}")
+    for name, period in scenarios:
+        timings = {}
+        for label, fn in (('legacy', lambda: legacy_sales_report(helper, *period)),
+                          ('rollup', lambda: helper.get_all_sales_report(*period))):
+            best = None
+            for _ in range(args.repeat):
+                with Timer() as t:
+                    _, totals = fn()
+                best = t.elapsed if best is None else min(best, t.elapsed)
+            timings[label] = (best, totals)
+
+        for key in TOTAL_KEYS:
+            assert abs(timings['legacy'][1][key] - timings['rollup'][1][key]) < 0.01, (name, key)
+
+        print(f"{name:<20} {timings['legacy'][0] * 1000:>10.1f} {timings['rollup'][0] * 1000:>10.1f}")
+
+    helper.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""EXPLAIN check that list filters use indexes on a large seeded dataset.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.check_index_usage --sales 500000
+
+Runs the SQL emitted by the DataHelper list methods through EXPLAIN and
+exits non-zero when a plan falls back to a sequential scan of the
+filtered table instead of one of the expected indexes.
+"""
+import argparse
+import sys
+
+from benchmarks.common import require_bench_database, reset_schema
+
+require_bench_database()
+
+from utils.data_helper import DataHelper  # noqa: E402
+from utils import instrumentation  # noqa: E402
+
+INDEX_SCANS = ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+
+
+def seed(helper, outlet_count, sales_count):
+    reset_schema(helper)
+    helper.execute_query("""
+        INSERT INTO outlets (nama, slot_maksimal)
+        SELECT 'Bench Outlet ' || g, 1000 FROM generate_series(1, %s) g
+    """, (outlet_count,))
+    helper.execute_query("""
+        INSERT INTO products (nama, harga, stok_pusat, persentase_komisi)
+        SELECT 'Bench Produk ' || g, 10000, 0, 10 FROM generate_series(1, 50) g
+    """)
+    # Data tersebar tiga tahun, hanya ~5% sales yang belum lunas
+    helper.execute_query("""
+        INSERT INTO sales (outlet_id, produk_id, jumlah_terjual, tanggal, tagihan, komisi, yang_harus_dibayar, is_paid, remaining_amount)
+        SELECT 1 + g %% %s, 1 + g %% 50, 1,
+               TIMESTAMP '2022-01-01' + (g * INTERVAL '3 years') / %s,
+               10000, 1000, 9000, g %% 20 <> 0, CASE WHEN g %% 20 = 0 THEN 9000 ELSE 0 END
+        FROM generate_series(1, %s) g
+    """, (outlet_count, sales_count, sales_count))
+    helper.execute_query("""
+        INSERT INTO distributions (outlet_id, produk_id, jumlah, tanggal)
+        SELECT 1 + g %% %s, 1 + g %% 50, 5, TIMESTAMP '2022-01-01' + (g * INTERVAL '3 years') / %s
+        FROM generate_series(1, %s) g
+    """, (outlet_count, sales_count // 2, sales_count // 2))
+    helper.execute_query("ANALYZE")
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def check(helper, statements, name, table, call):
+    statements.clear()
+    call()
+    statement = statements[-1]
+    plan = helper.execute_query("EXPLAIN (FORMAT JSON) " + statement, fetch='one')
+    nodes = list(plan_nodes(plan['QUERY PLAN'][0]['Plan']))
+
+    # Bitmap Index Scan tidak membawa Relation Name, jadi cocokkan juga lewat prefix nama index
+    indexes = sorted({
+        n['Index Name'] for n in nodes
+        if n['Node Type'] in INDEX_SCANS
+        and (n.get('Relation Name') == table or n['Index Name'].startswith(f'idx_{table}_'))
+    })
+    seq_scans = [n for n in nodes if n['Node Type'] == 'Seq Scan' and n.get('Relation Name') == table]
+
+    ok = bool(indexes) and not seq_scans
+    print(f"{'OK  ' if ok else 'FAIL'} {name:<40} {', '.join(indexes) or 'Seq Scan'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--outlets', type=int, default=500)
+    parser.add_argument('--sales', type=int, default=500000)
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    statements = []
+    instrumentation.add_query_hook(
+        lambda call_site, seconds, rowcount, statement: statements.append(statement), statements=True)
+    seed(helper, args.outlets, args.sales)
+
+    checks = [
+        ('get_all_sales(range)', 'sales',
+         lambda: helper.get_all_sales('2023-03-01', '2023-03-07')),
+        ('get_all_sales(range, outlet)', 'sales',
+         lambda: helper.get_all_sales('2023-03-01', '2023-06-30', 7)),
+        ('get_all_distributions(range)', 'distributions',
+         lambda: helper.get_all_distributions('2023-03-01', '2023-03-07')),
+        ('get_all_distributions(range, outlet)', 'distributions',
+         lambda: helper.get_all_distributions('2023-03-01', '2023-06-30', 7)),
+        ('get_unpaid_sales(outlet)', 'sales',
+         lambda: helper.get_unpaid_sales(outlet_id=7)),
+        ('get_unpaid_sales(range, outlet)', 'sales',
+         lambda: helper.get_unpaid_sales('2023-01-01', '2023-12-31', 7)),
+    ]
+
+    results = [check(helper, statements, *c) for c in checks]
+    helper.close_connection()
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Fail when a page runs more SQL statements than its budget (N+1 guard).
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.check_query_counts
+
+Seeds benchmarks.seed_data at each of --sizes outlets and requests every
+page with the outlet/product reference cache warm and cold. A page fails
+when it runs more statements than its budget, or when its count changes
+with the number of outlets. Statements are counted through the request
+instrumentation, so a failure lists the DataHelper methods that ran.
+When a change to a page's queries is intended, update its budget in
+CHECKS.
+"""
+import argparse
+import sys
+from collections import Counter
+from datetime import date
+
+from benchmarks.common import require_bench_database, admin_client
+
+require_bench_database()
+
+from app import app, data_helper  # noqa: E402
+from benchmarks import seed_data  # noqa: E402
+from utils import instrumentation  # noqa: E402
+
+
+def stock_form(helper):
+    row = helper.execute_query("""
+        SELECT outlet_id, produk_id FROM outlet_stock
+        ORDER BY total_distribusi - total_terjual DESC LIMIT 1
+    """, fetch='one')
+    return {'outlet_id': row['outlet_id'], 'product_id': row['produk_id'], 'jumlah_terjual': 1}
+
+
+def payment_form(helper):
+    # Lunasi seluruh tagihan outlet terbesar: alokasi FIFO ke semua sales terbukanya
+    row = helper.execute_query("""
+        SELECT outlet_id, SUM(remaining_amount) as balance FROM sales
+        WHERE remaining_amount > 0
+        GROUP BY outlet_id ORDER BY 2 DESC LIMIT 1
+    """, fetch='one')
+    return {'outlet_id': row['outlet_id'], 'jumlah_bayar': row['balance'], 'tanggal_bayar': date.today().isoformat()}
+
+
+# (name, method, path, form, budget with warm cache, budget with cold cache; None = not checked)
+CHECKS = [
+    ('index', 'GET', '/', None, 3, 5),
+    ('karyawan_dashboard', 'GET', '/karyawan/dashboard', None, 5, 5),
+    ('report', 'GET', '/report', None, 2, 3),
+    ('report (filter)', 'GET', '/report?start_date=2026-01-01&end_date=2026-12-31&outlet_id=3', None, 2, 3),
+    ('payment_list', 'GET', '/payment', None, 2, 3),
+    ('payment_add', 'GET', '/payment/add', None, 1, 2),
+    ('sales_list', 'GET', '/sales', None, 1, 2),
+    ('distribution_list', 'GET', '/distribution', None, 1, 2),
+    ('outlet_list', 'GET', '/outlet', None, 0, 1),
+    ('product_list', 'GET', '/product', None, 1, 2),
+    ('preview_invoice', 'GET', '/invoice/preview/3', None, 1, 2),
+    ('sales_add (POST)', 'POST', '/sales/add', stock_form, 4, None),
+    ('payment_add (POST)', 'POST', '/payment/add', payment_form, 5, None),
+]
+
+
+def count_statements(client, statements, method, path, form, cold):
+    if cold:
+        data_helper.invalidate_reference_data()
+    statements.clear()
+    response = client.open(path, method=method, data=form)
+    expected = 302 if method == 'POST' else 200
+    assert response.status_code == expected, f"{method} {path} -> {response.status_code}"
+    return list(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10,100', help="Jumlah outlet yang diuji, dipisah koma")
+    parser.add_argument('--sales-per-outlet', type=int, default=200)
+    args = parser.parse_args()
+
+    statements = []
+    instrumentation.add_query_hook(lambda call_site, seconds, rowcount: statements.append(call_site))
+    client = admin_client(app)
+
+    counts = {}     # (name, cache) -> {size: [call_site, ...]}
+    for size in [int(s) for s in args.sizes.split(',')]:
+        seed_args = seed_data.build_parser().parse_args([
+            '--outlets', str(size), '--products', '20', '--sales', str(size * args.sales_per_outlet),
+            '--days', '180', '--end-date', '2026-12-31',
+        ])
+        seed_data.seed(data_helper, seed_args)
+
+        for name, method, path, form_builder, warm_budget, cold_budget in CHECKS:
+            form = form_builder(data_helper) if form_builder else None
+            client.get(path)  # isi cache referensi yang dipakai halaman ini
+            for cache, budget in (('warm', warm_budget), ('cold', cold_budget)):
+                if budget is not None:
+                    counts.setdefault((name, cache), {})[size] = count_statements(
+                        client, statements, method, path, form, cache == 'cold')
+
+    ok = True
+    print(f"{'':4} {'page':<22} {'cache':<5} {'budget':>6}  statements per size")
+    for name, method, path, form_builder, warm_budget, cold_budget in CHECKS:
+        for cache, budget in (('warm', warm_budget), ('cold', cold_budget)):
+            if budget is None:
+                continue
+            by_size = counts[(name, cache)]
+            sizes = {size: len(sites) for size, sites in by_size.items()}
+            passed = max(sizes.values()) <= budget and len(set(sizes.values())) == 1
+            ok = ok and passed
+            per_size = ', '.join(f"{size} outlet: {count}" for size, count in sizes.items())
+            print(f"{'OK  ' if passed else 'FAIL'} {name:<22} {cache:<5} {budget:>6}  {per_size}")
+            if not passed:
+                largest = max(by_size)
+                for call_site, count in Counter(by_size[largest]).most_common():
+                    print(f"{'':38}{count:>4} x {call_site}")
+
+    data_helper.close_connection()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
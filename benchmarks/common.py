@@ -0,0 +1,63 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks write to the database, so they only run against the database
+named by BENCH_DATABASE_URL and never against DATABASE_URL.
+"""
+import math
+import os
+import sys
+import time
+
+
+def require_bench_database():
+    """Point the app configuration at BENCH_DATABASE_URL or exit"""
+    url = os.environ.get('BENCH_DATABASE_URL')
+    if not url:
+        print("Set BENCH_DATABASE_URL ke database khusus benchmark (data di dalamnya akan dihapus)")
+        sys.exit(1)
+    # config.Config membaca environment saat import, jadi set sebelum import app/DataHelper
+    os.environ['DATABASE_URL'] = url
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('REQUEST_LOG', 'false')
+    # Benchmark berjalan dalam satu proses; invalidasi NOTIFY yang tiba asinkron dari
+    # listener akan mengosongkan cache di tengah pengukuran cache hangat
+    os.environ.setdefault('REFERENCE_CACHE_NOTIFY', 'false')
+    return url
+
+
+def reset_schema(helper):
+    """Create the schema and empty every business table"""
+    helper.init_database()
+    helper.execute_query("""
+        TRUNCATE outlets, products, distributions, sales, payments, outlet_stock,
+                 daily_outlet_product_summary
+        RESTART IDENTITY CASCADE
+    """)
+    helper.invalidate_reference_data()
+
+
+def admin_client(app):
+    """Flask test client with an admin session"""
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['username'] = 'admin'
+        sess['role'] = 'admin'
+    return client
+
+
+class Timer:
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
+        return False
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)]
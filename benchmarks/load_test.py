@@ -0,0 +1,253 @@
+"""Mixed HTTP workload (sales_add, payment_add, report, invoice export) at a target request rate.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.load_test --url http://127.0.0.1:8000 --rps 20 --duration 60
+
+Seed the database with benchmarks.seed_data first and run the app against
+it in another shell, e.g.
+
+    DATABASE_URL=$BENCH_DATABASE_URL REQUEST_LOG=false gunicorn -w 4 -b 127.0.0.1:8000 app:app
+
+The driver reads outlets with stock and outlets with open balances from
+BENCH_DATABASE_URL so the writes it sends are valid, logs in as admin and
+replays the mix open-loop: request i is due at start + i / rps no matter
+how long earlier requests took. Latency is measured from the due time, so
+a saturated server shows up as growing latency rather than as a quietly
+lower request rate. A request counts as an error when its status differs
+from the route's success status (POST routes redirect on success and
+re-render the form with 200 when the write was rejected).
+
+invoice_export only submits the background render job (302 to the job
+status, or to the download when the PDF is cached); render times show up
+in /metrics as pdf_render_duration_seconds.
+"""
+import argparse
+import http.client
+import json
+import queue
+import random
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.common import require_bench_database, percentile
+
+require_bench_database()
+
+from utils.data_helper import DataHelper  # noqa: E402
+
+DEFAULT_MIX = 'sales_add=50,payment_add=15,report=20,invoice_export=15'
+# Status yang dianggap berhasil per route
+EXPECTED_STATUS = {'sales_add': 302, 'payment_add': 302, 'report': 200, 'invoice_export': 302}
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in EXPECTED_STATUS:
+            raise argparse.ArgumentTypeError(f"route tidak dikenal: {name} (pilih dari {', '.join(EXPECTED_STATUS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_targets(helper, limit=5000):
+    """Outlet/product pairs with stock, outlets with open balances and the sales date range"""
+    stock_pairs = helper.execute_query("""
+        SELECT outlet_id, produk_id FROM outlet_stock
+        WHERE total_distribusi - total_terjual >= 10
+        ORDER BY random() LIMIT %s
+    """, (limit,), fetch='all')
+    balances = helper.execute_query("""
+        SELECT outlet_id FROM sales
+        WHERE remaining_amount > 0
+        GROUP BY outlet_id HAVING SUM(remaining_amount) >= 500000
+    """, fetch='all')
+    period = helper.execute_query("SELECT MIN(tanggal)::date as first, MAX(tanggal)::date as last FROM sales", fetch='one')
+    if not stock_pairs or not balances or period['first'] is None:
+        raise SystemExit("Database benchmark kosong; isi dulu dengan python -m benchmarks.seed_data")
+    return {
+        'stock_pairs': [(row['outlet_id'], row['produk_id']) for row in stock_pairs],
+        'payable_outlets': [row['outlet_id'] for row in balances],
+        'first_date': period['first'],
+        'last_date': period['last'],
+    }
+
+
+class Workload:
+    """Builds the (method, path, form) of the next request for each route"""
+
+    def __init__(self, targets, rng):
+        self.targets = targets
+        self.rng = rng
+
+    def sales_add(self):
+        outlet_id, product_id = self.rng.choice(self.targets['stock_pairs'])
+        return 'POST', '/sales/add', {'outlet_id': outlet_id, 'product_id': product_id,
+                                      'jumlah_terjual': self.rng.randint(1, 3)}
+
+    def payment_add(self):
+        return 'POST', '/payment/add', {'outlet_id': self.rng.choice(self.targets['payable_outlets']),
+                                        'jumlah_bayar': self.rng.randint(10, 100) * 1000,
+                                        'tanggal_bayar': date.today().isoformat()}
+
+    def report(self):
+        # Separuh tanpa filter (dashboard), separuh laporan 30 hari untuk satu outlet
+        if self.rng.random() < 0.5:
+            return 'GET', '/report', None
+        span = max((self.targets['last_date'] - self.targets['first_date']).days - 30, 0)
+        start = self.targets['first_date'] + timedelta(days=self.rng.randint(0, span))
+        outlet_id = self.rng.choice(self.targets['stock_pairs'])[0]
+        query = urlencode({'start_date': start.isoformat(), 'end_date': (start + timedelta(days=30)).isoformat(),
+                           'outlet_id': outlet_id})
+        return 'GET', f'/report?{query}', None
+
+    def invoice_export(self):
+        outlet_id = self.rng.choice(self.targets['payable_outlets'])
+        return 'GET', f'/invoice/export/{outlet_id}', None
+
+
+class Client:
+    """Keep-alive HTTP connection per thread that sends the shared session cookie"""
+
+    def __init__(self, url, cookie, timeout):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.cookie = cookie
+        self.timeout = timeout
+        self.conn = None
+
+    def request(self, method, path, form=None):
+        headers = {'Cookie': self.cookie} if self.cookie else {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                response.read()
+                return response
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Worker menutup koneksi keep-alive; ulangi sekali di koneksi baru
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+
+def login(url, username, password, timeout):
+    response = Client(url, None, timeout).request('POST', '/login', {'username': username, 'password': password})
+    location = response.getheader('Location') or ''
+    cookie = response.getheader('Set-Cookie') or ''
+    if response.status != 302 or location.endswith('/login') or not cookie:
+        raise SystemExit(f"Login {username} gagal (status {response.status})")
+    return cookie.split(';', 1)[0]
+
+
+def run(args, targets, cookie):
+    rng = random.Random(args.seed)
+    workload = Workload(targets, rng)
+    routes = list(args.mix)
+    weights = [args.mix[name] for name in routes]
+
+    total = int(args.rps * (args.warmup + args.duration))
+    schedule = queue.Queue()
+    for i in range(total):
+        route = rng.choices(routes, weights)[0]
+        schedule.put((i / args.rps, route, getattr(workload, route)()))
+
+    results = []
+    results_lock = threading.Lock()
+    started = time.perf_counter() + 0.5
+
+    def worker():
+        client = Client(args.url, cookie, args.timeout)
+        while True:
+            try:
+                offset, route, (method, path, form) = schedule.get_nowait()
+            except queue.Empty:
+                return
+            due = started + offset
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                status = client.request(method, path, form).status
+            except (OSError, http.client.HTTPException):
+                status = 0
+            finished = time.perf_counter()
+            if offset >= args.warmup:
+                with results_lock:
+                    results.append((route, finished - due, status, finished))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, started
+
+
+def summarize(results, routes, measured_from):
+    rows = {}
+    elapsed = max((finished for *_, finished in results), default=measured_from) - measured_from
+    for name in list(routes) + ['total']:
+        selected = [r for r in results if name == 'total' or r[0] == name]
+        latencies = sorted(latency for _, latency, _, _ in selected)
+        errors = sum(1 for route, _, status, _ in selected if status != EXPECTED_STATUS[route])
+        rows[name] = {
+            'requests': len(selected),
+            'errors': errors,
+            'rps': len(selected) / elapsed if elapsed > 0 else 0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'max_ms': (latencies[-1] if latencies else 0) * 1000,
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--rps', type=float, default=20)
+    parser.add_argument('--duration', type=float, default=60, help='detik yang diukur')
+    parser.add_argument('--warmup', type=float, default=5, help='detik awal yang tidak dihitung')
+    parser.add_argument('--concurrency', type=int, default=32, help='maksimum request bersamaan')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin123')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='simpan hasil ke file JSON')
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    targets = load_targets(helper)
+    helper.close_connection()
+
+    cookie = login(args.url, args.username, args.password, args.timeout)
+    print(f"{args.rps:g} rps x {args.duration:g} s (+{args.warmup:g} s warmup) ke {args.url}, "
+          f"mix {', '.join(f'{k}={v:g}' for k, v in args.mix.items())}", flush=True)
+
+    results, started = run(args, targets, cookie)
+    rows = summarize(results, args.mix, started + args.warmup)
+
+    print(f"{'route':<16} {'requests':>9} {'errors':>7} {'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, row in rows.items():
+        print(f"{name:<16} {row['requests']:>9} {row['errors']:>7} {row['rps']:>7.1f} "
+              f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': {k: v for k, v in vars(args).items() if k != 'password'},
+                       'routes': rows}, f, indent=2, default=str)
+
+
+if __name__ == '__main__':
+    main()
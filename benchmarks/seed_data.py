@@ -0,0 +1,275 @@
+"""Fill the benchmark database with production-sized synthetic data.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.seed_data --outlets 2000 --products 500 --sales 5000000
+
+Everything is generated set-based in PostgreSQL, so 5M sales take minutes,
+not hours. The data is shaped like the real ledger:
+- a few outlets and products carry most of the volume, and sales happen
+  between 07:00 and 21:00;
+- every (outlet, product) pair that sells first receives distributions,
+  about 15% more than it sells, spread over the period;
+- outlets pay weekly for the previous week's sales in FIFO order. The
+  last paid week is paid partially and the weeks after it stay open, so
+  every outlet has a balance and some sales are half paid;
+- payment_allocations, outlet_stock and daily_outlet_product_summary
+  match the ledger (maintenance.py verify-stock / verify-summary pass).
+
+The same --seed gives the same data.
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks.common import require_bench_database, reset_schema, Timer
+
+require_bench_database()
+
+from utils.data_helper import DataHelper  # noqa: E402
+
+CITIES = ['Jakarta', 'Bandung', 'Surabaya', 'Semarang', 'Yogyakarta', 'Medan', 'Makassar',
+          'Denpasar', 'Palembang', 'Malang', 'Bogor', 'Tangerang', 'Bekasi', 'Depok', 'Solo']
+CATEGORIES = ['Roti', 'Susu', 'Kopi', 'Teh', 'Keripik', 'Biskuit', 'Mie Instan', 'Air Mineral',
+              'Cokelat', 'Sabun', 'Sampo', 'Pasta Gigi', 'Minyak Goreng', 'Gula', 'Beras']
+
+
+def seed_reference_data(helper, args):
+    helper.execute_query("""
+        INSERT INTO outlets (nama, lokasi, kontak, slot_maksimal)
+        SELECT 'Outlet ' || LPAD(g::text, 5, '0'),
+               (%(cities)s::text[])[1 + floor(random() * array_length(%(cities)s::text[], 1))::int],
+               '08' || LPAD(floor(random() * 1e10)::bigint::text, 10, '0'),
+               0
+        FROM generate_series(1, %(outlets)s) g
+    """, {'cities': CITIES, 'outlets': args.outlets})
+    helper.execute_query("""
+        INSERT INTO products (nama, harga, stok_pusat, persentase_komisi)
+        SELECT (%(categories)s::text[])[1 + (g - 1) %% array_length(%(categories)s::text[], 1)] || ' Varian ' || g,
+               ROUND((2000 + power(random(), 2) * 98000) / 500) * 500,
+               1000 + floor(random() * 9000)::int,
+               5 + floor(random() * 4) * 2.5
+        FROM generate_series(1, %(products)s) g
+    """, {'categories': CATEGORIES, 'products': args.products})
+
+
+def create_payment_plan(helper, args, start_date, weeks):
+    """Per outlet: the partially paid week and which fraction of it is paid"""
+    # UNLOGGED, bukan TEMP: langkah berikutnya tidak harus berjalan di koneksi pool yang sama
+    helper.execute_query("DROP TABLE IF EXISTS seed_payment_plan")
+    helper.execute_query("""
+        CREATE UNLOGGED TABLE seed_payment_plan AS
+        SELECT id as outlet_id, cutoff_week,
+               %(start)s::date + cutoff_week * %(interval)s as cutoff_start,
+               %(start)s::date + (cutoff_week + 1) * %(interval)s as cutoff_end,
+               ROUND((0.2 + random() * 0.6)::numeric, 2) as partial_fraction
+        FROM (
+            SELECT id, GREATEST(%(weeks)s - 1 - floor(random() * %(unpaid_weeks)s)::int, 0) as cutoff_week
+            FROM outlets
+        ) o
+    """, {'start': start_date, 'interval': args.payment_interval, 'weeks': weeks,
+          'unpaid_weeks': args.unpaid_weeks})
+    helper.execute_query("ALTER TABLE seed_payment_plan ADD PRIMARY KEY (outlet_id)")
+
+
+def seed_sales(helper, args, start_date, verbose=False):
+    """Insert sales in chunks, ordered by time; weeks before the outlet's cutoff are paid"""
+    inserted = 0
+    while inserted < args.sales:
+        last = min(inserted + args.chunk, args.sales)
+        helper.execute_query("""
+            INSERT INTO sales (outlet_id, produk_id, jumlah_terjual, tanggal, tagihan, komisi,
+                               yang_harus_dibayar, is_paid, remaining_amount)
+            SELECT b.outlet_id, b.produk_id, b.jumlah, b.tanggal, b.tagihan, b.komisi,
+                   b.tagihan - b.komisi,
+                   b.tanggal < pl.cutoff_start,
+                   CASE WHEN b.tanggal < pl.cutoff_start THEN 0 ELSE b.tagihan - b.komisi END
+            FROM (
+                SELECT x.outlet_id, x.produk_id, x.jumlah, x.tanggal,
+                       x.jumlah * p.harga as tagihan,
+                       ROUND(x.jumlah * p.harga * p.persentase_komisi / 100, 2) as komisi
+                FROM (
+                    SELECT 1 + floor(%(outlets)s * power(random(), 1.5))::int as outlet_id,
+                           1 + floor(%(products)s * power(random(), 2))::int as produk_id,
+                           1 + floor(power(random(), 3) * 10)::int as jumlah,
+                           %(start)s::date + floor((g - 1)::numeric * %(days)s / %(sales)s)::int
+                               + INTERVAL '7 hours' + random() * INTERVAL '14 hours' as tanggal
+                    FROM generate_series(%(first)s, %(last)s) g
+                ) x
+                JOIN products p ON p.id = x.produk_id
+            ) b
+            JOIN seed_payment_plan pl ON pl.outlet_id = b.outlet_id
+            ORDER BY b.tanggal
+        """, {'outlets': args.outlets, 'products': args.products, 'start': start_date,
+              'days': args.days, 'sales': args.sales, 'first': inserted + 1, 'last': last})
+        inserted = last
+        if verbose:
+            print(f"  sales: {inserted:,}/{args.sales:,}", flush=True)
+
+
+def seed_partial_week(helper):
+    """FIFO-pay `partial_fraction` of each outlet's cutoff week, like record_payment would"""
+    return helper.execute_query("""
+        WITH week_sales AS (
+            SELECT s.id, s.yang_harus_dibayar,
+                   SUM(s.yang_harus_dibayar) OVER (PARTITION BY s.outlet_id ORDER BY s.tanggal, s.id) as running_total,
+                   ROUND(SUM(s.yang_harus_dibayar) OVER (PARTITION BY s.outlet_id) * pl.partial_fraction, 2) as paid_amount
+            FROM sales s
+            JOIN seed_payment_plan pl ON pl.outlet_id = s.outlet_id
+            WHERE s.tanggal >= pl.cutoff_start AND s.tanggal < pl.cutoff_end
+        ),
+        allocation AS (
+            SELECT id, LEAST(yang_harus_dibayar, paid_amount - (running_total - yang_harus_dibayar)) as paid
+            FROM week_sales
+            WHERE running_total - yang_harus_dibayar < paid_amount
+        )
+        UPDATE sales s
+        SET remaining_amount = s.yang_harus_dibayar - a.paid,
+            is_paid = s.yang_harus_dibayar - a.paid <= 0
+        FROM allocation a
+        WHERE s.id = a.id
+    """)
+
+
+def seed_payments(helper, args, start_date, end_date):
+    """One payment per outlet and paid week, and its allocation to every sale it covered"""
+    params = {'start': start_date, 'end': end_date, 'interval': args.payment_interval}
+    # Tanggal bayar = akhir minggu penjualan (dibatasi end_date); unik per outlet
+    pay_date = "LEAST(%(start)s::date + ((s.tanggal::date - %(start)s::date) / %(interval)s + 1) * %(interval)s, %(end)s::date)"
+    helper.execute_query("ANALYZE sales")
+    payments = helper.execute_query(f"""
+        INSERT INTO payments (outlet_id, jumlah_bayar, tanggal_bayar, tanggal_pelunasan, status)
+        SELECT w.outlet_id, w.paid, w.tanggal_bayar,
+               CASE WHEN w.partial THEN NULL ELSE w.tanggal_bayar END,
+               CASE WHEN w.partial THEN 'sebagian' ELSE 'lunas' END
+        FROM (
+            SELECT s.outlet_id, {pay_date} as tanggal_bayar,
+                   SUM(s.yang_harus_dibayar - s.remaining_amount) as paid,
+                   BOOL_OR(s.remaining_amount > 0) as partial
+            FROM sales s
+            WHERE s.remaining_amount < s.yang_harus_dibayar
+            GROUP BY 1, 2
+        ) w
+        ORDER BY w.tanggal_bayar, w.outlet_id
+    """, params)
+    # Statistik baru agar join alokasi memakai hash/merge join, bukan nested loop
+    helper.execute_query("ANALYZE payments")
+    allocations = helper.execute_query(f"""
+        INSERT INTO payment_allocations (payment_id, sale_id, amount)
+        SELECT p.id, s.id, s.yang_harus_dibayar - s.remaining_amount
+        FROM sales s
+        JOIN payments p ON p.outlet_id = s.outlet_id AND p.tanggal_bayar = {pay_date}
+        WHERE s.remaining_amount < s.yang_harus_dibayar
+    """, params)
+    return payments, allocations
+
+
+def seed_distributions(helper, args):
+    """Deliveries per outlet/product covering its sales plus ~15%, the first one before its first sale"""
+    return helper.execute_query("""
+        INSERT INTO distributions (outlet_id, produk_id, jumlah, tanggal)
+        SELECT t.outlet_id, t.produk_id, CEIL(t.total * 1.15 / t.deliveries)::int,
+               date_trunc('day', t.first_sale) - INTERVAL '18 hours'
+                   + (t.last_sale - t.first_sale) * (k - 1) / t.deliveries
+        FROM (
+            SELECT outlet_id, produk_id, SUM(jumlah_terjual) as total,
+                   MIN(tanggal) as first_sale, MAX(tanggal) as last_sale,
+                   LEAST(CEIL(SUM(jumlah_terjual) / %(delivery_size)s::numeric), 52)::int as deliveries
+            FROM sales
+            GROUP BY outlet_id, produk_id
+        ) t
+        CROSS JOIN LATERAL generate_series(1, t.deliveries) k
+        ORDER BY 4
+    """, {'delivery_size': args.delivery_size})
+
+
+def update_outlet_slots(helper):
+    """Size slot_maksimal to the stock on hand plus headroom, so the dashboard slot usage looks realistic (no slot limit is enforced)"""
+    helper.execute_query("""
+        UPDATE outlets o
+        SET slot_maksimal = CEIL((COALESCE(st.sisa, 0) * 1.5 + 100) / 50) * 50
+        FROM (
+            SELECT outlet_id, SUM(total_distribusi - total_terjual) as sisa
+            FROM outlet_stock GROUP BY outlet_id
+        ) st
+        WHERE st.outlet_id = o.id
+    """)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--outlets', type=int, default=2000)
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--sales', type=int, default=5000000)
+    parser.add_argument('--days', type=int, default=365, help='panjang periode penjualan')
+    parser.add_argument('--end-date', type=date.fromisoformat, default=date.today())
+    parser.add_argument('--payment-interval', type=int, default=7, help='hari antar pembayaran outlet')
+    parser.add_argument('--unpaid-weeks', type=int, default=4, help='maksimum periode yang belum dibayar per outlet')
+    parser.add_argument('--delivery-size', type=int, default=50, help='rata-rata unit per distribusi')
+    parser.add_argument('--chunk', type=int, default=500000, help='sales per INSERT')
+    parser.add_argument('--seed', type=int, default=1)
+    return parser
+
+
+def seed(helper, args, verbose=False):
+    """Empty the business tables and generate the dataset described by `args` (see build_parser)"""
+    start_date = args.end_date - timedelta(days=args.days - 1)
+    weeks = -(-args.days // args.payment_interval)
+
+    reset_schema(helper)
+    # Pengaturan sesi ini tertinggal di koneksi pool, jadi selalu di-RESET di finally:
+    # pemanggil (bench_data_helper, check_query_counts) lanjut mengukur write di koneksi yang sama
+    helper.execute_query("SET synchronous_commit = off")
+    helper.execute_query("SELECT setseed(%s)", (random.Random(args.seed).uniform(-1, 1),), fetch='one')
+
+    steps = [
+        ('outlet & produk', lambda: seed_reference_data(helper, args)),
+        ('rencana pembayaran', lambda: create_payment_plan(helper, args, start_date, weeks)),
+        ('sales', lambda: seed_sales(helper, args, start_date, verbose)),
+        ('cicilan minggu terakhir', lambda: seed_partial_week(helper)),
+        ('payments & alokasi', lambda: seed_payments(helper, args, start_date, args.end_date)),
+        ('distribusi', lambda: seed_distributions(helper, args)),
+        ('outlet_stock', helper.rebuild_outlet_stock),
+        ('rollup harian', helper.rebuild_daily_summary),
+        ('slot outlet', lambda: update_outlet_slots(helper)),
+        ('analyze', lambda: helper.execute_query("ANALYZE")),
+    ]
+    try:
+        for name, step in steps:
+            with Timer() as t:
+                step()
+            if verbose:
+                print(f"{name:<24} {t.elapsed:>8.1f} s", flush=True)
+    finally:
+        helper.execute_query("DROP TABLE IF EXISTS seed_payment_plan")
+        helper.execute_query("RESET synchronous_commit")
+    return start_date
+
+
+def dataset_counts(helper):
+    return helper.execute_query("""
+        SELECT (SELECT COUNT(*) FROM outlets) as outlets,
+               (SELECT COUNT(*) FROM products) as products,
+               (SELECT COUNT(*) FROM distributions) as distributions,
+               (SELECT COUNT(*) FROM sales) as sales,
+               (SELECT COUNT(*) FROM sales WHERE remaining_amount > 0 AND remaining_amount < yang_harus_dibayar) as partial_sales,
+               (SELECT COUNT(*) FROM sales WHERE remaining_amount > 0) as open_sales,
+               (SELECT COUNT(*) FROM payments) as payments,
+               (SELECT COUNT(*) FROM payment_allocations) as payment_allocations
+    """, fetch='one')
+
+
+def main():
+    args = build_parser().parse_args()
+
+    helper = DataHelper()
+    with Timer() as total:
+        start_date = seed(helper, args, verbose=True)
+
+    print(f"{start_date} s/d {args.end_date}, total {total.elapsed:.1f} s")
+    for name, value in dataset_counts(helper).items():
+        print(f"  {name:<20} {value:>12,}")
+
+    helper.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Concurrency stress check: many threads distributing and selling one product.
+
+    BENCH_DATABASE_URL=postgresql://.../bench python -m benchmarks.stress_stock_concurrency --threads 16
+
+Distribution and sale workers hammer the same product (and a handful of
+outlets) at once, releasing their pooled connection after every call the
+way a request does. Afterwards the script checks that central and outlet
+stock never went negative, that the ledgers match what the workers were
+told succeeded, and that outlet_stock and the daily rollup still agree
+with the ledgers.
+Exits non-zero on any violation.
+"""
+import argparse
+import datetime
+import random
+import sys
+import threading
+
+from benchmarks.common import require_bench_database, reset_schema, Timer
+
+require_bench_database()
+
+from utils.data_helper import DataHelper  # noqa: E402
+
+
+def seed(helper, outlet_count, initial_stock):
+    reset_schema(helper)
+    helper.execute_query("""
+        INSERT INTO outlets (nama, slot_maksimal)
+        SELECT 'Stress Outlet ' || g, 1000000 FROM generate_series(1, %s) g
+    """, (outlet_count,))
+    helper.execute_query("""
+        INSERT INTO products (nama, harga, stok_pusat, persentase_komisi)
+        VALUES ('Stress Produk', 10000, %s, 10)
+    """, (initial_stock,))
+    helper.invalidate_reference_data()
+
+
+def worker(helper, kind, outlet_count, iterations, barrier, totals, lock):
+    rng = random.Random()
+    done = 0
+    failed = 0
+    barrier.wait()
+    for _ in range(iterations):
+        outlet_id = rng.randint(1, outlet_count)
+        quantity = rng.randint(1, 3)
+        if kind == 'distribusi':
+            success, _ = helper.create_distribution(outlet_id, 1, quantity)
+        else:
+            now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            success, _ = helper.record_sale_with_bill(outlet_id, 1, quantity, now)
+        helper.release_connection()
+        if success:
+            done += quantity
+        else:
+            failed += 1
+    with lock:
+        totals[kind] += done
+        totals[f'{kind}_gagal'] += failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16, help="Jumlah worker (separuh distribusi, separuh penjualan)")
+    parser.add_argument('--iterations', type=int, default=200, help="Panggilan per worker")
+    parser.add_argument('--outlets', type=int, default=3)
+    parser.add_argument('--stock', type=int, default=1000, help="Stok pusat awal produk")
+    args = parser.parse_args()
+
+    helper = DataHelper()
+    seed(helper, args.outlets, args.stock)
+
+    totals = {'distribusi': 0, 'distribusi_gagal': 0, 'penjualan': 0, 'penjualan_gagal': 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.threads)
+    threads = [
+        threading.Thread(target=worker, args=(helper, 'distribusi' if i % 2 == 0 else 'penjualan',
+                                              args.outlets, args.iterations, barrier, totals, lock))
+        for i in range(args.threads)
+    ]
+    with Timer() as t:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    stok_pusat = helper.execute_query("SELECT stok_pusat FROM products WHERE id = 1", fetch='one')['stok_pusat']
+    distributed = helper.execute_query("SELECT COALESCE(SUM(jumlah), 0) AS n FROM distributions", fetch='one')['n']
+    sold = helper.execute_query("SELECT COALESCE(SUM(jumlah_terjual), 0) AS n FROM sales", fetch='one')['n']
+    negative_outlets = helper.execute_query("""
+        SELECT o.id FROM outlets o
+        WHERE (SELECT COALESCE(SUM(jumlah), 0) FROM distributions WHERE outlet_id = o.id)
+            < (SELECT COALESCE(SUM(jumlah_terjual), 0) FROM sales WHERE outlet_id = o.id)
+    """, fetch='all')
+    mismatches = helper.verify_outlet_stock()
+    summary_mismatches = helper.verify_daily_summary()
+
+    print(f"{args.threads} thread x {args.iterations} panggilan dalam {t.elapsed:.1f} s")
+    print(f"distribusi: {totals['distribusi']} unit ({totals['distribusi_gagal']} ditolak), "
+          f"penjualan: {totals['penjualan']} unit ({totals['penjualan_gagal']} ditolak)")
+    print(f"stok pusat akhir: {stok_pusat}")
+
+    checks = [
+        ("stok pusat tidak negatif", stok_pusat >= 0),
+        ("stok pusat = awal - total distribusi", stok_pusat == args.stock - distributed),
+        ("total distribusi sesuai yang dilaporkan berhasil", distributed == totals['distribusi']),
+        ("total penjualan sesuai yang dilaporkan berhasil", sold == totals['penjualan']),
+        ("stok outlet tidak negatif", not negative_outlets),
+        ("outlet_stock sesuai ledger", mismatches == []),
+        ("rollup harian sesuai ledger", summary_mismatches == []),
+    ]
+    for name, ok in checks:
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+
+    helper.close_connection()
+    sys.exit(0 if all(ok for _, ok in checks) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +15,38 @@ class Config:
     DB_USER = os.environ.get('DB_USER') 
     DB_PASSWORD = os.environ.get('DB_PASSWORD')
 
+    # Connection pool configuration
+    DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+    DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', 10))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30))
+
+    # Rows per round trip for server-side cursors (DataHelper.iter_query)
+    DB_ITERSIZE = int(os.environ.get('DB_ITERSIZE', 2000))
+
+    # One JSON summary line per request (queries per call site, db/template/PDF time)
+    REQUEST_LOG = os.environ.get('REQUEST_LOG', 'true').lower() in ('1', 'true', 'yes')
+
+    # Prometheus /metrics: per-worker snapshots are merged from this directory
+    METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'distribusi_metrics'))
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # opsional: wajib sebagai Bearer token
+
+    # List pagination
+    DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 50))
+    MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 200))
+
+    # Outlet/product reference cache (TTL in seconds, 0 = disabled)
+    REFERENCE_CACHE_TTL = float(os.environ.get('REFERENCE_CACHE_TTL', 60))
+    REFERENCE_CACHE_NOTIFY = os.environ.get('REFERENCE_CACHE_NOTIFY', 'true').lower() in ('1', 'true', 'yes')
+    REFERENCE_CACHE_CHANNEL = os.environ.get('REFERENCE_CACHE_CHANNEL', 'reference_cache')
+
+    # Background invoice rendering
+    INVOICE_CACHE_DIR = os.environ.get('INVOICE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'invoice_cache'))
+    INVOICE_WORKERS = int(os.environ.get('INVOICE_WORKERS', 2))
+    INVOICE_BATCH_WORKERS = int(os.environ.get('INVOICE_BATCH_WORKERS', 0)) or None  # None = jumlah CPU
+    INVOICE_CACHE_MAX_AGE_DAYS = float(os.environ.get('INVOICE_CACHE_MAX_AGE_DAYS', 7))
+
 class DevelopmentConfig(Config):
     DEBUG = True
     FLASK_ENV = 'development'
@@ -5,6 +5,7 @@ def init_database():
     try:
         helper = DataHelper()
         helper.init_database()
+        helper.close_connection()
         print("PostgreSQL database telah diinisialisasi!")
         print("Default admin login: username=admin, password=admin123")
         print("Default karyawan login: username=karyawan, password=karyawan123")
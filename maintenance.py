@@ -0,0 +1,103 @@
+from utils.data_helper import DataHelper
+from utils.invoice_jobs import InvoiceJobQueue
+import argparse
+import sys
+
+def rebuild_stock(helper, args):
+    rows = helper.rebuild_outlet_stock()
+    print(f"outlet_stock dibangun ulang: {rows} baris outlet/produk")
+
+def verify_stock(helper, args):
+    mismatches = helper.verify_outlet_stock() or []
+    if not mismatches:
+        print("outlet_stock sesuai dengan riwayat distribusi & penjualan")
+        return
+
+    print(f"Ditemukan {len(mismatches)} selisih outlet_stock:")
+    for row in mismatches:
+        print(f"  outlet {row['outlet_id']} / produk {row['produk_id']}: "
+              f"distribusi {row['stock_distribusi']} (ledger {row['ledger_distribusi']}), "
+              f"terjual {row['stock_terjual']} (ledger {row['ledger_terjual']})")
+
+    if args.fix:
+        rebuild_stock(helper, args)
+    else:
+        print("Jalankan dengan --fix untuk membangun ulang outlet_stock")
+        sys.exit(1)
+
+def rebuild_summary(helper, args):
+    rows = helper.rebuild_daily_summary()
+    print(f"daily_outlet_product_summary dibangun ulang: {rows} baris tanggal/outlet/produk")
+
+def verify_summary(helper, args):
+    mismatches = helper.verify_daily_summary() or []
+    if not mismatches:
+        print("daily_outlet_product_summary sesuai dengan riwayat distribusi & penjualan")
+        return
+
+    print(f"Ditemukan {len(mismatches)} selisih daily_outlet_product_summary:")
+    for row in mismatches:
+        print(f"  {row['tanggal']} outlet {row['outlet_id']} / produk {row['produk_id']}: "
+              f"distribusi {row['rollup_distribusi']} (ledger {row['ledger_distribusi']}), "
+              f"terjual {row['rollup_terjual']} (ledger {row['ledger_terjual']}), "
+              f"tagihan {row['rollup_tagihan']} (ledger {row['ledger_tagihan']})")
+
+    if args.fix:
+        rebuild_summary(helper, args)
+    else:
+        print("Jalankan dengan --fix untuk membangun ulang daily_outlet_product_summary")
+        sys.exit(1)
+
+def backfill_allocations(helper, args):
+    rows = helper.backfill_payment_allocations()
+    print(f"payment_allocations diisi dari sales_covered: {rows} baris")
+
+def prune_invoice_cache(helper, args):
+    cache_dir = helper.config.INVOICE_CACHE_DIR
+    queue = InvoiceJobQueue(helper, None, cache_dir, max_age_days=helper.config.INVOICE_CACHE_MAX_AGE_DAYS)
+    try:
+        removed = queue.prune(args.days)
+    finally:
+        queue.shutdown()
+    print(f"Cache invoice dibersihkan: {removed} file dihapus dari {cache_dir}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Perintah pemeliharaan database distribusi")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('rebuild-stock', help="Bangun ulang outlet_stock dari riwayat distribusi & penjualan")
+
+    verify_parser = subparsers.add_parser('verify-stock', help="Cocokkan outlet_stock dengan riwayat distribusi & penjualan")
+    verify_parser.add_argument('--fix', action='store_true', help="Bangun ulang jika ditemukan selisih")
+
+    subparsers.add_parser('rebuild-summary', help="Bangun ulang rollup harian penjualan & distribusi dari riwayat")
+
+    verify_summary_parser = subparsers.add_parser('verify-summary', help="Cocokkan rollup harian dengan riwayat distribusi & penjualan")
+    verify_summary_parser.add_argument('--fix', action='store_true', help="Bangun ulang jika ditemukan selisih")
+
+    subparsers.add_parser('backfill-allocations', help="Isi payment_allocations dari teks sales_covered pembayaran lama")
+
+    prune_parser = subparsers.add_parser('prune-invoice-cache', help="Hapus job & file invoice yang sudah lama")
+    prune_parser.add_argument('--days', type=float, help="Umur maksimum dalam hari (default: INVOICE_CACHE_MAX_AGE_DAYS)")
+
+    args = parser.parse_args()
+    commands = {
+        'rebuild-stock': rebuild_stock,
+        'verify-stock': verify_stock,
+        'rebuild-summary': rebuild_summary,
+        'verify-summary': verify_summary,
+        'backfill-allocations': backfill_allocations,
+        'prune-invoice-cache': prune_invoice_cache,
+    }
+
+    helper = DataHelper()
+    try:
+        commands[args.command](helper, args)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        helper.close_connection()
+
+if __name__ == "__main__":
+    main()
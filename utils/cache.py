@@ -0,0 +1,102 @@
+import select
+import threading
+import time
+
+
+class ReferenceCache:
+    """Thread-safe read-through cache with TTL and explicit invalidation"""
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}       # key -> (value, expires_at)
+        self._generations = {}   # key -> bumped on every invalidation of that key
+        self._epoch = 0          # bumped on every full invalidation
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for `key`, calling `loader()` on a miss or after expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+            generation = (self._epoch, self._generations.get(key, 0))
+
+        value = loader()
+
+        with self._lock:
+            # Jangan simpan hasil load jika key diinvalidasi selama load berjalan
+            if self.ttl > 0 and (self._epoch, self._generations.get(key, 0)) == generation:
+                self._entries[key] = (value, time.monotonic() + self.ttl)
+        return value
+
+    def invalidate(self, *keys):
+        """Drop the given keys, or everything when no key is given"""
+        with self._lock:
+            if keys:
+                for key in keys:
+                    self._entries.pop(key, None)
+                    self._generations[key] = self._generations.get(key, 0) + 1
+            else:
+                self._entries.clear()
+                self._epoch += 1
+            self._invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0,
+                'invalidations': self._invalidations,
+            }
+
+
+class CacheInvalidationListener(threading.Thread):
+    """Background LISTEN on a PostgreSQL channel that invalidates cache keys named in NOTIFY payloads"""
+
+    def __init__(self, connect, cache, channel, poll_interval=5):
+        super().__init__(name=f'cache-listener-{channel}', daemon=True)
+        self._connect = connect
+        self.cache = cache
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f'LISTEN "{self.channel}"')
+                # Perubahan selama koneksi terputus tidak terkirim, jadi mulai dari cache kosong
+                self.cache.invalidate()
+
+                while not self._stopped.is_set():
+                    if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        if notify.payload:
+                            self.cache.invalidate(*notify.payload.split(','))
+                        else:
+                            self.cache.invalidate()
+            except Exception as e:
+                print(f"Cache listener error: {e}")
+                self._stopped.wait(self.poll_interval)
+            finally:
+                if conn is not None and not conn.closed:
+                    conn.close()
@@ -1,32 +1,111 @@
 import psycopg2
 import psycopg2.extras
 from datetime import datetime
+from decimal import Decimal
+import base64
+import inspect
+import json
 import os
+import threading
+import uuid
+import weakref
 from config import Config
+from utils.db_pool import ConnectionPool
+from utils.cache import ReferenceCache, CacheInvalidationListener
+from utils.instrumentation import InstrumentedConnection, call_site
+
+# Ringkasan harian per tanggal/outlet/produk langsung dari riwayat distribusi & penjualan
+DAILY_SUMMARY_LEDGER = """
+    SELECT tanggal, outlet_id, produk_id,
+           SUM(total_distribusi) as total_distribusi,
+           SUM(total_terjual) as total_terjual,
+           SUM(tagihan) as tagihan,
+           SUM(komisi) as komisi,
+           SUM(yang_harus_dibayar) as yang_harus_dibayar
+    FROM (
+        SELECT tanggal::date as tanggal, outlet_id, produk_id,
+               jumlah as total_distribusi, 0 as total_terjual,
+               0 as tagihan, 0 as komisi, 0 as yang_harus_dibayar
+        FROM distributions
+        WHERE outlet_id IS NOT NULL AND produk_id IS NOT NULL AND tanggal IS NOT NULL
+        UNION ALL
+        SELECT tanggal::date, outlet_id, produk_id,
+               0, jumlah_terjual,
+               COALESCE(tagihan, 0), COALESCE(komisi, 0), COALESCE(yang_harus_dibayar, 0)
+        FROM sales
+        WHERE outlet_id IS NOT NULL AND produk_id IS NOT NULL AND tanggal IS NOT NULL
+    ) ledger
+    GROUP BY tanggal, outlet_id, produk_id
+"""
 
 class DataHelper:
     def __init__(self):
         self.config = Config()
-        self._connection = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        self.reference_cache = ReferenceCache(ttl=self.config.REFERENCE_CACHE_TTL)
+        self._cache_listener = None
     
-    def get_connection(self):
-        """Get database connection"""
-        if self._connection is None or self._connection.closed:
-            try:
-                if self.config.DATABASE_URL:
-                    self._connection = psycopg2.connect(self.config.DATABASE_URL)
-                else:
-                    self._connection = psycopg2.connect(
-                        host=self.config.DB_HOST,
-                        port=self.config.DB_PORT,
-                        database=self.config.DB_NAME,
-                        user=self.config.DB_USER,
-                        password=self.config.DB_PASSWORD
+    def _connect(self):
+        """Open a new raw database connection"""
+        try:
+            if self.config.DATABASE_URL:
+                return psycopg2.connect(self.config.DATABASE_URL, connection_factory=InstrumentedConnection)
+            return psycopg2.connect(
+                host=self.config.DB_HOST,
+                port=self.config.DB_PORT,
+                database=self.config.DB_NAME,
+                user=self.config.DB_USER,
+                password=self.config.DB_PASSWORD,
+                connection_factory=InstrumentedConnection
+            )
+        except Exception as e:
+            print(f"Database connection error: {e}")
+            raise e
+    
+    def get_pool(self):
+        """Get (lazily create) the connection pool for this process"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        self._connect,
+                        minconn=self.config.DB_POOL_MIN,
+                        maxconn=self.config.DB_POOL_MAX,
+                        timeout=self.config.DB_POOL_TIMEOUT,
+                        health_check_interval=self.config.DB_POOL_HEALTH_CHECK_INTERVAL
                     )
-            except Exception as e:
-                print(f"Database connection error: {e}")
-                raise e
-        return self._connection
+        return self._pool
+    
+    def get_connection(self):
+        """Get database connection checked out for the current thread/request"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None or conn.closed:
+            if conn is not None:
+                self.get_pool().putconn(conn, close=True)
+            conn = self.get_pool().getconn()
+            self._local.connection = conn
+        return conn
+    
+    def release_connection(self):
+        """Return the current thread's connection to the pool"""
+        # Tutup stream iter_query yang sedang berjalan sebelum koneksi dipakai thread lain;
+        # stream yang belum dimulai (mis. body response streaming) belum memegang cursor
+        for rows in list(getattr(self._local, 'streams', ())):
+            if inspect.getgeneratorstate(rows) == inspect.GEN_SUSPENDED:
+                rows.close()
+        
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            self._local.connection = None
+            self.get_pool().putconn(conn)
+    
+    def get_pool_stats(self):
+        """Get connection pool metrics (in-use, waiting, checkout latency)"""
+        if self._pool is None:
+            return {}
+        return self._pool.stats()
     
     def init_database(self):
         """Initialize database tables"""
@@ -150,14 +229,102 @@ class DataHelper:
                 END $$;
             """)
             
+            # Create payment_allocations table - alokasi pembayaran per sale (menggantikan parsing sales_covered)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS payment_allocations (
+                    payment_id INTEGER REFERENCES payments(id) ON DELETE CASCADE,
+                    sale_id INTEGER REFERENCES sales(id) ON DELETE CASCADE,
+                    amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (payment_id, sale_id)
+                )
+            """)
+            
+            # Backfill payment_allocations dari teks sales_covered pembayaran lama
+            self._backfill_payment_allocations(cursor)
+            
+            # Create outlet_stock table - saldo stok per outlet/produk (dipelihara saat distribusi & penjualan)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS outlet_stock (
+                    outlet_id INTEGER REFERENCES outlets(id) ON DELETE CASCADE,
+                    produk_id INTEGER REFERENCES products(id) ON DELETE CASCADE,
+                    total_distribusi INTEGER NOT NULL DEFAULT 0,
+                    total_terjual INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (outlet_id, produk_id)
+                )
+            """)
+            
+            # Backfill outlet_stock dari riwayat jika tabel masih kosong
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM outlet_stock)")
+            if not cursor.fetchone()[0]:
+                self._rebuild_outlet_stock(cursor)
+            
+            # Create daily_outlet_product_summary table - rollup harian per outlet/produk untuk dashboard & laporan
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_outlet_product_summary (
+                    tanggal DATE NOT NULL,
+                    outlet_id INTEGER REFERENCES outlets(id) ON DELETE CASCADE,
+                    produk_id INTEGER REFERENCES products(id) ON DELETE CASCADE,
+                    total_distribusi INTEGER NOT NULL DEFAULT 0,
+                    total_terjual INTEGER NOT NULL DEFAULT 0,
+                    tagihan DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    komisi DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    yang_harus_dibayar DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (tanggal, outlet_id, produk_id)
+                )
+            """)
+            
+            # Backfill rollup dari riwayat jika tabel masih kosong
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM daily_outlet_product_summary)")
+            if not cursor.fetchone()[0]:
+                self._rebuild_daily_summary(cursor)
+            
+            # Create invoice_jobs table - antrean render invoice PDF di background
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS invoice_jobs (
+                    id SERIAL PRIMARY KEY,
+                    outlet_id INTEGER REFERENCES outlets(id) ON DELETE CASCADE,
+                    start_date DATE,
+                    end_date DATE,
+                    cache_key VARCHAR(64) NOT NULL,
+                    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                    file_path TEXT,
+                    filename VARCHAR(255),
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            """)
+            
             # Create indexes for better performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_distributions_outlet ON distributions(outlet_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_distributions_product ON distributions(produk_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_outlet ON sales(outlet_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_product ON sales(produk_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_outlet ON payments(outlet_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_is_paid ON sales(is_paid)")
             
+            # Composite indexes untuk filter outlet + rentang tanggal dan agregasi per outlet/produk
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_distributions_outlet_tanggal ON distributions(outlet_id, tanggal)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_distributions_outlet_product ON distributions(outlet_id, produk_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_distributions_tanggal_id ON distributions(tanggal, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_outlet_tanggal ON sales(outlet_id, tanggal)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_outlet_product ON sales(outlet_id, produk_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_tanggal_id ON sales(tanggal, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_unpaid ON sales(outlet_id, tanggal) WHERE remaining_amount > 0")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_outlet_tanggal ON payments(outlet_id, tanggal_bayar)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_tanggal_id ON payments(tanggal_bayar, id)")
+            
+            # Index lama yang sudah tercakup oleh composite index di atas
+            cursor.execute("DROP INDEX IF EXISTS idx_distributions_outlet")
+            cursor.execute("DROP INDEX IF EXISTS idx_sales_outlet")
+            cursor.execute("DROP INDEX IF EXISTS idx_payments_outlet")
+            cursor.execute("DROP INDEX IF EXISTS idx_distributions_tanggal")
+            cursor.execute("DROP INDEX IF EXISTS idx_sales_tanggal")
+            cursor.execute("DROP INDEX IF EXISTS idx_payments_tanggal")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payment_allocations_sale ON payment_allocations(sale_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_invoice_jobs_cache_key ON invoice_jobs(cache_key, id)")
+            
             # Insert default users if not exist
             cursor.execute("SELECT COUNT(*) FROM users WHERE username = 'admin'")
             if cursor.fetchone()[0] == 0:
@@ -201,8 +368,155 @@ class DataHelper:
             raise e
         finally:
             cursor.close()
+    
+    ROW_TYPES = {
+        'dict': psycopg2.extras.RealDictCursor,
+        'namedtuple': psycopg2.extras.NamedTupleCursor,
+        'tuple': None,
+    }
+    
+    def iter_query(self, query, params=None, row_type='dict', itersize=None):
+        """Stream a SELECT through a named (server-side) cursor, `itersize` rows per round trip.
+        
+        row_type is 'dict' (RealDictRow), 'namedtuple' or 'tuple'. The cursor lives in the
+        connection's open transaction, so consume it before running other queries on this
+        connection (execute_query commits, which closes it). Streams that are not consumed
+        to the end are closed when the connection is released.
+        """
+        if row_type not in self.ROW_TYPES:
+            raise ValueError(f"row_type tidak dikenal: {row_type}")
+        
+        rows = self._iter_rows(query, params, self.ROW_TYPES[row_type], itersize or self.config.DB_ITERSIZE,
+                               source=call_site(2))
+        streams = getattr(self._local, 'streams', None)
+        if streams is None:
+            streams = self._local.streams = weakref.WeakSet()
+        streams.add(rows)
+        return rows
+    
+    def _iter_rows(self, query, params, cursor_factory, itersize, source=None):
+        conn = self.get_connection()
+        cursor = conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=cursor_factory)
+        cursor.itersize = itersize
+        completed = False
+        
+        try:
+            cursor.execute(query, params)
+            for row in cursor:
+                yield row
+            completed = True
+        except Exception as e:
+            print(f"Database query error: {e}")
+            raise e
+        finally:
+            # Juga dijalankan saat klien memutus download di tengah jalan (GeneratorExit)
+            if not conn.closed:
+                cursor.close()
+                if completed:
+                    conn.commit()
+                else:
+                    conn.rollback()
 
     
+    # Keyset pagination helpers
+    def _encode_page_token(self, direction, row, key_fields):
+        """Encode a (direction, sort key) cursor as an opaque URL-safe token"""
+        key = [row[f].isoformat() if hasattr(row[f], 'isoformat') else row[f] for f in key_fields]
+        raw = json.dumps([direction] + key, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+    
+    def _decode_page_token(self, page_token):
+        """Decode a page token; invalid or missing tokens mean the first page"""
+        if not page_token:
+            return 'next', None
+        try:
+            padded = page_token + '=' * (-len(page_token) % 4)
+            direction, *key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if direction not in ('next', 'prev') or len(key) != 2:
+                raise ValueError(page_token)
+            return direction, key
+        except Exception:
+            return 'next', None
+    
+    def _fetch_page(self, query, params, sort_columns, key_fields, page_size, page_token=None):
+        """Run a filtered list query as one keyset page, newest first.
+        
+        Returns {'items', 'next_token', 'prev_token'}; the tokens are None when
+        there is no older/newer page.
+        """
+        page_size = max(1, min(int(page_size), self.config.MAX_PAGE_SIZE))
+        direction, key = self._decode_page_token(page_token)
+        params = list(params)
+        
+        if key:
+            operator = '<' if direction == 'next' else '>'
+            query += f" AND ({sort_columns[0]}, {sort_columns[1]}) {operator} (%s, %s)"
+            params.extend(key)
+        
+        order = 'DESC' if direction == 'next' else 'ASC'
+        query += f" ORDER BY {sort_columns[0]} {order}, {sort_columns[1]} {order} LIMIT %s"
+        params.append(page_size + 1)
+        
+        rows = self.execute_query(query, params, fetch='all') or []
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if direction == 'prev':
+            rows.reverse()
+        
+        # Halaman 'next' berjalan ke data lebih lama, 'prev' ke data lebih baru
+        if direction == 'next':
+            has_older, has_newer = has_more, key is not None
+        else:
+            has_older, has_newer = True, has_more
+        
+        next_token = prev_token = None
+        if rows and has_older:
+            next_token = self._encode_page_token('next', rows[-1], key_fields)
+        if rows and has_newer:
+            prev_token = self._encode_page_token('prev', rows[0], key_fields)
+        
+        return {'items': rows, 'next_token': next_token, 'prev_token': prev_token}
+    
+    # Reference data cache (outlets & products)
+    def _get_reference_data(self, key, query):
+        """Read-through cache for small reference tables; returns (rows, rows_by_id).
+        
+        The rows are shared by every caller in this process, so public getters
+        hand out copies.
+        """
+        self._ensure_cache_listener()
+        
+        def load():
+            rows = self.execute_query(query, fetch='all') or []
+            return rows, {row['id']: row for row in rows}
+        
+        return self.reference_cache.get_or_load(key, load)
+    
+    def invalidate_reference_data(self, *keys):
+        """Invalidate cached reference data locally and, if enabled, in other workers"""
+        self.reference_cache.invalidate(*keys)
+        if self.config.REFERENCE_CACHE_NOTIFY:
+            try:
+                self.execute_query("SELECT pg_notify(%s, %s)",
+                                   (self.config.REFERENCE_CACHE_CHANNEL, ','.join(keys)))
+            except Exception as e:
+                print(f"Error sending cache invalidation: {e}")
+    
+    def _ensure_cache_listener(self):
+        """Start the LISTEN/NOTIFY invalidation thread for this process (once)"""
+        if not self.config.REFERENCE_CACHE_NOTIFY or self._cache_listener is not None:
+            return
+        with self._pool_lock:
+            if self._cache_listener is None:
+                self._cache_listener = CacheInvalidationListener(
+                    self._connect, self.reference_cache, self.config.REFERENCE_CACHE_CHANNEL
+                )
+                self._cache_listener.start()
+    
+    def get_cache_stats(self):
+        """Get reference cache hit/miss counters"""
+        return self.reference_cache.stats()
+    
     # User authentication methods
     def authenticate_user(self, username, password):
         """Authenticate user and return user data if successful"""
@@ -229,12 +543,25 @@ class DataHelper:
     
     # Outlet methods
     def get_all_outlets(self):
-        """Get all outlets"""
-        query = "SELECT * FROM outlets ORDER BY id"
-        return self.execute_query(query, fetch='all')
+        """Get all outlets (cached)"""
+        try:
+            rows, _ = self._get_reference_data('outlets', "SELECT * FROM outlets ORDER BY id")
+            return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Error getting outlets: {e}")
+            return []
+    
+    def count_outlets(self):
+        """Count outlets"""
+        result = self.execute_query("SELECT COUNT(*) as total FROM outlets", fetch='one')
+        return result['total'] if result else 0
     
     def get_outlet_by_id(self, outlet_id):
-        """Get outlet by ID"""
+        """Get outlet by ID (cached)"""
+        _, outlets_by_id = self._get_reference_data('outlets', "SELECT * FROM outlets ORDER BY id")
+        if outlet_id in outlets_by_id:
+            return dict(outlets_by_id[outlet_id])
+        # Bisa jadi outlet baru dari worker lain yang belum terlihat di cache
         query = "SELECT * FROM outlets WHERE id = %s"
         return self.execute_query(query, (outlet_id,), fetch='one')
     
@@ -245,6 +572,7 @@ class DataHelper:
             VALUES (%s, %s, %s, %s) RETURNING id
         """
         result = self.execute_query(query, (nama, lokasi, kontak, slot_maksimal), fetch='one')
+        self.invalidate_reference_data('outlets')
         return result['id'] if result else None
     
     def update_outlet(self, outlet_id, nama, lokasi, kontak, slot_maksimal):
@@ -254,21 +582,42 @@ class DataHelper:
             SET nama = %s, lokasi = %s, kontak = %s, slot_maksimal = %s, updated_at = CURRENT_TIMESTAMP
             WHERE id = %s
         """
-        return self.execute_query(query, (nama, lokasi, kontak, slot_maksimal, outlet_id))
+        result = self.execute_query(query, (nama, lokasi, kontak, slot_maksimal, outlet_id))
+        self.invalidate_reference_data('outlets')
+        return result
     
     def delete_outlet(self, outlet_id):
         """Delete outlet"""
         query = "DELETE FROM outlets WHERE id = %s"
-        return self.execute_query(query, (outlet_id,))
+        result = self.execute_query(query, (outlet_id,))
+        self.invalidate_reference_data('outlets')
+        return result
     
     # Product methods (now with commission per product)
-    def get_all_products(self):
-        """Get all products"""
-        query = "SELECT * FROM products ORDER BY id"
-        return self.execute_query(query, fetch='all')
+    # Cache hanya menyimpan katalog; stok_pusat berubah di setiap distribusi sehingga selalu dibaca langsung
+    PRODUCT_CATALOGUE_QUERY = """
+        SELECT id, nama, harga, persentase_komisi, created_at, updated_at
+        FROM products ORDER BY id
+    """
+    
+    def get_all_products(self, include_stock=True):
+        """Get all products (catalogue cached, stok_pusat read live unless include_stock is False)"""
+        rows, _ = self._get_reference_data('products', self.PRODUCT_CATALOGUE_QUERY)
+        products = [dict(row) for row in rows]
+        if include_stock:
+            stock = self.execute_query("SELECT id, stok_pusat FROM products", fetch='all') or []
+            stock_by_id = {row['id']: row['stok_pusat'] for row in stock}
+            for product in products:
+                product['stok_pusat'] = stock_by_id.get(product['id'], 0)
+        return products
+    
+    def count_products(self):
+        """Count products"""
+        result = self.execute_query("SELECT COUNT(*) as total FROM products", fetch='one')
+        return result['total'] if result else 0
     
     def get_product_by_id(self, product_id):
-        """Get product by ID"""
+        """Get product by ID (read live, including stok_pusat)"""
         query = "SELECT * FROM products WHERE id = %s"
         return self.execute_query(query, (product_id,), fetch='one')
     
@@ -279,6 +628,7 @@ class DataHelper:
             VALUES (%s, %s, %s, %s) RETURNING id
         """
         result = self.execute_query(query, (nama, harga, stok_pusat, persentase_komisi), fetch='one')
+        self.invalidate_reference_data('products')
         return result['id'] if result else None
     
     def update_product(self, product_id, nama, harga, stok_pusat, persentase_komisi):
@@ -288,12 +638,16 @@ class DataHelper:
             SET nama = %s, harga = %s, stok_pusat = %s, persentase_komisi = %s, updated_at = CURRENT_TIMESTAMP
             WHERE id = %s
         """
-        return self.execute_query(query, (nama, harga, stok_pusat, persentase_komisi, product_id))
+        result = self.execute_query(query, (nama, harga, stok_pusat, persentase_komisi, product_id))
+        self.invalidate_reference_data('products')
+        return result
     
     def delete_product(self, product_id):
         """Delete product"""
         query = "DELETE FROM products WHERE id = %s"
-        return self.execute_query(query, (product_id,))
+        result = self.execute_query(query, (product_id,))
+        self.invalidate_reference_data('products')
+        return result
     
     def update_product_stock(self, product_id, quantity_change):
         """Update product stock"""
@@ -301,8 +655,8 @@ class DataHelper:
         return self.execute_query(query, (quantity_change, product_id))
     
     # Distribution methods
-    def get_all_distributions(self, start_date=None, end_date=None, outlet_id=None):
-        """Get all distributions with filters"""
+    def get_all_distributions(self, start_date=None, end_date=None, outlet_id=None, page_size=None, page_token=None):
+        """Get all distributions with filters (paged by tanggal, id when page_size is given)"""
         query = """
             SELECT d.*, o.nama as outlet_nama, p.nama as produk_nama
             FROM distributions d
@@ -313,40 +667,62 @@ class DataHelper:
         params = []
         
         if start_date and end_date:
-            query += " AND DATE(d.tanggal) BETWEEN %s AND %s"
+            query += " AND d.tanggal >= %s::date AND d.tanggal < %s::date + INTERVAL '1 day'"
             params.extend([start_date, end_date])
         
         if outlet_id:
             query += " AND d.outlet_id = %s"
             params.append(outlet_id)
         
+        if page_size is not None:
+            return self._fetch_page(query, params, ('d.tanggal', 'd.id'), ('tanggal', 'id'), page_size, page_token)
+        
         query += " ORDER BY d.tanggal DESC"
         
         return self.execute_query(query, params, fetch='all')
     
+    def get_recent_distributions(self, limit=5):
+        """Get the most recent distributions"""
+        query = """
+            SELECT d.*, o.nama as outlet_nama, p.nama as produk_nama
+            FROM distributions d
+            LEFT JOIN outlets o ON d.outlet_id = o.id
+            LEFT JOIN products p ON d.produk_id = p.id
+            ORDER BY d.tanggal DESC, d.id DESC
+            LIMIT %s
+        """
+        return self.execute_query(query, (limit,), fetch='all')
+    
     def create_distribution(self, outlet_id, produk_id, jumlah):
         """Create new distribution"""
+        if jumlah <= 0:
+            return False, "Jumlah distribusi harus lebih dari 0"
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            # Check if product has enough stock
-            cursor.execute("SELECT stok_pusat FROM products WHERE id = %s", (produk_id,))
-            product = cursor.fetchone()
+            # Kurangi stok pusat hanya jika masih cukup; baris produk terkunci sampai commit
+            cursor.execute("""
+                UPDATE products SET stok_pusat = stok_pusat - %s
+                WHERE id = %s AND stok_pusat >= %s
+                RETURNING stok_pusat
+            """, (jumlah, produk_id, jumlah))
             
-            if not product or product[0] < jumlah:
+            if cursor.fetchone() is None:
+                conn.rollback()
                 return False, "Stok pusat tidak mencukupi"
             
             # Create distribution record
             cursor.execute("""
                 INSERT INTO distributions (outlet_id, produk_id, jumlah) 
-                VALUES (%s, %s, %s) RETURNING id
+                VALUES (%s, %s, %s) RETURNING tanggal::date
             """, (outlet_id, produk_id, jumlah))
+            tanggal = cursor.fetchone()[0]
             
-            # Update product stock
-            cursor.execute("""
-                UPDATE products SET stok_pusat = stok_pusat - %s WHERE id = %s
-            """, (jumlah, produk_id))
+            # Update outlet stock balance & daily rollup
+            self._apply_outlet_stock(cursor, outlet_id, produk_id, distributed=jumlah)
+            self._apply_daily_summary(cursor, [(tanggal, outlet_id, produk_id, jumlah, 0, 0, 0, 0)])
             
             conn.commit()
             return True, "Distribusi berhasil dicatat"
@@ -357,9 +733,78 @@ class DataHelper:
         finally:
             cursor.close()
     
+    def create_distribution_batch(self, lines):
+        """Create all distributions of one delivery manifest in a single transaction.
+        
+        `lines` is a list of (outlet_id, produk_id, jumlah). Central stock of every
+        product in the manifest is locked once and checked against the manifest
+        total; either every line is recorded or none is.
+        """
+        if not lines:
+            return False, "Manifest distribusi kosong"
+        
+        for outlet_id, produk_id, jumlah in lines:
+            if jumlah <= 0:
+                return False, "Jumlah distribusi harus lebih dari 0"
+        
+        needed = {}
+        per_pair = {}
+        for outlet_id, produk_id, jumlah in lines:
+            needed[produk_id] = needed.get(produk_id, 0) + jumlah
+            per_pair[(outlet_id, produk_id)] = per_pair.get((outlet_id, produk_id), 0) + jumlah
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT id, nama, stok_pusat FROM products
+                WHERE id = ANY(%s)
+                ORDER BY id
+                FOR UPDATE
+            """, (sorted(needed),))
+            stock = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+            
+            shortages = []
+            for produk_id, jumlah in sorted(needed.items()):
+                if produk_id not in stock:
+                    shortages.append(f"Produk {produk_id} tidak ditemukan")
+                elif stock[produk_id][1] < jumlah:
+                    nama, stok_pusat = stock[produk_id]
+                    shortages.append(f"{nama} (dibutuhkan {jumlah}, tersedia {stok_pusat})")
+            
+            if shortages:
+                conn.rollback()
+                return False, "Stok pusat tidak mencukupi: " + "; ".join(shortages)
+            
+            inserted = psycopg2.extras.execute_values(cursor, """
+                INSERT INTO distributions (outlet_id, produk_id, jumlah) VALUES %s
+                RETURNING tanggal::date, outlet_id, produk_id, jumlah
+            """, lines, page_size=1000, fetch=True)
+            
+            psycopg2.extras.execute_values(cursor, """
+                UPDATE products SET stok_pusat = products.stok_pusat - v.jumlah
+                FROM (VALUES %s) AS v(id, jumlah)
+                WHERE products.id = v.id
+            """, sorted(needed.items()))
+            
+            self._apply_outlet_stock_batch(
+                cursor, [(o, p, jumlah, 0) for (o, p), jumlah in per_pair.items()])
+            self._apply_daily_summary(
+                cursor, [(tanggal, o, p, jumlah, 0, 0, 0, 0) for tanggal, o, p, jumlah in inserted])
+            
+            conn.commit()
+            return True, f"{len(lines)} baris distribusi berhasil dicatat"
+            
+        except Exception as e:
+            conn.rollback()
+            return False, f"Error: {str(e)}"
+        finally:
+            cursor.close()
+    
     # Sales methods
-    def get_all_sales(self, start_date=None, end_date=None, outlet_id=None):
-        """Get all sales with filters"""
+    def get_all_sales(self, start_date=None, end_date=None, outlet_id=None, page_size=None, page_token=None):
+        """Get all sales with filters (paged by tanggal, id when page_size is given)"""
         query = """
             SELECT s.*, o.nama as outlet_nama, p.nama as produk_nama, p.harga
             FROM sales s
@@ -370,17 +815,32 @@ class DataHelper:
         params = []
         
         if start_date and end_date:
-            query += " AND DATE(s.tanggal) BETWEEN %s AND %s"
+            query += " AND s.tanggal >= %s::date AND s.tanggal < %s::date + INTERVAL '1 day'"
             params.extend([start_date, end_date])
         
         if outlet_id:
             query += " AND s.outlet_id = %s"
             params.append(outlet_id)
         
+        if page_size is not None:
+            return self._fetch_page(query, params, ('s.tanggal', 's.id'), ('tanggal', 'id'), page_size, page_token)
+        
         query += " ORDER BY s.tanggal DESC"
         
         return self.execute_query(query, params, fetch='all')
     
+    def get_recent_sales(self, limit=5):
+        """Get the most recent sales"""
+        query = """
+            SELECT s.*, o.nama as outlet_nama, p.nama as produk_nama, p.harga
+            FROM sales s
+            LEFT JOIN outlets o ON s.outlet_id = o.id
+            LEFT JOIN products p ON s.produk_id = p.id
+            ORDER BY s.tanggal DESC, s.id DESC
+            LIMIT %s
+        """
+        return self.execute_query(query, (limit,), fetch='all')
+    
     def get_unpaid_sales(self, start_date=None, end_date=None, outlet_id=None):
         """Get ONLY unpaid sales - UNTUK INVOICE"""
         query = """
@@ -393,7 +853,7 @@ class DataHelper:
         params = []
         
         if start_date and end_date:
-            query += " AND DATE(s.tanggal) BETWEEN %s AND %s"
+            query += " AND s.tanggal >= %s::date AND s.tanggal < %s::date + INTERVAL '1 day'"
             params.extend([start_date, end_date])
         
         if outlet_id:
@@ -404,10 +864,34 @@ class DataHelper:
         
         return self.execute_query(query, params, fetch='all')
     
+    def get_unpaid_sales_for_all_outlets(self, start_date=None, end_date=None):
+        """Unpaid sales of every outlet in one query, as {outlet_id: [sales oldest first]}"""
+        query = """
+            SELECT s.*, o.nama as outlet_nama, p.nama as produk_nama, p.harga
+            FROM sales s
+            LEFT JOIN outlets o ON s.outlet_id = o.id
+            LEFT JOIN products p ON s.produk_id = p.id
+            WHERE s.remaining_amount > 0
+        """
+        params = []
+        
+        if start_date and end_date:
+            query += " AND s.tanggal >= %s::date AND s.tanggal < %s::date + INTERVAL '1 day'"
+            params.extend([start_date, end_date])
+        
+        query += " ORDER BY s.outlet_id, s.tanggal ASC"
+        
+        sales_by_outlet = {}
+        for row in self.execute_query(query, params, fetch='all') or []:
+            sales_by_outlet.setdefault(row['outlet_id'], []).append(dict(row))
+        return sales_by_outlet
+    
     def calculate_product_bill(self, product_id, quantity_sold):
         """Calculate bill based on product commission (not outlet)"""
         try:
-            product = self.get_product_by_id(product_id)
+            # Harga & komisi selalu dibaca dari database, bukan dari cache referensi
+            query = "SELECT harga, persentase_komisi FROM products WHERE id = %s"
+            product = self.execute_query(query, (product_id,), fetch='one')
             if not product:
                 return 0, 0, 0
             
@@ -426,6 +910,9 @@ class DataHelper:
     
     def record_sale_with_bill(self, outlet_id, product_id, quantity_sold, sale_date):
         
+        if quantity_sold <= 0:
+            return False, "Jumlah terjual harus lebih dari 0"
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -436,19 +923,36 @@ class DataHelper:
             if tagihan <= 0:
                 return False, "Tidak dapat menghitung tagihan"
             
-            # Check available stock at outlet
-            available_stock = self.get_outlet_product_stock(outlet_id, product_id)
-            if available_stock < quantity_sold:
-                return False, f"Stok tidak mencukupi. Tersedia: {available_stock}"
+            # Ambil stok outlet hanya jika masih cukup; baris outlet_stock terkunci sampai commit
+            cursor.execute("""
+                UPDATE outlet_stock
+                SET total_terjual = total_terjual + %s, updated_at = CURRENT_TIMESTAMP
+                WHERE outlet_id = %s AND produk_id = %s AND total_distribusi - total_terjual >= %s
+                RETURNING total_distribusi - total_terjual
+            """, (quantity_sold, outlet_id, product_id, quantity_sold))
+            
+            if cursor.fetchone() is None:
+                cursor.execute("""
+                    SELECT total_distribusi - total_terjual FROM outlet_stock
+                    WHERE outlet_id = %s AND produk_id = %s
+                """, (outlet_id, product_id))
+                row = cursor.fetchone()
+                conn.rollback()
+                return False, f"Stok tidak mencukupi. Tersedia: {row[0] if row else 0}"
             
             # Insert sale record dengan is_paid = FALSE dan remaining_amount = yang_harus_dibayar
             query = """
                 INSERT INTO sales (outlet_id, produk_id, jumlah_terjual, tanggal, tagihan, komisi, yang_harus_dibayar, is_paid, remaining_amount)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id, tanggal::date, tagihan, komisi, yang_harus_dibayar
             """
             cursor.execute(query, (outlet_id, product_id, quantity_sold, sale_date, tagihan, komisi, yang_harus_dibayar, False, yang_harus_dibayar))
             result = cursor.fetchone()
             
+            if result:
+                self._apply_daily_summary(
+                    cursor, [(result[1], outlet_id, product_id, 0, quantity_sold) + tuple(result[2:])])
+            
             conn.commit()
             
             if result:
@@ -462,32 +966,297 @@ class DataHelper:
         finally:
             cursor.close()
     
-    def get_outlet_product_stock(self, outlet_id, product_id):
+    def record_sales_batch(self, sales, skip_invalid=False):
+        """Record many sales in one transaction.
+        
+        `sales` is a list of dicts with line, outlet_id, produk_id, jumlah_terjual
+        and tanggal. Stock for the whole batch is checked against locked
+        outlet_stock rows and prices come from one products query. Returns
+        (success, message, inserted_count, errors) where errors is a list of
+        {'line', 'error'}; unless skip_invalid is set, any error rejects the batch.
+        """
+        if not sales:
+            return False, "Tidak ada data penjualan", 0, []
+        
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        
         try:
-            # Get total distributed
-            query_dist = """
-                SELECT COALESCE(SUM(jumlah), 0) as distributed 
-                FROM distributions 
-                WHERE outlet_id = %s AND produk_id = %s
-            """
-            dist_result = self.execute_query(query_dist, (outlet_id, product_id), fetch='one')
-            distributed = float(dist_result['distributed']) if dist_result else 0
+            product_ids = sorted({row['produk_id'] for row in sales})
+            cursor.execute("""
+                SELECT id, harga, persentase_komisi FROM products WHERE id = ANY(%s)
+            """, (product_ids,))
+            products = {row['id']: row for row in cursor.fetchall()}
             
-            # Get total sold
-            query_sales = """
-                SELECT COALESCE(SUM(jumlah_terjual), 0) as sold 
-                FROM sales 
+            # Kunci saldo stok semua pasangan outlet/produk di batch ini
+            pairs = sorted({(row['outlet_id'], row['produk_id']) for row in sales})
+            cursor.execute("""
+                SELECT outlet_id, produk_id, total_distribusi - total_terjual as stok
+                FROM outlet_stock
+                WHERE (outlet_id, produk_id) IN (
+                    SELECT * FROM unnest(%s::INTEGER[], %s::INTEGER[])
+                )
+                ORDER BY outlet_id, produk_id
+                FOR UPDATE
+            """, ([p[0] for p in pairs], [p[1] for p in pairs]))
+            available = {(row['outlet_id'], row['produk_id']): row['stok'] for row in cursor.fetchall()}
+            
+            errors = []
+            values = []
+            sold_per_pair = {}
+            for row in sales:
+                key = (row['outlet_id'], row['produk_id'])
+                quantity = row['jumlah_terjual']
+                product = products.get(row['produk_id'])
+                
+                if quantity <= 0:
+                    errors.append({'line': row['line'], 'error': "Jumlah terjual harus lebih dari 0"})
+                    continue
+                if not product:
+                    errors.append({'line': row['line'], 'error': f"Produk {row['produk_id']} tidak ditemukan"})
+                    continue
+                stock = available.get(key, 0)
+                if stock < quantity:
+                    errors.append({'line': row['line'], 'error': f"Stok tidak mencukupi. Tersedia: {stock}"})
+                    continue
+                
+                tagihan = quantity * float(product['harga'])
+                komisi = tagihan * float(product['persentase_komisi']) / 100
+                yang_harus_dibayar = tagihan - komisi
+                if tagihan <= 0:
+                    errors.append({'line': row['line'], 'error': "Tidak dapat menghitung tagihan"})
+                    continue
+                
+                available[key] = stock - quantity
+                sold_per_pair[key] = sold_per_pair.get(key, 0) + quantity
+                values.append((row['outlet_id'], row['produk_id'], quantity, row['tanggal'],
+                               tagihan, komisi, yang_harus_dibayar, False, yang_harus_dibayar))
+            
+            if errors and not skip_invalid:
+                conn.rollback()
+                return False, f"{len(errors)} baris bermasalah, tidak ada penjualan yang dicatat", 0, errors
+            
+            if not values:
+                conn.rollback()
+                return False, "Tidak ada baris valid untuk dicatat", 0, errors
+            
+            inserted = psycopg2.extras.execute_values(cursor, """
+                INSERT INTO sales (outlet_id, produk_id, jumlah_terjual, tanggal, tagihan, komisi, yang_harus_dibayar, is_paid, remaining_amount)
+                VALUES %s
+                RETURNING tanggal::date as tanggal, outlet_id, produk_id, 0 as total_distribusi,
+                          jumlah_terjual, tagihan, komisi, yang_harus_dibayar
+            """, values, page_size=1000, fetch=True)
+            
+            self._apply_outlet_stock_batch(
+                cursor, [(o, p, 0, sold) for (o, p), sold in sold_per_pair.items()])
+            self._apply_daily_summary(cursor, [tuple(row.values()) for row in inserted])
+            
+            conn.commit()
+            
+            message = f"{len(values)} penjualan berhasil dicatat"
+            if errors:
+                message += f", {len(errors)} baris dilewati"
+            return True, message, len(values), errors
+            
+        except Exception as e:
+            conn.rollback()
+            return False, f"Error: {str(e)}", 0, []
+        finally:
+            cursor.close()
+    
+    def get_outlet_product_stock(self, outlet_id, product_id):
+        try:
+            query = """
+                SELECT total_distribusi - total_terjual as stok
+                FROM outlet_stock 
                 WHERE outlet_id = %s AND produk_id = %s
             """
-            sales_result = self.execute_query(query_sales, (outlet_id, product_id), fetch='one')
-            sold = float(sales_result['sold']) if sales_result else 0
-            
-            return distributed - sold
+            result = self.execute_query(query, (outlet_id, product_id), fetch='one')
+            return float(result['stok']) if result else 0
             
         except Exception as e:
             print(f"Error getting outlet product stock: {e}")
             return 0
     
+    def _apply_outlet_stock(self, cursor, outlet_id, product_id, distributed=0, sold=0):
+        """Update outlet_stock balance inside the caller's transaction"""
+        cursor.execute("""
+            INSERT INTO outlet_stock (outlet_id, produk_id, total_distribusi, total_terjual)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (outlet_id, produk_id) DO UPDATE
+            SET total_distribusi = outlet_stock.total_distribusi + EXCLUDED.total_distribusi,
+                total_terjual = outlet_stock.total_terjual + EXCLUDED.total_terjual,
+                updated_at = CURRENT_TIMESTAMP
+        """, (outlet_id, product_id, distributed, sold))
+    
+    def _apply_outlet_stock_batch(self, cursor, balances):
+        """Apply many (outlet_id, produk_id, distributed, sold) deltas in one statement"""
+        psycopg2.extras.execute_values(cursor, """
+            INSERT INTO outlet_stock (outlet_id, produk_id, total_distribusi, total_terjual)
+            VALUES %s
+            ON CONFLICT (outlet_id, produk_id) DO UPDATE
+            SET total_distribusi = outlet_stock.total_distribusi + EXCLUDED.total_distribusi,
+                total_terjual = outlet_stock.total_terjual + EXCLUDED.total_terjual,
+                updated_at = CURRENT_TIMESTAMP
+        """, sorted(balances), page_size=1000)
+    
+    def _rebuild_outlet_stock(self, cursor):
+        """Recompute outlet_stock from the distributions and sales ledgers"""
+        cursor.execute("LOCK TABLE distributions, sales IN SHARE MODE")
+        cursor.execute("DELETE FROM outlet_stock")
+        cursor.execute("""
+            INSERT INTO outlet_stock (outlet_id, produk_id, total_distribusi, total_terjual)
+            SELECT 
+                COALESCE(d.outlet_id, s.outlet_id),
+                COALESCE(d.produk_id, s.produk_id),
+                COALESCE(d.total_distribusi, 0),
+                COALESCE(s.total_terjual, 0)
+            FROM (
+                SELECT outlet_id, produk_id, SUM(jumlah) as total_distribusi
+                FROM distributions
+                WHERE outlet_id IS NOT NULL AND produk_id IS NOT NULL
+                GROUP BY outlet_id, produk_id
+            ) d
+            FULL OUTER JOIN (
+                SELECT outlet_id, produk_id, SUM(jumlah_terjual) as total_terjual
+                FROM sales
+                WHERE outlet_id IS NOT NULL AND produk_id IS NOT NULL
+                GROUP BY outlet_id, produk_id
+            ) s ON d.outlet_id = s.outlet_id AND d.produk_id = s.produk_id
+        """)
+        return cursor.rowcount
+    
+    def rebuild_outlet_stock(self):
+        """Rebuild outlet_stock balances from raw ledgers"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            rows = self._rebuild_outlet_stock(cursor)
+            conn.commit()
+            return rows
+        except Exception as e:
+            conn.rollback()
+            print(f"Error rebuilding outlet stock: {e}")
+            raise e
+        finally:
+            cursor.close()
+    
+    def verify_outlet_stock(self):
+        """Compare outlet_stock against raw ledgers and return mismatching rows"""
+        query = """
+            SELECT 
+                COALESCE(l.outlet_id, os.outlet_id) as outlet_id,
+                COALESCE(l.produk_id, os.produk_id) as produk_id,
+                COALESCE(l.total_distribusi, 0) as ledger_distribusi,
+                COALESCE(l.total_terjual, 0) as ledger_terjual,
+                COALESCE(os.total_distribusi, 0) as stock_distribusi,
+                COALESCE(os.total_terjual, 0) as stock_terjual
+            FROM (
+                SELECT 
+                    COALESCE(d.outlet_id, s.outlet_id) as outlet_id,
+                    COALESCE(d.produk_id, s.produk_id) as produk_id,
+                    COALESCE(d.total_distribusi, 0) as total_distribusi,
+                    COALESCE(s.total_terjual, 0) as total_terjual
+                FROM (
+                    SELECT outlet_id, produk_id, SUM(jumlah) as total_distribusi
+                    FROM distributions
+                    WHERE outlet_id IS NOT NULL AND produk_id IS NOT NULL
+                    GROUP BY outlet_id, produk_id
+                ) d
+                FULL OUTER JOIN (
+                    SELECT outlet_id, produk_id, SUM(jumlah_terjual) as total_terjual
+                    FROM sales
+                    WHERE outlet_id IS NOT NULL AND produk_id IS NOT NULL
+                    GROUP BY outlet_id, produk_id
+                ) s ON d.outlet_id = s.outlet_id AND d.produk_id = s.produk_id
+            ) l
+            FULL OUTER JOIN outlet_stock os 
+                ON l.outlet_id = os.outlet_id AND l.produk_id = os.produk_id
+            WHERE COALESCE(l.total_distribusi, 0) <> COALESCE(os.total_distribusi, 0)
+               OR COALESCE(l.total_terjual, 0) <> COALESCE(os.total_terjual, 0)
+            ORDER BY 1, 2
+        """
+        return self.execute_query(query, fetch='all')
+    
+    # Daily rollup (daily_outlet_product_summary)
+    def _apply_daily_summary(self, cursor, rows):
+        """Add (tanggal, outlet_id, produk_id, distributed, sold, tagihan, komisi, yang_harus_dibayar)
+        rows to the daily rollup inside the caller's transaction"""
+        totals = {}
+        for tanggal, outlet_id, produk_id, *amounts in rows:
+            key = (tanggal, outlet_id, produk_id)
+            current = totals.get(key)
+            totals[key] = amounts if current is None else [a + b for a, b in zip(current, amounts)]
+        
+        if not totals:
+            return
+        
+        psycopg2.extras.execute_values(cursor, """
+            INSERT INTO daily_outlet_product_summary
+                (tanggal, outlet_id, produk_id, total_distribusi, total_terjual, tagihan, komisi, yang_harus_dibayar)
+            VALUES %s
+            ON CONFLICT (tanggal, outlet_id, produk_id) DO UPDATE
+            SET total_distribusi = daily_outlet_product_summary.total_distribusi + EXCLUDED.total_distribusi,
+                total_terjual = daily_outlet_product_summary.total_terjual + EXCLUDED.total_terjual,
+                tagihan = daily_outlet_product_summary.tagihan + EXCLUDED.tagihan,
+                komisi = daily_outlet_product_summary.komisi + EXCLUDED.komisi,
+                yang_harus_dibayar = daily_outlet_product_summary.yang_harus_dibayar + EXCLUDED.yang_harus_dibayar,
+                updated_at = CURRENT_TIMESTAMP
+        """, sorted(key + tuple(amounts) for key, amounts in totals.items()), page_size=1000)
+    
+    def _rebuild_daily_summary(self, cursor):
+        """Recompute daily_outlet_product_summary from the distributions and sales ledgers"""
+        cursor.execute("LOCK TABLE distributions, sales IN SHARE MODE")
+        cursor.execute("DELETE FROM daily_outlet_product_summary")
+        cursor.execute(f"""
+            INSERT INTO daily_outlet_product_summary
+                (tanggal, outlet_id, produk_id, total_distribusi, total_terjual, tagihan, komisi, yang_harus_dibayar)
+            {DAILY_SUMMARY_LEDGER}
+        """)
+        return cursor.rowcount
+    
+    def rebuild_daily_summary(self):
+        """Rebuild the daily rollup from raw ledgers"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            rows = self._rebuild_daily_summary(cursor)
+            conn.commit()
+            return rows
+        except Exception as e:
+            conn.rollback()
+            print(f"Error rebuilding daily summary: {e}")
+            raise e
+        finally:
+            cursor.close()
+    
+    def verify_daily_summary(self):
+        """Compare the daily rollup against raw ledgers and return mismatching rows"""
+        query = f"""
+            SELECT 
+                COALESCE(l.tanggal, r.tanggal) as tanggal,
+                COALESCE(l.outlet_id, r.outlet_id) as outlet_id,
+                COALESCE(l.produk_id, r.produk_id) as produk_id,
+                COALESCE(l.total_distribusi, 0) as ledger_distribusi,
+                COALESCE(r.total_distribusi, 0) as rollup_distribusi,
+                COALESCE(l.total_terjual, 0) as ledger_terjual,
+                COALESCE(r.total_terjual, 0) as rollup_terjual,
+                COALESCE(l.tagihan, 0) as ledger_tagihan,
+                COALESCE(r.tagihan, 0) as rollup_tagihan
+            FROM ({DAILY_SUMMARY_LEDGER}) l
+            FULL OUTER JOIN daily_outlet_product_summary r
+                ON l.tanggal = r.tanggal AND l.outlet_id = r.outlet_id AND l.produk_id = r.produk_id
+            WHERE COALESCE(l.total_distribusi, 0) <> COALESCE(r.total_distribusi, 0)
+               OR COALESCE(l.total_terjual, 0) <> COALESCE(r.total_terjual, 0)
+               OR COALESCE(l.tagihan, 0) <> COALESCE(r.tagihan, 0)
+               OR COALESCE(l.komisi, 0) <> COALESCE(r.komisi, 0)
+               OR COALESCE(l.yang_harus_dibayar, 0) <> COALESCE(r.yang_harus_dibayar, 0)
+            ORDER BY 1, 2, 3
+        """
+        return self.execute_query(query, fetch='all')
+    
     def get_outlet_balance(self, outlet_id):
         """Get outlet balance (total amount to be paid) - MENGGUNAKAN remaining_amount"""
         try:
@@ -506,46 +1275,40 @@ class DataHelper:
             print(f"Error calculating outlet balance: {e}")
             return 0
 
-    def get_all_outlets(self):
-        """Get all outlets"""
+    def get_all_outlet_balances(self):
+        """Get outstanding balance for every outlet with remaining bills, keyed by outlet_id"""
         try:
-            query = "SELECT * FROM outlets ORDER BY id"
-            result = self.execute_query(query, fetch='all')
-            return result if result else []
+            query = """
+                SELECT outlet_id, COALESCE(SUM(remaining_amount), 0) as total_tagihan
+                FROM sales 
+                WHERE remaining_amount > 0
+                GROUP BY outlet_id
+            """
+            rows = self.execute_query(query, fetch='all') or []
+            return {row['outlet_id']: max(0, float(row['total_tagihan'])) for row in rows}
+            
         except Exception as e:
-            print(f"Error getting outlets: {e}")
-            return []
-    
+            print(f"Error calculating outlet balances: {e}")
+            return {}
+
     def get_outlet_slot_info(self, outlet_id):
         """Get outlet slot usage information"""
         try:
-            # Get total distributed
-            query_dist = """
-                SELECT COALESCE(SUM(jumlah), 0) as distributed 
-                FROM distributions 
-                WHERE outlet_id = %s
-            """
-            dist_result = self.execute_query(query_dist, (outlet_id,), fetch='one')
-            distributed = float(dist_result['distributed']) if dist_result else 0
-            
-            # Get total sold
-            query_sales = """
-                SELECT COALESCE(SUM(jumlah_terjual), 0) as sold 
-                FROM sales 
+            query = """
+                SELECT COALESCE(SUM(total_distribusi - total_terjual), 0) as used
+                FROM outlet_stock 
                 WHERE outlet_id = %s
             """
-            sales_result = self.execute_query(query_sales, (outlet_id,), fetch='one')
-            sold = float(sales_result['sold']) if sales_result else 0
-            
-            return distributed - sold
+            result = self.execute_query(query, (outlet_id,), fetch='one')
+            return float(result['used']) if result else 0
             
         except Exception as e:
             print(f"Error getting outlet slot info: {e}")
             return 0
     
     # Payment methods - DIPERBAIKI UNTUK SISTEM CICILAN YANG BENAR
-    def get_all_payments(self, start_date=None, end_date=None, outlet_id=None):
-        """Get all payments with filters"""
+    def get_all_payments(self, start_date=None, end_date=None, outlet_id=None, page_size=None, page_token=None):
+        """Get all payments with filters (paged by tanggal_bayar, id when page_size is given)"""
         query = """
             SELECT p.*, o.nama as outlet_nama
             FROM payments p
@@ -562,6 +1325,9 @@ class DataHelper:
             query += " AND p.outlet_id = %s"
             params.append(outlet_id)
         
+        if page_size is not None:
+            return self._fetch_page(query, params, ('p.tanggal_bayar', 'p.id'), ('tanggal_bayar', 'id'), page_size, page_token)
+        
         query += " ORDER BY p.tanggal_bayar DESC"
         
         return self.execute_query(query, params, fetch='all')
@@ -572,60 +1338,70 @@ class DataHelper:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
         try:
-            total_tagihan = self.get_outlet_balance(outlet_id)
-            print("DEBUG total_tagihan:", total_tagihan)
-
-            if total_tagihan <= 0:
-                return False, "Outlet tidak memiliki tagihan"
-            
             if amount <= 0:
                 return False, "Jumlah pembayaran harus lebih dari 0"
             
+            amount = Decimal(str(amount))
+            
+            # Kunci sales yang belum lunas untuk outlet ini agar pembayaran paralel tidak dialokasikan ganda
+            cursor.execute("""
+                SELECT COALESCE(SUM(remaining_amount), 0) as total_tagihan
+                FROM (
+                    SELECT remaining_amount
+                    FROM sales 
+                    WHERE outlet_id = %s AND remaining_amount > 0
+                    FOR UPDATE
+                ) locked
+            """, (outlet_id,))
+            total_tagihan = cursor.fetchone()['total_tagihan']
+            
+            if total_tagihan <= 0:
+                conn.rollback()
+                return False, "Outlet tidak memiliki tagihan"
+            
             if amount > total_tagihan:
+                conn.rollback()
                 return False, f"Jumlah pembayaran ({amount:,.0f}) melebihi total tagihan ({total_tagihan:,.0f})"
             
-            # Get sales dengan remaining_amount > 0 untuk outlet ini, diurutkan berdasarkan tanggal (FIFO)
+            # Alokasikan pembayaran ke sales secara FIFO (tanggal, id) dalam satu statement:
+            # running total per sale menentukan berapa bagian pembayaran yang jatuh ke sale tersebut
             cursor.execute("""
-                SELECT id, remaining_amount, tanggal 
-                FROM sales 
-                WHERE outlet_id = %s AND remaining_amount > 0 
-                ORDER BY tanggal ASC
-            """, (outlet_id,))
-            unpaid_sales = cursor.fetchall()
+                WITH unpaid AS (
+                    SELECT id, remaining_amount, tanggal
+                    FROM sales
+                    WHERE outlet_id = %(outlet_id)s AND remaining_amount > 0
+                    ORDER BY tanggal ASC, id ASC
+                    FOR UPDATE
+                ),
+                running AS (
+                    SELECT id, remaining_amount,
+                           SUM(remaining_amount) OVER (ORDER BY tanggal ASC, id ASC) as running_total
+                    FROM unpaid
+                ),
+                allocation AS (
+                    SELECT id, running_total,
+                           LEAST(remaining_amount, %(amount)s - (running_total - remaining_amount)) as paid
+                    FROM running
+                    WHERE running_total - remaining_amount < %(amount)s
+                )
+                UPDATE sales s
+                SET remaining_amount = s.remaining_amount - a.paid,
+                    is_paid = (s.remaining_amount - a.paid) <= 0
+                FROM allocation a
+                WHERE s.id = a.id
+                RETURNING s.id, a.paid, s.remaining_amount, a.running_total
+            """, {'outlet_id': outlet_id, 'amount': amount})
+            allocations = sorted(cursor.fetchall(), key=lambda row: row['running_total'])
             
-            # Alokasikan pembayaran ke sales berdasarkan jumlah pembayaran
-            remaining_payment = float(amount)
             paid_sales_info = []
-            
-            for sale in unpaid_sales:
-                sale_remaining = float(sale['remaining_amount'])
-                
-                if remaining_payment >= sale_remaining:
-                    # Bayar penuh untuk sale ini
-                    cursor.execute("""
-                        UPDATE sales 
-                        SET remaining_amount = 0, is_paid = TRUE 
-                        WHERE id = %s
-                    """, (sale['id'],))
-                    paid_sales_info.append(f"Sale ID {sale['id']}: Rp {sale_remaining:,.0f} (LUNAS)")
-                    remaining_payment -= sale_remaining
-                    
-                    if remaining_payment <= 0:
-                        break
+            for row in allocations:
+                if row['remaining_amount'] <= 0:
+                    paid_sales_info.append(f"Sale ID {row['id']}: Rp {row['paid']:,.0f} (LUNAS)")
                 else:
-                    # Pembayaran sebagian untuk sale ini
-                    new_remaining = sale_remaining - remaining_payment
-                    cursor.execute("""
-                        UPDATE sales 
-                        SET remaining_amount = %s, is_paid = FALSE 
-                        WHERE id = %s
-                    """, (new_remaining, sale['id']))
-                    paid_sales_info.append(f"Sale ID {sale['id']}: Rp {remaining_payment:,.0f} (CICILAN, sisa: Rp {new_remaining:,.0f})")
-                    remaining_payment = 0
-                    break
+                    paid_sales_info.append(f"Sale ID {row['id']}: Rp {row['paid']:,.0f} (CICILAN, sisa: Rp {row['remaining_amount']:,.0f})")
             
             # Determine status berdasarkan sisa tagihan setelah pembayaran
-            new_balance = self.get_outlet_balance(outlet_id) - amount
+            new_balance = total_tagihan - amount
             if new_balance <= 0:
                 status = "lunas"
                 tanggal_pelunasan = payment_date
@@ -641,7 +1417,12 @@ class DataHelper:
             """, (outlet_id, amount, payment_date, tanggal_pelunasan, status, sales_covered_text))
             
             result = cursor.fetchone()
-            print("DEBUG result:", result)
+            
+            # Simpan alokasi per sale dalam satu batch insert
+            if result and allocations:
+                psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO payment_allocations (payment_id, sale_id, amount) VALUES %s
+                """, [(result['id'], row['id'], row['paid']) for row in allocations], page_size=1000)
             
             conn.commit()
             
@@ -661,74 +1442,259 @@ class DataHelper:
             cursor.close()
 
     
+    def get_payment_allocations(self, payment_id):
+        """Get sales covered by a payment"""
+        query = """
+            SELECT pa.sale_id, pa.amount, s.tanggal, s.produk_id, pr.nama as produk_nama,
+                   s.yang_harus_dibayar, s.remaining_amount
+            FROM payment_allocations pa
+            JOIN sales s ON pa.sale_id = s.id
+            LEFT JOIN products pr ON s.produk_id = pr.id
+            WHERE pa.payment_id = %s
+            ORDER BY s.tanggal ASC, s.id ASC
+        """
+        return self.execute_query(query, (payment_id,), fetch='all')
+    
+    def get_sale_payment_history(self, sale_id):
+        """Get payments that covered a sale"""
+        query = """
+            SELECT pa.payment_id, pa.amount, p.tanggal_bayar, p.status
+            FROM payment_allocations pa
+            JOIN payments p ON pa.payment_id = p.id
+            WHERE pa.sale_id = %s
+            ORDER BY p.tanggal_bayar ASC, p.id ASC
+        """
+        return self.execute_query(query, (sale_id,), fetch='all')
+    
+    def _backfill_payment_allocations(self, cursor):
+        """Parse legacy sales_covered text into payment_allocations for payments without allocations"""
+        # Format lama: "Sale ID 12: Rp 45,000 (LUNAS); Sale ID 13: Rp 5,000 (CICILAN, sisa: Rp 40,000)"
+        # Nominal di teks dibulatkan ke rupiah penuh
+        cursor.execute("""
+            INSERT INTO payment_allocations (payment_id, sale_id, amount)
+            SELECT p.id, m[1]::INTEGER, REPLACE(m[2], ',', '')::DECIMAL(12,2)
+            FROM payments p
+            CROSS JOIN LATERAL regexp_matches(p.sales_covered, 'Sale ID ([0-9]+): Rp ([0-9,]+)', 'g') m
+            JOIN sales s ON s.id = m[1]::INTEGER
+            WHERE p.sales_covered IS NOT NULL AND p.sales_covered <> ''
+              AND NOT EXISTS (SELECT 1 FROM payment_allocations pa WHERE pa.payment_id = p.id)
+            ON CONFLICT (payment_id, sale_id) DO NOTHING
+        """)
+        return cursor.rowcount
+    
+    def backfill_payment_allocations(self):
+        """Backfill payment_allocations from legacy sales_covered text"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            rows = self._backfill_payment_allocations(cursor)
+            conn.commit()
+            return rows
+        except Exception as e:
+            conn.rollback()
+            print(f"Error backfilling payment allocations: {e}")
+            raise e
+        finally:
+            cursor.close()
+    
     # Report methods
+    # Invoice job methods
+    def get_invoice_version(self, outlet_id=None):
+        """Latest sale and payment ids of an outlet (all outlets when None); an invoice changes only when one of them does"""
+        if outlet_id is None:
+            query = """
+                SELECT 
+                    (SELECT COALESCE(MAX(id), 0) FROM sales) as max_sale_id,
+                    (SELECT COALESCE(MAX(id), 0) FROM payments) as max_payment_id
+            """
+            return self.execute_query(query, fetch='one')
+        
+        query = """
+            SELECT 
+                (SELECT COALESCE(MAX(id), 0) FROM sales WHERE outlet_id = %s) as max_sale_id,
+                (SELECT COALESCE(MAX(id), 0) FROM payments WHERE outlet_id = %s) as max_payment_id
+        """
+        return self.execute_query(query, (outlet_id, outlet_id), fetch='one')
+    
+    def create_invoice_job(self, outlet_id, start_date, end_date, cache_key, status='pending',
+                           file_path=None, filename=None):
+        """Create invoice job record and return its id"""
+        query = """
+            INSERT INTO invoice_jobs (outlet_id, start_date, end_date, cache_key, status, file_path, filename,
+                                      finished_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, CASE WHEN %s = 'done' THEN CURRENT_TIMESTAMP END)
+            RETURNING id
+        """
+        result = self.execute_query(query, (outlet_id, start_date or None, end_date or None, cache_key,
+                                            status, file_path, filename, status), fetch='one')
+        return result['id'] if result else None
+    
+    def get_invoice_job(self, job_id):
+        query = """
+            SELECT j.*, o.nama as outlet_nama
+            FROM invoice_jobs j
+            LEFT JOIN outlets o ON j.outlet_id = o.id
+            WHERE j.id = %s
+        """
+        return self.execute_query(query, (job_id,), fetch='one')
+    
+    def find_invoice_job(self, cache_key):
+        """Latest job for a cache key that is done, or still queued/running and not stale"""
+        query = """
+            SELECT * FROM invoice_jobs
+            WHERE cache_key = %s 
+              AND (status = 'done' 
+                   OR (status IN ('pending', 'running') AND created_at > CURRENT_TIMESTAMP - INTERVAL '10 minutes'))
+            ORDER BY id DESC
+            LIMIT 1
+        """
+        return self.execute_query(query, (cache_key,), fetch='one')
+    
+    def start_invoice_job(self, job_id):
+        query = "UPDATE invoice_jobs SET status = 'running', started_at = CURRENT_TIMESTAMP WHERE id = %s"
+        return self.execute_query(query, (job_id,))
+    
+    def finish_invoice_job(self, job_id, file_path, filename):
+        query = """
+            UPDATE invoice_jobs 
+            SET status = 'done', file_path = %s, filename = %s, finished_at = CURRENT_TIMESTAMP
+            WHERE id = %s
+        """
+        return self.execute_query(query, (file_path, filename, job_id))
+    
+    def fail_invoice_job(self, job_id, error):
+        query = """
+            UPDATE invoice_jobs 
+            SET status = 'failed', error = %s, finished_at = CURRENT_TIMESTAMP
+            WHERE id = %s
+        """
+        return self.execute_query(query, (error, job_id))
+    
+    def delete_superseded_invoice_jobs(self, job_id):
+        """Delete finished jobs for the same outlet and date range as `job_id` but an older cache key.
+        
+        Returns the file paths of the deleted jobs.
+        """
+        query = """
+            DELETE FROM invoice_jobs j
+            USING invoice_jobs cur
+            WHERE cur.id = %s AND j.id <> cur.id
+              AND j.outlet_id IS NOT DISTINCT FROM cur.outlet_id
+              AND j.start_date IS NOT DISTINCT FROM cur.start_date
+              AND j.end_date IS NOT DISTINCT FROM cur.end_date
+              AND j.cache_key <> cur.cache_key
+              AND j.status IN ('done', 'failed')
+            RETURNING j.file_path
+        """
+        return [row['file_path'] for row in self.execute_query(query, (job_id,), fetch='all') or []]
+    
+    def delete_old_invoice_jobs(self, max_age_days):
+        """Delete jobs created more than `max_age_days` ago; returns the file paths of the deleted jobs"""
+        query = """
+            DELETE FROM invoice_jobs
+            WHERE created_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 day'
+            RETURNING file_path
+        """
+        return [row['file_path'] for row in self.execute_query(query, (max_age_days,), fetch='all') or []]
+    
+    def _report_stock_cte(self, outlet_id=None, start_date=None, end_date=None):
+        """WITH clause `stock`: distributed and unsold quantity per outlet/product within the report filters"""
+        params = []
+        if start_date and end_date:
+            # Periode: jumlahkan rollup harian dalam rentang tanggal (inklusif)
+            query = """
+                WITH stock AS (
+                    SELECT outlet_id, produk_id,
+                           SUM(total_distribusi) as distribusi,
+                           SUM(total_distribusi - total_terjual) as sisa
+                    FROM daily_outlet_product_summary
+                    WHERE tanggal BETWEEN %s::date AND %s::date
+            """
+            params.extend([start_date, end_date])
+            group_by = " GROUP BY outlet_id, produk_id"
+        else:
+            # Tanpa periode: total sepanjang masa sudah tersedia di outlet_stock
+            query = """
+                WITH stock AS (
+                    SELECT outlet_id, produk_id,
+                           total_distribusi as distribusi,
+                           total_distribusi - total_terjual as sisa
+                    FROM outlet_stock
+                    WHERE 1=1
+            """
+            group_by = ""
+        
+        if outlet_id:
+            query += " AND outlet_id = %s"
+            params.append(outlet_id)
+        
+        query += group_by + """
+            )
+        """
+        return query, params
+    
     def get_detailed_outlet_report(self, outlet_id=None, start_date=None, end_date=None):
         """Get detailed outlet report"""
         try:
-            query = """
+            # distribusi/sisa per outlet/produk dihitung dari rollup harian dengan filter yang sama
+            # dengan sales; ringkasan adalah baris grand total GROUPING SETS dalam query yang sama.
+            # total_distribusi dijumlah per outlet/produk (bukan per baris sales) agar tidak terhitung ganda
+            query, params = self._report_stock_cte(outlet_id, start_date, end_date)
+            query += """
                 SELECT 
+                    GROUPING(s.id) = 1 as is_summary,
                     s.tanggal,
                     s.outlet_id,
                     o.nama as outlet_nama,
                     s.produk_id,
                     p.nama as produk_nama,
-                    s.jumlah_terjual,
+                    COALESCE(SUM(s.jumlah_terjual), 0) as jumlah_terjual,
                     p.harga,
-                    s.tagihan,
-                    s.komisi,
-                    s.yang_harus_dibayar,
+                    COALESCE(SUM(s.tagihan), 0) as tagihan,
+                    COALESCE(SUM(s.komisi), 0) as komisi,
+                    COALESCE(SUM(s.yang_harus_dibayar), 0) as yang_harus_dibayar,
                     s.is_paid,
-                    s.remaining_amount,
-                    COALESCE(d.total_distribusi, 0) as distribusi,
-                    COALESCE(d.total_distribusi, 0) - COALESCE(sold.total_sold, 0) as sisa
+                    COALESCE(SUM(s.remaining_amount), 0) as remaining_amount,
+                    CASE WHEN GROUPING(s.id) = 1 THEN (SELECT COALESCE(SUM(distribusi), 0) FROM stock)
+                         ELSE COALESCE(MAX(st.distribusi), 0) END as distribusi,
+                    CASE WHEN GROUPING(s.id) = 1 THEN (SELECT COALESCE(SUM(sisa), 0) FROM stock)
+                         ELSE COALESCE(MAX(st.sisa), 0) END as sisa
                 FROM sales s
                 LEFT JOIN outlets o ON s.outlet_id = o.id
                 LEFT JOIN products p ON s.produk_id = p.id
-                LEFT JOIN (
-                    SELECT produk_id, outlet_id, SUM(jumlah) as total_distribusi
-                    FROM distributions
-                    GROUP BY produk_id, outlet_id
-                ) d ON s.produk_id = d.produk_id AND s.outlet_id = d.outlet_id
-                LEFT JOIN (
-                    SELECT produk_id, outlet_id, SUM(jumlah_terjual) as total_sold
-                    FROM sales
-                    GROUP BY produk_id, outlet_id
-                ) sold ON s.produk_id = sold.produk_id AND s.outlet_id = sold.outlet_id
+                LEFT JOIN stock st ON s.outlet_id = st.outlet_id AND s.produk_id = st.produk_id
                 WHERE 1=1
             """
-            params = []
             
             if start_date and end_date:
-                query += " AND s.tanggal >= %s AND s.tanggal <= %s"
+                query += " AND s.tanggal >= %s::date AND s.tanggal < %s::date + INTERVAL '1 day'"
                 params.extend([start_date, end_date])
             
             if outlet_id:
                 query += " AND s.outlet_id = %s"
                 params.append(outlet_id)
             
-            query += " ORDER BY s.tanggal DESC"
+            query += """
+                GROUP BY GROUPING SETS (
+                    (s.id, s.tanggal, s.outlet_id, o.nama, s.produk_id, p.nama, p.harga, s.is_paid),
+                    ()
+                )
+                ORDER BY GROUPING(s.id) DESC, s.tanggal DESC, s.id DESC
+            """
             
+            # Baris pertama selalu grand total (juga saat tidak ada data)
             detailed_report = self.execute_query(query, params, fetch='all')
-            
-            # Calculate summary
-            if detailed_report:
-                summary = {
-                    'total_terjual': sum(float(row['jumlah_terjual']) for row in detailed_report),
-                    'total_tagihan': sum(float(row['tagihan']) for row in detailed_report),
-                    'total_komisi': sum(float(row['komisi']) for row in detailed_report),
-                    'total_dibayar': sum(float(row['yang_harus_dibayar']) for row in detailed_report),
-                    'total_distribusi': sum(float(row['distribusi']) for row in detailed_report),
-                    'total_belum_dibayar': sum(float(row['remaining_amount']) for row in detailed_report)
-                }
-            else:
-                summary = {
-                    'total_terjual': 0,
-                    'total_tagihan': 0,
-                    'total_komisi': 0,
-                    'total_dibayar': 0,
-                    'total_distribusi': 0,
-                    'total_belum_dibayar': 0
-                }
+            totals = detailed_report.pop(0)
+            
+            summary = {
+                'total_terjual': float(totals['jumlah_terjual']),
+                'total_tagihan': float(totals['tagihan']),
+                'total_komisi': float(totals['komisi']),
+                'total_dibayar': float(totals['yang_harus_dibayar']),
+                'total_distribusi': float(totals['distribusi']),
+                'total_belum_dibayar': float(totals['remaining_amount'])
+            }
             
             return detailed_report, summary
             
@@ -737,40 +1703,29 @@ class DataHelper:
             return [], {}
     
     def get_all_sales_report(self, start_date=None, end_date=None):
-        """Get overall sales report"""
+        """Get overall sales report (from the daily rollup)"""
         try:
-            # Get distributions total
-            dist_query = "SELECT COALESCE(SUM(jumlah), 0) as total_distribusi FROM distributions"
-            dist_params = []
-            
-            if start_date and end_date:
-                dist_query += " WHERE tanggal >= %s AND tanggal <= %s"
-                dist_params.extend([start_date, end_date])
-            
-            dist_result = self.execute_query(dist_query, dist_params, fetch='one')
-            total_distribusi = float(dist_result['total_distribusi']) if dist_result else 0
-            
-            # Get sales totals
-            sales_query = """
+            query = """
                 SELECT 
-                    COALESCE(SUM(jumlah_terjual), 0) as total_penjualan,
+                    COALESCE(SUM(total_distribusi), 0) as total_distribusi,
+                    COALESCE(SUM(total_terjual), 0) as total_penjualan,
                     COALESCE(SUM(komisi), 0) as total_komisi,
                     COALESCE(SUM(yang_harus_dibayar), 0) as total_omzet_bersih
-                FROM sales
+                FROM daily_outlet_product_summary
             """
-            sales_params = []
+            params = []
             
             if start_date and end_date:
-                sales_query += " WHERE tanggal >= %s AND tanggal <= %s"
-                sales_params.extend([start_date, end_date])
+                query += " WHERE tanggal >= %s::date AND tanggal <= %s::date"
+                params.extend([start_date, end_date])
             
-            sales_result = self.execute_query(sales_query, sales_params, fetch='one')
+            result = self.execute_query(query, params, fetch='one')
             
             overall_totals = {
-                'total_distribusi': total_distribusi,
-                'total_penjualan': float(sales_result['total_penjualan']) if sales_result else 0,
-                'total_komisi': float(sales_result['total_komisi']) if sales_result else 0,
-                'total_omzet_bersih': float(sales_result['total_omzet_bersih']) if sales_result else 0
+                'total_distribusi': float(result['total_distribusi']) if result else 0,
+                'total_penjualan': float(result['total_penjualan']) if result else 0,
+                'total_komisi': float(result['total_komisi']) if result else 0,
+                'total_omzet_bersih': float(result['total_omzet_bersih']) if result else 0
             }
             
             return [], overall_totals
@@ -784,26 +1739,160 @@ class DataHelper:
                 'total_omzet_bersih': 0
             }
     
+    # Streaming exports (CSV/XLSX)
+    def _export(self, columns, query, params):
+        """Return (headers, rows) for an export; rows are streamed lazily as tuples"""
+        headers = [header for header, _ in columns]
+        query = query.replace('{columns}', ', '.join(expr for _, expr in columns))
+        return headers, self.iter_query(query, params, row_type='tuple')
+    
+    def export_sales(self, start_date=None, end_date=None, outlet_id=None):
+        """Export sales with the same filters as get_all_sales, newest first"""
+        columns = [
+            ('ID', 's.id'),
+            ('Tanggal', 's.tanggal'),
+            ('Outlet', 'o.nama'),
+            ('Produk', 'p.nama'),
+            ('Jumlah Terjual', 's.jumlah_terjual'),
+            ('Harga', 'p.harga'),
+            ('Tagihan', 's.tagihan'),
+            ('Komisi', 's.komisi'),
+            ('Harus Dibayar', 's.yang_harus_dibayar'),
+            ('Sisa Tagihan', 's.remaining_amount'),
+            ('Status', "CASE WHEN s.is_paid THEN 'Lunas' ELSE 'Belum Lunas' END"),
+        ]
+        query = """
+            SELECT {columns}
+            FROM sales s
+            LEFT JOIN outlets o ON s.outlet_id = o.id
+            LEFT JOIN products p ON s.produk_id = p.id
+            WHERE 1=1
+        """
+        params = []
+        
+        if start_date and end_date:
+            query += " AND s.tanggal >= %s::date AND s.tanggal < %s::date + INTERVAL '1 day'"
+            params.extend([start_date, end_date])
+        
+        if outlet_id:
+            query += " AND s.outlet_id = %s"
+            params.append(outlet_id)
+        
+        query += " ORDER BY s.tanggal DESC, s.id DESC"
+        
+        return self._export(columns, query, params)
+    
+    def export_distributions(self, start_date=None, end_date=None, outlet_id=None):
+        """Export distributions with the same filters as get_all_distributions, newest first"""
+        columns = [
+            ('ID', 'd.id'),
+            ('Tanggal', 'd.tanggal'),
+            ('Outlet', 'o.nama'),
+            ('Produk', 'p.nama'),
+            ('Jumlah', 'd.jumlah'),
+        ]
+        query = """
+            SELECT {columns}
+            FROM distributions d
+            LEFT JOIN outlets o ON d.outlet_id = o.id
+            LEFT JOIN products p ON d.produk_id = p.id
+            WHERE 1=1
+        """
+        params = []
+        
+        if start_date and end_date:
+            query += " AND d.tanggal >= %s::date AND d.tanggal < %s::date + INTERVAL '1 day'"
+            params.extend([start_date, end_date])
+        
+        if outlet_id:
+            query += " AND d.outlet_id = %s"
+            params.append(outlet_id)
+        
+        query += " ORDER BY d.tanggal DESC, d.id DESC"
+        
+        return self._export(columns, query, params)
+    
+    def export_payments(self, start_date=None, end_date=None, outlet_id=None):
+        """Export payments with the same filters as get_all_payments, newest first"""
+        columns = [
+            ('ID', 'p.id'),
+            ('Tanggal Bayar', 'p.tanggal_bayar'),
+            ('Outlet', 'o.nama'),
+            ('Jumlah Bayar', 'p.jumlah_bayar'),
+            ('Status', 'p.status'),
+            ('Tanggal Pelunasan', 'p.tanggal_pelunasan'),
+        ]
+        query = """
+            SELECT {columns}
+            FROM payments p
+            LEFT JOIN outlets o ON p.outlet_id = o.id
+            WHERE 1=1
+        """
+        params = []
+        
+        if start_date and end_date:
+            query += " AND p.tanggal_bayar >= %s AND p.tanggal_bayar <= %s"
+            params.extend([start_date, end_date])
+        
+        if outlet_id:
+            query += " AND p.outlet_id = %s"
+            params.append(outlet_id)
+        
+        query += " ORDER BY p.tanggal_bayar DESC, p.id DESC"
+        
+        return self._export(columns, query, params)
+    
+    def export_detailed_outlet_report(self, outlet_id=None, start_date=None, end_date=None):
+        """Export the rows of get_detailed_outlet_report (without the grand total row)"""
+        columns = [
+            ('Tanggal', 's.tanggal'),
+            ('Outlet', 'o.nama'),
+            ('Produk', 'p.nama'),
+            ('Jumlah Terjual', 's.jumlah_terjual'),
+            ('Harga', 'p.harga'),
+            ('Tagihan', 's.tagihan'),
+            ('Komisi', 's.komisi'),
+            ('Harus Dibayar', 's.yang_harus_dibayar'),
+            ('Status', "CASE WHEN s.is_paid THEN 'Lunas' ELSE 'Belum Lunas' END"),
+            ('Sisa Tagihan', 's.remaining_amount'),
+            ('Distribusi', 'COALESCE(st.distribusi, 0)'),
+            ('Sisa Stok', 'COALESCE(st.sisa, 0)'),
+        ]
+        query, params = self._report_stock_cte(outlet_id, start_date, end_date)
+        query += """
+            SELECT {columns}
+            FROM sales s
+            LEFT JOIN outlets o ON s.outlet_id = o.id
+            LEFT JOIN products p ON s.produk_id = p.id
+            LEFT JOIN stock st ON s.outlet_id = st.outlet_id AND s.produk_id = st.produk_id
+            WHERE 1=1
+        """
+        
+        if start_date and end_date:
+            query += " AND s.tanggal >= %s::date AND s.tanggal < %s::date + INTERVAL '1 day'"
+            params.extend([start_date, end_date])
+        
+        if outlet_id:
+            query += " AND s.outlet_id = %s"
+            params.append(outlet_id)
+        
+        query += " ORDER BY s.tanggal DESC, s.id DESC"
+        
+        return self._export(columns, query, params)
+    
     def get_outlet_slot_usage(self, outlet_id):
         """Get outlet slot usage details"""
         try:
-            # Get total distributed
-            query_dist = """
-                SELECT COALESCE(SUM(jumlah), 0) as distributed 
-                FROM distributions 
-                WHERE outlet_id = %s
-            """
-            dist_result = self.execute_query(query_dist, (outlet_id,), fetch='one')
-            distributed = float(dist_result['distributed']) if dist_result else 0
-            
-            # Get total sold
-            query_sales = """
-                SELECT COALESCE(SUM(jumlah_terjual), 0) as sold 
-                FROM sales 
+            query = """
+                SELECT 
+                    COALESCE(SUM(total_distribusi), 0) as distributed,
+                    COALESCE(SUM(total_terjual), 0) as sold
+                FROM outlet_stock 
                 WHERE outlet_id = %s
             """
-            sales_result = self.execute_query(query_sales, (outlet_id,), fetch='one')
-            sold = float(sales_result['sold']) if sales_result else 0
+            result = self.execute_query(query, (outlet_id,), fetch='one')
+            distributed = float(result['distributed']) if result else 0
+            sold = float(result['sold']) if result else 0
             
             slot_used = distributed - sold
             
@@ -813,6 +1902,34 @@ class DataHelper:
             print(f"Error getting outlet slot usage: {e}")
             return 0, 0, 0
     
+    def get_slot_usage_for_all_outlets(self):
+        """Get slot usage (distributed, sold, used) for every outlet in one grouped query"""
+        try:
+            query = """
+                SELECT 
+                    outlet_id,
+                    COALESCE(SUM(total_distribusi), 0) as distributed,
+                    COALESCE(SUM(total_terjual), 0) as sold
+                FROM outlet_stock 
+                GROUP BY outlet_id
+            """
+            rows = self.execute_query(query, fetch='all') or []
+            
+            slot_usage = {}
+            for row in rows:
+                distributed = float(row['distributed'])
+                sold = float(row['sold'])
+                slot_usage[row['outlet_id']] = {
+                    'distributed': distributed,
+                    'sold': sold,
+                    'used': distributed - sold
+                }
+            return slot_usage
+            
+        except Exception as e:
+            print(f"Error getting slot usage for all outlets: {e}")
+            return {}
+    
     # User management methods
     def get_all_users(self):
         """Get all users"""
@@ -852,5 +1969,10 @@ class DataHelper:
     
     def close_connection(self):
         """Close database connection"""
-        if self._connection and not self._connection.closed:
-            self._connection.close()
\ No newline at end of file
+        self.release_connection()
+        if self._cache_listener is not None:
+            self._cache_listener.stop()
+            self._cache_listener = None
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
\ No newline at end of file
@@ -0,0 +1,175 @@
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool with health checks and metrics"""
+
+    def __init__(self, connect, minconn=1, maxconn=10, timeout=30, health_check_interval=30):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Ukuran pool tidak valid (minconn <= maxconn, maxconn >= 1)")
+
+        self._connect = connect
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = []          # list of (connection, last_used_timestamp)
+        self._in_use = set()
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+
+        # Metrics
+        self._checkouts = 0
+        self._timeouts = 0
+        self._health_check_failures = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def getconn(self):
+        """Check out a connection, blocking up to `timeout` seconds when the pool is exhausted"""
+        started = time.monotonic()
+        deadline = started + self.timeout if self.timeout else None
+
+        with self._available:
+            while True:
+                if self._closed:
+                    raise psycopg2.InterfaceError("Connection pool sudah ditutup")
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+
+                if self._size < self.maxconn:
+                    # Reserve the slot before connecting outside the lock
+                    self._size += 1
+                    conn, last_used = None, None
+                    break
+
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Tidak ada koneksi database tersedia setelah {self.timeout} detik"
+                    )
+
+                self._waiting += 1
+                try:
+                    self._available.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        try:
+            if conn is None:
+                conn = self._connect()
+            elif not self._is_healthy(conn, last_used):
+                self._discard(conn)
+                conn = self._connect()
+        except Exception:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._in_use.add(conn)
+            self._checkouts += 1
+            self._checkout_time_total += elapsed
+            self._checkout_time_max = max(self._checkout_time_max, elapsed)
+
+        return conn
+
+    def putconn(self, conn, close=False):
+        """Return a connection to the pool, rolling back any open transaction"""
+        with self._lock:
+            if conn not in self._in_use:
+                return
+            self._in_use.discard(conn)
+
+        if not close and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                close = True
+
+        with self._available:
+            if close or conn.closed or self._closed:
+                self._size -= 1
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+    def _is_healthy(self, conn, last_used):
+        """Validate a pooled connection before handing it out"""
+        if conn.closed:
+            self._health_check_failures += 1
+            return False
+
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception:
+            self._health_check_failures += 1
+            return False
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        """Snapshot of pool metrics"""
+        with self._lock:
+            return {
+                'size': self._size,
+                'min_size': self.minconn,
+                'max_size': self.maxconn,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'health_check_failures': self._health_check_failures,
+                'checkout_time_avg_ms': (self._checkout_time_total / self._checkouts * 1000) if self._checkouts else 0,
+                'checkout_time_max_ms': self._checkout_time_max * 1000,
+            }
+
+    def closeall(self):
+        """Close every connection and refuse further checkouts"""
+        with self._available:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._discard(conn)
+            for conn in self._in_use:
+                self._discard(conn)
+            self._idle = []
+            self._in_use.clear()
+            self._size = 0
+            self._available.notify_all()
@@ -0,0 +1,248 @@
+"""Per-request SQL and render timing.
+
+DataHelper opens its connections with InstrumentedConnection, so every
+statement executed on any of its cursors (execute_query, iter_query and
+the hand-written transactions alike) is timed and attributed to a call
+site. On named (server-side) cursors every FETCH round trip is recorded
+as well, so streamed results count towards the database time. Statements
+are collected into the RequestStats of the current thread while a
+request is active; other code can subscribe with add_query_hook() and
+add_timing_hook().
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2.extensions
+
+_local = threading.local()
+_query_hooks = []
+_timing_hooks = []
+_cursor_classes = {}
+_cursor_classes_lock = threading.Lock()
+
+_THIS_FILE = os.path.abspath(__file__)
+_PSYCOPG2_DIR = os.path.dirname(os.path.abspath(psycopg2.extensions.__file__))
+# Helper generik DataHelper; call site adalah method publik yang memanggilnya
+_GENERIC_QUERY_FUNCTIONS = {'execute_query', 'iter_query', 'load'}
+
+
+class RequestStats:
+    """Queries and named timings (template, PDF, ...) collected during one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []       # (call_site, seconds, rowcount)
+        self.timings = {}       # name -> seconds
+        self._marks = {}
+        self.status = None
+        self.streaming = False  # body di-stream setelah view selesai; ringkasan ditutup setelahnya
+
+    def add_query(self, call_site, seconds, rowcount):
+        self.queries.append((call_site, seconds, rowcount))
+
+    def add_timing(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0) + seconds
+
+    def mark(self, name):
+        self._marks[name] = time.perf_counter()
+
+    def stop(self, name):
+        started = self._marks.pop(name, None)
+        if started is not None:
+            self.add_timing(name, time.perf_counter() - started)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def db_seconds(self):
+        return sum(seconds for _, seconds, _ in self.queries)
+
+    def call_sites(self):
+        """{call_site: {'count', 'ms', 'rows'}}, most frequent first"""
+        sites = {}
+        for call_site, seconds, rowcount in self.queries:
+            site = sites.setdefault(call_site, {'count': 0, 'ms': 0.0, 'rows': 0})
+            site['count'] += 1
+            site['ms'] += seconds * 1000
+            site['rows'] += max(rowcount, 0)
+        ordered = sorted(sites.items(), key=lambda item: (-item[1]['count'], -item[1]['ms']))
+        return {name: {**site, 'ms': round(site['ms'], 2)} for name, site in ordered}
+
+    def server_timing(self):
+        """Value for the Server-Timing response header"""
+        metrics = [f'db;dur={self.db_seconds * 1000:.2f};desc="{len(self.queries)} queries"']
+        for name, seconds in self.timings.items():
+            metrics.append(f'{name};dur={seconds * 1000:.2f}')
+        metrics.append(f'app;dur={self.elapsed * 1000:.2f}')
+        return ', '.join(metrics)
+
+    def summary(self, **fields):
+        """Structured summary of the request for the log"""
+        summary = dict(fields)
+        summary.update({
+            'status': self.status,
+            'ms': round(self.elapsed * 1000, 2),
+            'queries': len(self.queries),
+            'db_ms': round(self.db_seconds * 1000, 2),
+        })
+        for name, seconds in self.timings.items():
+            summary[f'{name}_ms'] = round(seconds * 1000, 2)
+        summary['call_sites'] = self.call_sites()
+        return summary
+
+
+def start_request():
+    _local.stats = RequestStats()
+    return _local.stats
+
+
+def current():
+    """RequestStats of the request running in this thread, or None"""
+    return getattr(_local, 'stats', None)
+
+
+def finish_request():
+    stats = current()
+    _local.stats = None
+    return stats
+
+
+@contextmanager
+def timed(name):
+    """Add the duration of the block to the current request's `name` timing"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        stats = current()
+        if stats is not None:
+            stats.add_timing(name, seconds)
+        # Hook juga dipanggil di luar request (thread job invoice)
+        for hook in _timing_hooks:
+            hook(name, seconds)
+
+
+def add_query_hook(hook, statements=False):
+    """Call hook(call_site, seconds, rowcount) after every instrumented statement.
+    
+    With statements=True the hook also gets the SQL text as sent to the server.
+    """
+    _query_hooks.append((hook, statements))
+
+
+def add_timing_hook(hook):
+    """Call hook(name, seconds) after every timed() block"""
+    _timing_hooks.append(hook)
+
+
+def call_site(depth=1):
+    """Nearest public DataHelper method on the stack, else the first frame outside psycopg2"""
+    frame = sys._getframe(depth)
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        name = frame.f_code.co_name
+        if filename != _THIS_FILE and not filename.startswith(_PSYCOPG2_DIR):
+            if filename.endswith('data_helper.py'):
+                if name == '_iter_rows' and frame.f_locals.get('source'):
+                    # Stream iter_query: call site dicatat saat stream dibuat
+                    return frame.f_locals['source']
+                if not name.startswith('_') and name not in _GENERIC_QUERY_FUNCTIONS:
+                    return name
+            if fallback is None:
+                fallback = f"{name} ({os.path.basename(filename)}:{frame.f_lineno})"
+        frame = frame.f_back
+    return fallback or 'unknown'
+
+
+def _record(cursor, seconds, rowcount):
+    stats = current()
+    if stats is None and not _query_hooks:
+        return
+    site = call_site(3)
+    if stats is not None:
+        stats.add_query(site, seconds, rowcount)
+    for hook, with_statement in _query_hooks:
+        if with_statement:
+            hook(site, seconds, rowcount, (cursor.query or b'').decode())
+        else:
+            hook(site, seconds, rowcount)
+
+
+def _cursor_class(base):
+    cls = _cursor_classes.get(base)
+    if cls is None:
+        with _cursor_classes_lock:
+            cls = _cursor_classes.get(base)
+            if cls is None:
+                class InstrumentedCursor(base):
+                    def execute(self, query, vars=None):
+                        started = time.perf_counter()
+                        try:
+                            return super().execute(query, vars)
+                        finally:
+                            _record(self, time.perf_counter() - started, self.rowcount)
+
+                    def executemany(self, query, vars_list):
+                        started = time.perf_counter()
+                        try:
+                            return super().executemany(query, vars_list)
+                        finally:
+                            _record(self, time.perf_counter() - started, self.rowcount)
+
+                    # Cursor bernama: setiap fetch adalah round trip FETCH ke server.
+                    # Cursor biasa sudah menerima semua baris saat execute.
+                    def fetchone(self):
+                        if self.name is None:
+                            return super().fetchone()
+                        started = time.perf_counter()
+                        row = super().fetchone()
+                        _record(self, time.perf_counter() - started, 0 if row is None else 1)
+                        return row
+
+                    def fetchmany(self, size=None):
+                        if self.name is None:
+                            return super().fetchmany(size) if size is not None else super().fetchmany()
+                        started = time.perf_counter()
+                        rows = super().fetchmany(size if size is not None else self.arraysize)
+                        _record(self, time.perf_counter() - started, len(rows))
+                        return rows
+
+                    def fetchall(self):
+                        if self.name is None:
+                            return super().fetchall()
+                        started = time.perf_counter()
+                        rows = super().fetchall()
+                        _record(self, time.perf_counter() - started, len(rows))
+                        return rows
+
+                    def __iter__(self):
+                        if self.name is None:
+                            return super().__iter__()
+                        return self._iter_batches()
+
+                    def _iter_batches(self):
+                        # Sama seperti iterasi bawaan: itersize baris per FETCH
+                        while True:
+                            rows = self.fetchmany(self.itersize)
+                            if not rows:
+                                return
+                            yield from rows
+
+                cls = _cursor_classes[base] = InstrumentedCursor
+    return cls
+
+
+class InstrumentedConnection(psycopg2.extensions.connection):
+    """psycopg2 connection whose cursors report every statement to the active RequestStats"""
+
+    def cursor(self, *args, **kwargs):
+        base = kwargs.get('cursor_factory') or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs['cursor_factory'] = _cursor_class(base)
+        return super().cursor(*args, **kwargs)
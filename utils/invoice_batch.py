@@ -0,0 +1,112 @@
+"""Render invoices for every outlet at once into a ZIP.
+
+    python -m utils.invoice_batch --output invoices.zip [--start-date 2026-09-01 --end-date 2026-09-30]
+
+Unpaid sales of all outlets are fetched with a single query and the PDFs
+are rendered in parallel by a process pool, so wall-clock time scales
+with the number of CPU cores. The web app runs this as a background job
+(InvoiceJobQueue.submit_batch), never inside a request.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+
+from utils.pdf_generator import InvoicePDFGenerator
+
+_generator = None
+
+
+def _init_worker():
+    global _generator
+    _generator = InvoicePDFGenerator()
+
+
+def _render_invoice(outlet, sales):
+    started = time.perf_counter()
+    pdf = _generator.generate_invoice(outlet, sales).getvalue()
+    return outlet['id'], _generator.invoice_filename(outlet, sales), pdf, time.perf_counter() - started
+
+
+def generate_all_invoices(data_helper, output, start_date=None, end_date=None, workers=None, include_paid=False):
+    """Write a ZIP with one invoice per outlet to `output` (path or file object).
+    
+    Only outlets with unpaid sales are included unless include_paid is set.
+    Returns a dict with per-outlet render timings and overall timings.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    outlets = data_helper.get_all_outlets() or []
+    sales_by_outlet = data_helper.get_unpaid_sales_for_all_outlets(start_date, end_date)
+    fetch_seconds = time.perf_counter() - started
+
+    jobs = [(dict(outlet), sales_by_outlet.get(outlet['id'], []))
+            for outlet in outlets if include_paid or outlet['id'] in sales_by_outlet]
+    # Invoice terbesar dikerjakan lebih dulu agar tidak tertinggal di akhir pada satu worker
+    jobs.sort(key=lambda job: len(job[1]), reverse=True)
+    names = {outlet['id']: outlet['nama'] for outlet, _ in jobs}
+    counts = {outlet['id']: len(sales) for outlet, sales in jobs}
+
+    invoices = []
+    # spawn, bukan fork: proses app punya thread (pool koneksi, metrics, job invoice) yang
+    # bisa sedang memegang lock saat fork, dan lock itu tidak akan pernah dilepas di child
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   mp_context=multiprocessing.get_context('spawn'))
+    with executor, \
+            zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        futures = [executor.submit(_render_invoice, outlet, sales) for outlet, sales in jobs]
+        for future in as_completed(futures):
+            outlet_id, filename, pdf, render_seconds = future.result()
+            archive.writestr(f"{outlet_id:04d}_{filename}", pdf)
+            invoices.append({
+                'outlet_id': outlet_id,
+                'outlet_nama': names[outlet_id],
+                'sales': counts[outlet_id],
+                'bytes': len(pdf),
+                'render_seconds': render_seconds,
+            })
+
+    invoices.sort(key=lambda invoice: invoice['outlet_id'])
+    return {
+        'invoices': invoices,
+        'fetch_seconds': fetch_seconds,
+        'total_seconds': time.perf_counter() - started,
+        'workers': workers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export invoice semua outlet ke satu file ZIP")
+    parser.add_argument('--output', default=f"Invoice_Semua_Outlet_{datetime.now().strftime('%Y%m%d')}.zip")
+    parser.add_argument('--start-date', help="Tanggal awal (YYYY-MM-DD)")
+    parser.add_argument('--end-date', help="Tanggal akhir (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, help="Jumlah proses render (default: jumlah CPU)")
+    parser.add_argument('--include-paid', action='store_true', help="Sertakan outlet tanpa tagihan belum dibayar")
+    args = parser.parse_args()
+
+    from utils.data_helper import DataHelper
+
+    helper = DataHelper()
+    try:
+        result = generate_all_invoices(helper, args.output, args.start_date, args.end_date,
+                                       args.workers, args.include_paid)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        helper.close_connection()
+
+    print(f"{'outlet':<30} {'sales':>7} {'KB':>8} {'render ms':>10}")
+    for invoice in result['invoices']:
+        print(f"{invoice['outlet_nama'][:30]:<30} {invoice['sales']:>7} "
+              f"{invoice['bytes'] / 1024:>8.1f} {invoice['render_seconds'] * 1000:>10.1f}")
+    print(f"{len(result['invoices'])} invoice ditulis ke {args.output} dengan {result['workers']} proses: "
+          f"query {result['fetch_seconds'] * 1000:.0f} ms, total {result['total_seconds']:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
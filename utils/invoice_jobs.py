@@ -0,0 +1,184 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils.invoice_batch import generate_all_invoices
+
+
+class InvoiceJobQueue:
+    """Renders outlet invoices in background threads and caches the PDFs on disk.
+    
+    Job state lives in the invoice_jobs table so every app worker can report
+    status and serve downloads. A rendered PDF is reused while the outlet,
+    date range, its latest sale/payment ids and the invoice date are unchanged.
+    Batch jobs (outlet_id NULL) render every outlet into one ZIP the same way.
+    
+    A finished job replaces older files of the same outlet and date range, and
+    jobs/files older than max_age_days are pruned at most once per prune_interval.
+    """
+
+    def __init__(self, data_helper, pdf_generator, cache_dir, max_workers=2, batch_workers=None,
+                 max_age_days=7, prune_interval=3600):
+        self.data_helper = data_helper
+        self.pdf_generator = pdf_generator
+        self.cache_dir = cache_dir
+        self.batch_workers = batch_workers
+        self.max_age_days = max_age_days
+        self.prune_interval = prune_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='invoice')
+        self._prune_lock = threading.Lock()
+        self._last_prune = None
+
+    def cache_key(self, outlet, start_date, end_date):
+        version = self.data_helper.get_invoice_version(outlet['id'])
+        parts = [
+            outlet['id'], outlet['nama'], outlet.get('lokasi'), outlet.get('kontak'),
+            start_date or None, end_date or None,
+            version['max_sale_id'], version['max_payment_id'],
+            # Nomor & tanggal invoice memakai tanggal hari ini
+            date.today().isoformat(),
+        ]
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def batch_cache_key(self, start_date, end_date):
+        version = self.data_helper.get_invoice_version()
+        outlets = [(outlet['id'], outlet['nama'], outlet.get('lokasi'), outlet.get('kontak'))
+                   for outlet in self.data_helper.get_all_outlets() or []]
+        parts = [
+            'all', outlets, start_date or None, end_date or None,
+            version['max_sale_id'], version['max_payment_id'], date.today().isoformat(),
+        ]
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def cache_path(self, outlet_id, cache_key):
+        if outlet_id is None:
+            return os.path.join(self.cache_dir, f"invoice_all_{cache_key[:32]}.zip")
+        return os.path.join(self.cache_dir, f"invoice_{outlet_id}_{cache_key[:32]}.pdf")
+
+    def _find_reusable(self, cache_key):
+        """A queued/running job for this cache key, or a finished one whose file still exists"""
+        existing = self.data_helper.find_invoice_job(cache_key)
+        if existing and (existing['status'] != 'done' or os.path.exists(existing['file_path'] or '')):
+            return existing
+        return None
+
+    def submit(self, outlet_id, start_date=None, end_date=None):
+        """Return the job for this invoice, reusing a cached PDF or a queued job when possible"""
+        outlet = self.data_helper.get_outlet_by_id(outlet_id)
+        if not outlet:
+            raise ValueError("Outlet tidak ditemukan")
+
+        cache_key = self.cache_key(dict(outlet), start_date, end_date)
+        existing = self._find_reusable(cache_key)
+        if existing:
+            return existing
+
+        job_id = self.data_helper.create_invoice_job(outlet_id, start_date, end_date, cache_key)
+        self._executor.submit(self._run, job_id, outlet_id, start_date, end_date, cache_key)
+        return self.data_helper.get_invoice_job(job_id)
+
+    def submit_batch(self, start_date=None, end_date=None):
+        """Return the job that renders invoices of every outlet with unpaid sales into one ZIP"""
+        cache_key = self.batch_cache_key(start_date, end_date)
+        existing = self._find_reusable(cache_key)
+        if existing:
+            return existing
+
+        job_id = self.data_helper.create_invoice_job(None, start_date, end_date, cache_key)
+        self._executor.submit(self._run_batch, job_id, start_date, end_date, cache_key)
+        return self.data_helper.get_invoice_job(job_id)
+
+    def _run(self, job_id, outlet_id, start_date, end_date, cache_key):
+        try:
+            self.data_helper.start_invoice_job(job_id)
+            pdf_buffer, filename = self.pdf_generator.generate_outlet_invoice(
+                self.data_helper, outlet_id, start_date, end_date
+            )
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self.cache_path(outlet_id, cache_key)
+            # Tulis ke file sementara lalu rename agar download tidak pernah membaca file setengah jadi
+            tmp_path = f"{path}.{job_id}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(pdf_buffer.getvalue())
+            os.replace(tmp_path, path)
+
+            self.data_helper.finish_invoice_job(job_id, path, filename)
+            self._evict(job_id)
+        except Exception as e:
+            print(f"Error rendering invoice job {job_id}: {e}")
+            self.data_helper.fail_invoice_job(job_id, str(e))
+        finally:
+            self.data_helper.release_connection()
+
+    def _run_batch(self, job_id, start_date, end_date, cache_key):
+        try:
+            self.data_helper.start_invoice_job(job_id)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self.cache_path(None, cache_key)
+            tmp_path = f"{path}.{job_id}.tmp"
+            result = generate_all_invoices(self.data_helper, tmp_path, start_date, end_date,
+                                           workers=self.batch_workers)
+            if not result['invoices']:
+                os.remove(tmp_path)
+                raise ValueError("Tidak ada tagihan yang belum dibayar dalam periode yang dipilih")
+            os.replace(tmp_path, path)
+
+            filename = f"Invoice_Semua_Outlet_{date.today().strftime('%Y%m%d')}.zip"
+            self.data_helper.finish_invoice_job(job_id, path, filename)
+            self._evict(job_id)
+        except Exception as e:
+            print(f"Error rendering invoice batch job {job_id}: {e}")
+            self.data_helper.fail_invoice_job(job_id, str(e))
+        finally:
+            self.data_helper.release_connection()
+
+    def _evict(self, job_id):
+        """Drop files superseded by this job and, once per prune_interval, everything too old"""
+        try:
+            self._remove_files(self.data_helper.delete_superseded_invoice_jobs(job_id))
+            now = time.monotonic()
+            with self._prune_lock:
+                due = self._last_prune is None or now - self._last_prune >= self.prune_interval
+                if due:
+                    self._last_prune = now
+            if due:
+                self.prune()
+        except Exception as e:
+            print(f"Error evicting invoice cache: {e}")
+
+    def prune(self, max_age_days=None):
+        """Delete jobs and cached files older than max_age_days; returns the number of files removed"""
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        removed = self._remove_files(self.data_helper.delete_old_invoice_jobs(max_age_days))
+
+        # File tanpa baris job (mis. .tmp dari proses yang mati di tengah render)
+        cutoff = time.time() - max_age_days * 86400
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            if entry.name.startswith('invoice_') and entry.is_file() and entry.stat().st_mtime < cutoff:
+                removed += self._remove_files([entry.path])
+        return removed
+
+    @staticmethod
+    def _remove_files(paths):
+        removed = 0
+        for path in paths:
+            if not path:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
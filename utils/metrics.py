@@ -0,0 +1,283 @@
+"""Prometheus metrics aggregated across gunicorn workers.
+
+Every process keeps its counters, gauges and histograms in memory and a
+daemon thread writes them to METRICS_DIR/metrics_<pid>.json every
+`flush_interval` seconds (write + rename, so readers never see a partial
+file). render() merges the files of all workers into the Prometheus text
+format. Counters and histograms of workers that have exited are folded
+into metrics_archive.json so totals do not drop when gunicorn recycles a
+worker; gauges only count live processes. Empty METRICS_DIR on deploy to
+start the totals from zero.
+"""
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows (dev server): tanpa lock antar proses
+    fcntl = None
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+PDF_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# name -> (type, help, buckets)
+METRICS = {
+    'http_requests_total': ('counter', 'HTTP requests by route, method and status', None),
+    'http_request_errors_total': ('counter', 'HTTP requests that raised or returned a 5xx status', None),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency by route', REQUEST_BUCKETS),
+    'http_requests_in_progress': ('gauge', 'HTTP requests currently being handled', None),
+    'db_query_duration_seconds': ('histogram', 'SQL statement latency by DataHelper method', QUERY_BUCKETS),
+    'pdf_render_duration_seconds': ('histogram', 'InvoicePDFGenerator render time', PDF_BUCKETS),
+    'db_pool_connections': ('gauge', 'Pooled database connections by state', None),
+    'db_pool_waiting': ('gauge', 'Threads waiting for a pooled connection', None),
+    'db_pool_checkouts_total': ('counter', 'Connections checked out of the pool', None),
+    'db_pool_timeouts_total': ('counter', 'Pool checkouts that timed out', None),
+    'reference_cache_entries': ('gauge', 'Entries in the outlet/product reference cache', None),
+    'reference_cache_hits_total': ('counter', 'Reference cache hits', None),
+    'reference_cache_misses_total': ('counter', 'Reference cache misses', None),
+}
+
+ARCHIVE_FILE = 'metrics_archive.json'
+
+
+def _labels_key(labels):
+    return tuple(sorted((str(k), str(v)) for k, v in (labels or {}).items()))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """In-process metric store with a file snapshot per worker process"""
+
+    def __init__(self, directory, flush_interval=5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._collectors = []
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            # Worker hasil fork mulai dari nol dengan file & thread flush sendiri
+            os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self._flush_at_exit)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._counters = {}     # (name, labels) -> value
+        self._gauges = {}       # (name, labels) -> value
+        self._histograms = {}   # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self._flusher = None
+
+    def add_collector(self, collector):
+        """Call collector() at every flush; it returns (name, labels, value) samples of counters/gauges"""
+        self._collectors.append(collector)
+
+    def inc(self, name, labels=None, amount=1):
+        store = self._counters if METRICS[name][0] == 'counter' else self._gauges
+        key = (name, _labels_key(labels))
+        with self._lock:
+            store[key] = store.get(key, 0) + amount
+        self._ensure_flusher()
+
+    def dec(self, name, labels=None, amount=1):
+        self.inc(name, labels, -amount)
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, _labels_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(buckets) + 2)
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-1] += value
+        self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def _flush_at_exit(self):
+        if self._flusher is not None:
+            self.flush()
+
+    def _collect(self):
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                print(f"Metrics collector gagal: {e}")
+                continue
+            with self._lock:
+                for name, labels, value in samples:
+                    store = self._counters if METRICS[name][0] == 'counter' else self._gauges
+                    store[(name, _labels_key(labels))] = value
+
+    def snapshot(self):
+        self._collect()
+        with self._lock:
+            return {
+                'pid': self._pid,
+                'counters': [[name, labels, value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in self._gauges.items()],
+                'histograms': [[name, labels, list(values)] for (name, labels), values in self._histograms.items()],
+            }
+
+    def flush(self):
+        """Write this process's snapshot to METRICS_DIR"""
+        snapshot = self.snapshot()
+        path = os.path.join(self.directory, f"metrics_{snapshot['pid']}.json")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with self._flush_lock:
+                self._write_json(path, snapshot)
+        except OSError as e:
+            print(f"Gagal menulis metrics ke {path}: {e}")
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_json(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _snapshot_files(self):
+        files = {}
+        for filename in os.listdir(self.directory):
+            pid = filename[len('metrics_'):-len('.json')]
+            if filename.startswith('metrics_') and filename.endswith('.json') and pid.isdigit():
+                files[int(pid)] = os.path.join(self.directory, filename)
+        return files
+
+    def _lock_directory(self):
+        handle = open(os.path.join(self.directory, '.lock'), 'w')
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def collect_all(self):
+        """Snapshots of the archive and every live worker, folding exited workers into the archive"""
+        self.flush()
+        handle = self._lock_directory()
+        try:
+            archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+            archive = self._read_json(archive_path) or {'counters': [], 'histograms': []}
+            live = []
+            dead = []
+            for pid, path in self._snapshot_files().items():
+                snapshot = self._read_json(path)
+                if snapshot is None:
+                    continue
+                if pid == os.getpid() or _process_alive(pid):
+                    live.append(snapshot)
+                else:
+                    dead.append((path, snapshot))
+
+            if dead:
+                merged = _merge([archive] + [snapshot for _, snapshot in dead])
+                archive = {
+                    'counters': [[name, labels, value] for (name, labels), value in merged['counters'].items()],
+                    'histograms': [[name, labels, values] for (name, labels), values in merged['histograms'].items()],
+                }
+                self._write_json(archive_path, archive)
+                for path, _ in dead:
+                    os.remove(path)
+        finally:
+            handle.close()
+
+        # Gauge proses yang sudah berhenti tidak relevan lagi
+        archive['gauges'] = []
+        return [archive] + live
+
+    def render(self):
+        """All workers' metrics in the Prometheus text exposition format"""
+        merged = _merge(self.collect_all())
+        samples = {}
+        for kind in ('counters', 'gauges', 'histograms'):
+            for (name, labels), value in merged[kind].items():
+                samples.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            if name not in samples:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in sorted(samples[name]):
+                if kind != 'histogram':
+                    lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), value[:-1]):
+                    cumulative += count
+                    bucket_labels = labels + (('le', _format_number(bound)),)
+                    lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(value[-1])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+def _merge(snapshots):
+    """Sum counters, gauges and histograms of several snapshots by (name, labels)"""
+    merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+    for snapshot in snapshots:
+        for kind in ('counters', 'gauges'):
+            for name, labels, value in snapshot.get(kind, []):
+                if name not in METRICS:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged[kind][key] = merged[kind].get(key, 0) + value
+        for name, labels, values in snapshot.get('histograms', []):
+            # Lewati metrik yang dihapus atau bucket-nya berubah sejak snapshot ditulis
+            if name not in METRICS or len(values) != len(METRICS[name][2]) + 2:
+                continue
+            key = (name, tuple(tuple(pair) for pair in labels))
+            current = merged['histograms'].get(key)
+            merged['histograms'][key] = values if current is None else [a + b for a, b in zip(current, values)]
+    return merged
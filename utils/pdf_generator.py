@@ -2,16 +2,116 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import (BaseDocTemplate, PageTemplate, Frame, NextPageTemplate, Paragraph, Spacer,
+                                Table, TableStyle, Image, Flowable)
+from reportlab.platypus.doctemplate import NullActionFlowable
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
+from utils.instrumentation import timed
+import itertools
 import os
 from io import BytesIO
 
+class InvoiceRowStream(Flowable):
+    """Invoice sales table laid out one page at a time from an iterator of rows.
+    
+    On every page it pulls only the rows that fit, renders them as a table with
+    the header repeated, and hands the remaining iterator on to the next page.
+    Rows have a fixed height so the number that fits is known up front.
+    """
+    
+    def __init__(self, rows, header, col_widths, row_height, style, totals_row):
+        Flowable.__init__(self)
+        self._rows = rows
+        self._buffer = []
+        self._exhausted = False
+        self.header = header
+        self.col_widths = col_widths
+        self.row_height = row_height
+        self.page_style, self.final_style = style
+        self.totals_row = totals_row
+        self.width = sum(col_widths)
+    
+    def _fill(self, count):
+        while len(self._buffer) < count and not self._exhausted:
+            row = next(self._rows, None)
+            if row is None:
+                self._exhausted = True
+            else:
+                self._buffer.append(row)
+    
+    def _capacity(self, availHeight):
+        return max(int(availHeight // self.row_height) - 1, 0)
+    
+    def _fits_remainder(self, capacity):
+        # Sisa baris + baris total muat di halaman ini
+        return self._exhausted and len(self._buffer) + 1 <= capacity
+    
+    def _table(self, rows, style):
+        return Table([self.header] + rows, colWidths=self.col_widths,
+                     rowHeights=self.row_height, style=style)
+    
+    def wrap(self, availWidth, availHeight):
+        # Selalu lebih tinggi dari ruang tersedia agar frame memanggil split(), yang membuat tabel halaman ini
+        return self.width, availHeight + self.row_height
+    
+    def split(self, availWidth, availHeight):
+        capacity = self._capacity(availHeight)
+        if capacity < 1:
+            return []
+        self._fill(capacity)
+        if self._fits_remainder(capacity):
+            return [self._table(self._buffer + [self.totals_row()], self.final_style)]
+        
+        # Sisa baris dilanjutkan oleh flowable baru; platypus menandai flowable yang ditunda per objek
+        rest = InvoiceRowStream(self._rows, self.header, self.col_widths, self.row_height,
+                                (self.page_style, self.final_style), self.totals_row)
+        rest._buffer, rest._exhausted = self._buffer[capacity:], self._exhausted
+        return [self._table(self._buffer[:capacity], self.page_style), rest]
+
+class DeferredFlowable(Flowable):
+    """Builds its flowables on first layout, after everything before it has been laid out"""
+    
+    def __init__(self, factory):
+        Flowable.__init__(self)
+        self._factory = factory
+    
+    def wrap(self, availWidth, availHeight):
+        # Selalu minta split agar factory dipanggil tepat pada posisinya di alur dokumen
+        return availWidth, availHeight + 1
+    
+    def split(self, availWidth, availHeight):
+        # Aksi kosong di depan: platypus menaruh kembali semua hasil split ke antrean tanpa
+        # mensyaratkan flowable pertama muat di sisa halaman ini
+        return [NullActionFlowable()] + list(self._factory())
+    
+    def draw(self):
+        pass
+
 class InvoicePDFGenerator:
+    SALES_TABLE_HEADER = ['No.', 'Tanggal', 'Produk', 'Qty', 'Harga Satuan', 'Total', 'Komisi', 'Tagihan']
+    SALES_TABLE_COL_WIDTHS = [15*mm, 25*mm, 45*mm, 20*mm, 25*mm, 25*mm, 25*mm, 25*mm]
+    SALES_TABLE_ROW_HEIGHT = 19
+    
+    COMPANY_NAME = "Yobels Salatiga"
+    CONTACT_LINES = [
+        "Instagram: @abonyobels | WhatsApp: +62 821-3855-8731",
+        "Tokopedia: Abon Yobels | Shopee: Abon Yobels",
+    ]
+    INVOICE_TITLE = "INVOICE TAGIHAN BELUM DIBAYAR"
+    FOOTER_LINES = [
+        "Terima kasih atas kerjasama Anda!",
+        "Invoice ini dibuat secara otomatis pada {generated_at} | Halaman {page}",
+        "Untuk pertanyaan, silakan hubungi kontak di atas.",
+    ]
+    # Ruang di atas frame halaman pertama untuk header perusahaan & judul invoice
+    FIRST_PAGE_HEADER_HEIGHT = 40*mm
+    MARGIN = 20*mm
+    
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self.setup_custom_styles()
+        self.setup_table_styles()
     
     def setup_custom_styles(self):
         """Setup custom styles for the invoice"""
@@ -66,6 +166,115 @@ class InvoicePDFGenerator:
             spaceAfter=6
         )
     
+    def setup_table_styles(self):
+        """Build the table styles once; every invoice reuses them"""
+        self.details_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2c5aa0')),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+            ('TOPPADDING', (0, 0), (-1, -1), 3),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+        ])
+        
+        sales_page_commands = [
+            # Header row
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            
+            # Data rows
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # No. column
+            ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Date column
+            ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),  # Numeric columns
+            
+            # Grid
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            
+            # Padding
+            ('LEFTPADDING', (0, 0), (-1, -1), 3),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ]
+        sales_totals_commands = [
+            # Total row
+            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f0f0f0')),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 9),
+            ('ALIGN', (0, -1), (2, -1), 'CENTER'),
+            ('ALIGN', (3, -1), (-1, -1), 'RIGHT'),
+        ]
+        self.sales_page_style = TableStyle(sales_page_commands)
+        self.sales_final_style = TableStyle(sales_page_commands + sales_totals_commands)
+        
+        self.summary_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -2), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -2), 11),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 14),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#2c5aa0')),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('TOPPADDING', (0, 0), (-1, -1), 5),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+            ('LINEBELOW', (0, -1), (-1, -1), 2, colors.HexColor('#2c5aa0')),
+        ])
+    
+    def _draw_centered(self, canvas, y, text, style):
+        canvas.setFont(style.fontName, style.fontSize)
+        canvas.setFillColor(style.textColor)
+        canvas.drawCentredString(A4[0] / 2, y, text)
+    
+    def draw_first_page(self, canvas, doc):
+        """onPage callback: company header and invoice title above the first page frame"""
+        canvas.saveState()
+        top = A4[1] - self.MARGIN
+        self._draw_centered(canvas, top - 22, self.COMPANY_NAME, self.company_style)
+        for i, line in enumerate(self.CONTACT_LINES):
+            self._draw_centered(canvas, top - 44 - i * 12, line, self.contact_style)
+        self._draw_centered(canvas, top - 92, self.INVOICE_TITLE, self.invoice_title_style)
+        canvas.restoreState()
+        self.draw_footer(canvas, doc)
+    
+    def draw_footer(self, canvas, doc):
+        """onPage callback: footer with generation time and page number on every page"""
+        canvas.saveState()
+        canvas.setFont('Helvetica', 8)
+        canvas.setFillColor(colors.HexColor('#666666'))
+        for i, line in enumerate(self.FOOTER_LINES):
+            text = line.format(generated_at=doc.generated_at, page=doc.page)
+            canvas.drawCentredString(A4[0] / 2, self.MARGIN - 12 - i * 10, text)
+        canvas.restoreState()
+    
+    def build_document(self, buffer):
+        """Document with a first-page template (header) and a template for later pages"""
+        doc = BaseDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=self.MARGIN,
+            leftMargin=self.MARGIN,
+            topMargin=self.MARGIN,
+            bottomMargin=self.MARGIN
+        )
+        first_frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width,
+                            doc.height - self.FIRST_PAGE_HEADER_HEIGHT, id='first')
+        later_frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='later')
+        doc.addPageTemplates([
+            PageTemplate(id='first', frames=[first_frame], onPage=self.draw_first_page),
+            PageTemplate(id='later', frames=[later_frame], onPage=self.draw_footer),
+        ])
+        doc.generated_at = datetime.now().strftime('%d %B %Y %H:%M:%S')
+        return doc
+    
     def format_currency(self, amount):
         """Format currency in Indonesian Rupiah"""
         try:
@@ -73,39 +282,65 @@ class InvoicePDFGenerator:
         except:
             return "Rp 0"
     
-    def generate_invoice(self, outlet_data, sales_data, invoice_number=None, invoice_date=None):
-        """Generate PDF invoice for an outlet"""
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=20*mm,
-            leftMargin=20*mm,
-            topMargin=20*mm,
-            bottomMargin=20*mm
-        )
-        
-        # Story elements
-        story = []
+    def format_date(self, value):
+        """Format a sale date as dd/mm/YYYY"""
+        if not value:
+            return '-'
+        if hasattr(value, 'strftime'):
+            return value.strftime('%d/%m/%Y')
+        return datetime.fromisoformat(str(value)).strftime('%d/%m/%Y')
+    
+    def format_sales_rows(self, sales_data, totals):
+        """Yield sales table rows, accumulating the invoice totals as rows are consumed"""
+        for idx, sale in enumerate(sales_data, 1):
+            qty = int(sale.get('jumlah_terjual', 0))
+            price = float(sale.get('harga', 0))
+            total = float(sale.get('tagihan', 0))
+            commission = float(sale.get('komisi', 0))
+            bill = float(sale.get('yang_harus_dibayar', 0))
+            
+            totals['qty'] += qty
+            totals['amount'] += total
+            totals['commission'] += commission
+            totals['bill'] += bill
+            
+            yield [
+                str(idx),
+                self.format_date(sale.get('tanggal')),
+                sale.get('produk_nama', '-'),
+                str(qty),
+                self.format_currency(price),
+                self.format_currency(total),
+                self.format_currency(commission),
+                self.format_currency(bill)
+            ]
+    
+    def sales_table_style(self):
+        """Styles for a page of the sales table and for its last page (with the totals row)"""
+        return self.sales_page_style, self.sales_final_style
+    
+    def summary_flowables(self, totals):
+        """Summary section for the given invoice totals"""
+        summary_header = Paragraph("RINGKASAN TAGIHAN", self.section_header_style)
         
-        # Company header
-        company_name = Paragraph("Yobels Salatiga", self.company_style)
-        story.append(company_name)
+        summary_data = [
+            ['Total Penjualan:', self.format_currency(totals['amount'])],
+            ['Total Komisi:', self.format_currency(totals['commission'])],
+            ['', ''],
+            ['TOTAL YANG HARUS DIBAYAR:', self.format_currency(totals['bill'])]
+        ]
         
-        # Contact information
-        contact_info = """
-        Instagram: @abonyobels | WhatsApp: +62 821-3855-8731<br/>
-        Tokopedia: Abon Yobels | Shopee: Abon Yobels
-        """
-        contact_para = Paragraph(contact_info, self.contact_style)
-        story.append(contact_para)
+        summary_table = Table(summary_data, colWidths=[80*mm, 50*mm], style=self.summary_table_style)
         
-        # Divider line
-        story.append(Spacer(1, 10))
+        return [summary_header, summary_table]
+    
+    def generate_invoice(self, outlet_data, sales_data, invoice_number=None, invoice_date=None):
+        """Generate PDF invoice for an outlet; sales_data may be any iterable of sale dicts"""
+        buffer = BytesIO()
+        doc = self.build_document(buffer)
         
-        # Invoice title
-        invoice_title = Paragraph("INVOICE TAGIHAN BELUM DIBAYAR", self.invoice_title_style)
-        story.append(invoice_title)
+        # Header, title and footer are drawn by the page templates; the story only holds invoice data
+        story = [NextPageTemplate('later')]
         
         # Invoice details
         if not invoice_number:
@@ -122,24 +357,16 @@ class InvoicePDFGenerator:
             ['Kontak:', outlet_data.get('kontak', '-')]
         ]
         
-        invoice_details_table = Table(invoice_details_data, colWidths=[40*mm, 120*mm])
-        invoice_details_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2c5aa0')),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ('TOPPADDING', (0, 0), (-1, -1), 3),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-        ]))
+        invoice_details_table = Table(invoice_details_data, colWidths=[40*mm, 120*mm],
+                                      style=self.details_table_style)
         
         story.append(invoice_details_table)
         story.append(Spacer(1, 20))
         
         # Check if there are unpaid sales
-        if not sales_data:
+        rows = iter(sales_data or [])
+        first_sale = next(rows, None)
+        if first_sale is None:
             no_data_msg = Paragraph(
                 "TIDAK ADA TAGIHAN YANG BELUM DIBAYAR", 
                 self.section_header_style
@@ -156,135 +383,39 @@ class InvoicePDFGenerator:
             sales_header = Paragraph("RINCIAN PENJUALAN BELUM DIBAYAR", self.section_header_style)
             story.append(sales_header)
             
-            # Prepare sales data for table
-            table_data = [
-                ['No.', 'Tanggal', 'Produk', 'Qty', 'Harga Satuan', 'Total', 'Komisi', 'Tagihan']
-            ]
-            
-            total_qty = 0
-            total_amount = 0
-            total_commission = 0
-            total_bill = 0
-            
-            for idx, sale in enumerate(sales_data, 1):
-                qty = int(sale.get('jumlah_terjual', 0))
-                price = float(sale.get('harga', 0))
-                total = float(sale.get('tagihan', 0))
-                commission = float(sale.get('komisi', 0))
-                bill = float(sale.get('yang_harus_dibayar', 0))
-                
-                total_qty += qty
-                total_amount += total
-                total_commission += commission
-                total_bill += bill
-                
-                table_data.append([
-                    str(idx),
-                    datetime.strptime(str(sale['tanggal']), '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%Y') if sale.get('tanggal') else '-',
-                    sale.get('produk_nama', '-'),
-                    str(qty),
-                    self.format_currency(price),
-                    self.format_currency(total),
-                    self.format_currency(commission),
-                    self.format_currency(bill)
-                ])
-            
-            # Add totals row
-            table_data.append([
-                '', '', 'TOTAL', str(total_qty), '',
-                self.format_currency(total_amount),
-                self.format_currency(total_commission),
-                self.format_currency(total_bill)
-            ])
-            
-            # Create table
-            sales_table = Table(table_data, colWidths=[15*mm, 25*mm, 45*mm, 20*mm, 25*mm, 25*mm, 25*mm, 25*mm])
+            totals = {'qty': 0, 'amount': 0, 'commission': 0, 'bill': 0}
+            table_rows = self.format_sales_rows(itertools.chain([first_sale], rows), totals)
             
-            # Table styling
-            sales_table.setStyle(TableStyle([
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                
-                # Data rows
-                ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -2), 8),
-                ('ALIGN', (0, 1), (0, -2), 'CENTER'),  # No. column
-                ('ALIGN', (1, 1), (1, -2), 'CENTER'),  # Date column
-                ('ALIGN', (3, 1), (-1, -2), 'RIGHT'),  # Numeric columns
-                
-                # Total row
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f0f0f0')),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, -1), (-1, -1), 9),
-                ('ALIGN', (0, -1), (2, -1), 'CENTER'),
-                ('ALIGN', (3, -1), (-1, -1), 'RIGHT'),
-                
-                # Grid
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                
-                # Padding
-                ('LEFTPADDING', (0, 0), (-1, -1), 3),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ]))
-            
-            story.append(sales_table)
+            # Baris diambil per halaman saat layout, jadi tabel tidak pernah memuat semua penjualan sekaligus
+            story.append(InvoiceRowStream(
+                table_rows,
+                header=self.SALES_TABLE_HEADER,
+                col_widths=self.SALES_TABLE_COL_WIDTHS,
+                row_height=self.SALES_TABLE_ROW_HEIGHT,
+                style=self.sales_table_style(),
+                totals_row=lambda: [
+                    '', '', 'TOTAL', str(totals['qty']), '',
+                    self.format_currency(totals['amount']),
+                    self.format_currency(totals['commission']),
+                    self.format_currency(totals['bill'])
+                ]
+            ))
             story.append(Spacer(1, 20))
             
-            # Summary section
-            summary_header = Paragraph("RINGKASAN TAGIHAN", self.section_header_style)
-            story.append(summary_header)
-            
-            summary_data = [
-                ['Total Penjualan:', self.format_currency(total_amount)],
-                ['Total Komisi:', self.format_currency(total_commission)],
-                ['', ''],
-                ['TOTAL YANG HARUS DIBAYAR:', self.format_currency(total_bill)]
-            ]
-            
-            summary_table = Table(summary_data, colWidths=[80*mm, 50*mm])
-            summary_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -2), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -2), 11),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, -1), (-1, -1), 14),
-                ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#2c5aa0')),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('TOPPADDING', (0, 0), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-                ('LINEBELOW', (0, -1), (-1, -1), 2, colors.HexColor('#2c5aa0')),
-            ]))
-            
-            story.append(summary_table)
-        
-        story.append(Spacer(1, 30))
-        
-        # Footer
-        footer_text = """
-        <para align="center">
-        <font size="8" color="#666666">
-        Terima kasih atas kerjasama Anda!<br/>
-        Invoice ini dibuat secara otomatis pada {}<br/>
-        Untuk pertanyaan, silakan hubungi kontak di atas.
-        </font>
-        </para>
-        """.format(datetime.now().strftime('%d %B %Y %H:%M:%S'))
-        
-        footer_para = Paragraph(footer_text, self.normal_style)
-        story.append(footer_para)
+            # Summary section - totals are only known once every row has been laid out
+            story.append(DeferredFlowable(lambda: self.summary_flowables(totals)))
         
         # Build PDF
-        doc.build(story)
+        with timed('pdf'):
+            doc.build(story)
         buffer.seek(0)
         return buffer
     
+    def invoice_filename(self, outlet_data, sales_data):
+        """Download filename for an outlet invoice"""
+        status = "LUNAS" if not sales_data else "BELUM_LUNAS"
+        return f"Invoice_{outlet_data['nama'].replace(' ', '_')}_{status}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    
     def generate_outlet_invoice(self, data_helper, outlet_id, start_date=None, end_date=None):
         """Generate invoice for a specific outlet - HANYA SALES YANG BELUM DIBAYAR"""
         try:
@@ -298,17 +429,12 @@ class InvoicePDFGenerator:
             # Get UNPAID sales data for the outlet - INI YANG PENTING!
             unpaid_sales_data = data_helper.get_unpaid_sales(start_date, end_date, outlet_id)
             
-            # Convert to list of dicts
-            sales_list = [dict(sale) for sale in unpaid_sales_data] if unpaid_sales_data else []
+            sales_list = unpaid_sales_data or []
             
-            # Generate PDF
+            # Generate PDF (rows are read as the table is laid out, no copy needed)
             pdf_buffer = self.generate_invoice(outlet_dict, sales_list)
             
-            # Create filename
-            status = "LUNAS" if not sales_list else "BELUM_LUNAS"
-            filename = f"Invoice_{outlet_dict['nama'].replace(' ', '_')}_{status}_{datetime.now().strftime('%Y%m%d')}.pdf"
-            
-            return pdf_buffer, filename
+            return pdf_buffer, self.invoice_filename(outlet_dict, sales_list)
             
         except Exception as e:
             raise Exception(f"Error generating invoice: {str(e)}")
\ No newline at end of file
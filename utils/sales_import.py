@@ -0,0 +1,126 @@
+"""Bulk sales import from CSV.
+
+    python -m utils.sales_import penjualan.csv [--skip-invalid]
+
+Expected columns: outlet_id, produk_id (or product_id), jumlah_terjual
+(or jumlah) and an optional tanggal (ISO format, defaults to now).
+Delimiter may be ',' or ';'.
+"""
+from datetime import datetime
+import argparse
+import csv
+import io
+import sys
+
+COLUMN_ALIASES = {
+    'outlet_id': ('outlet_id', 'outlet'),
+    'produk_id': ('produk_id', 'product_id', 'produk'),
+    'jumlah_terjual': ('jumlah_terjual', 'jumlah', 'qty'),
+    'tanggal': ('tanggal', 'date'),
+}
+REQUIRED_COLUMNS = ('outlet_id', 'produk_id', 'jumlah_terjual')
+
+
+def parse_sales_csv(stream):
+    """Parse a CSV stream into (rows, errors) ready for DataHelper.record_sales_batch"""
+    text = stream.read()
+    if isinstance(text, bytes):
+        text = text.decode('utf-8-sig')
+    else:
+        text = text.lstrip('\ufeff')
+
+    if not text.strip():
+        return [], [{'line': 1, 'error': "File kosong"}]
+
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;')
+    except csv.Error:
+        dialect = csv.excel
+
+    reader = csv.DictReader(io.StringIO(text), dialect=dialect)
+    headers = {(name or '').strip().lower(): name for name in reader.fieldnames or []}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in headers:
+                columns[field] = headers[alias]
+                break
+
+    missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        return [], [{'line': 1, 'error': f"Kolom tidak ditemukan: {', '.join(missing)}"}]
+
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rows = []
+    errors = []
+    for record in reader:
+        line = reader.line_num
+        if not any((value or '').strip() for value in record.values() if isinstance(value, str)):
+            continue
+        try:
+            row = {
+                'line': line,
+                'outlet_id': int(record[columns['outlet_id']]),
+                'produk_id': int(record[columns['produk_id']]),
+                'jumlah_terjual': int(record[columns['jumlah_terjual']]),
+                'tanggal': now,
+            }
+        except (TypeError, ValueError):
+            errors.append({'line': line, 'error': "outlet_id, produk_id dan jumlah_terjual harus berupa angka"})
+            continue
+
+        tanggal = (record.get(columns['tanggal']) or '').strip() if 'tanggal' in columns else ''
+        if tanggal:
+            try:
+                row['tanggal'] = datetime.fromisoformat(tanggal).strftime('%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                errors.append({'line': line, 'error': f"Format tanggal tidak valid: {tanggal}"})
+                continue
+        rows.append(row)
+
+    return rows, errors
+
+
+def import_sales_csv(data_helper, stream, skip_invalid=False):
+    """Parse and record a sales CSV. Returns (success, message, inserted_count, errors)"""
+    rows, errors = parse_sales_csv(stream)
+    if errors and not skip_invalid:
+        return False, f"{len(errors)} baris bermasalah, tidak ada penjualan yang dicatat", 0, errors
+    if not rows:
+        return False, "Tidak ada baris valid untuk dicatat", 0, errors
+
+    success, message, inserted, batch_errors = data_helper.record_sales_batch(rows, skip_invalid)
+    errors = sorted(errors + batch_errors, key=lambda e: e['line'])
+    if success and errors:
+        message = f"{inserted} penjualan berhasil dicatat, {len(errors)} baris dilewati"
+    return success, message, inserted, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import penjualan dari file CSV")
+    parser.add_argument('file', help="Path file CSV")
+    parser.add_argument('--skip-invalid', action='store_true',
+                        help="Catat baris yang valid dan lewati baris yang bermasalah")
+    args = parser.parse_args()
+
+    from utils.data_helper import DataHelper
+
+    helper = DataHelper()
+    try:
+        with open(args.file, 'rb') as f:
+            success, message, inserted, errors = import_sales_csv(helper, f, args.skip_invalid)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        helper.close_connection()
+
+    for error in errors:
+        print(f"  baris {error['line']}: {error['error']}")
+    print(message)
+    if not success:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()